@@ -0,0 +1,90 @@
+"""store calculation results as value arrays
+
+Revision ID: 3b1f6c2d9a47
+Revises: e8a0660684a6
+Create Date: 2026-10-19 10:12:40.512034
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b1f6c2d9a47"
+down_revision: Union[str, None] = "e8a0660684a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows are converted in batches, each committed on its own, so the table is never locked
+# as a whole and the conversion can be interrupted and resumed. Every batch starts after the
+# last key of the previous one, so each row is scanned once however large the table is.
+BATCH_SIZE = 5000
+
+# JSONB objects do not keep the key order, so values are ordered by their parsed month-end date.
+PACK_BATCH = """
+    WITH batch AS (
+        SELECT pk FROM deposits
+        WHERE {after} calculation_values IS NULL AND calculation_result IS NOT NULL
+        ORDER BY pk
+        LIMIT :batch_size
+    )
+    UPDATE deposits SET calculation_values = ARRAY(
+        SELECT value::double precision
+        FROM jsonb_each_text(deposits.calculation_result)
+        ORDER BY to_date(key, 'DD.MM.YYYY')
+    )
+    FROM batch
+    WHERE deposits.pk = batch.pk
+    RETURNING deposits.pk
+"""
+
+# Keys are the month ends from the month of the start date on, as built by `month_end_keys`.
+UNPACK_BATCH = """
+    WITH batch AS (
+        SELECT pk FROM deposits
+        WHERE {after} calculation_result IS NULL AND calculation_values IS NOT NULL
+        ORDER BY pk
+        LIMIT :batch_size
+    )
+    UPDATE deposits SET calculation_result = (
+        SELECT jsonb_object_agg(
+            to_char(
+                date_trunc('month', deposits.date) + make_interval(months => ordinality::int) - interval '1 day',
+                'DD.MM.YYYY'
+            ),
+            value
+        )
+        FROM unnest(deposits.calculation_values) WITH ORDINALITY
+    )
+    FROM batch
+    WHERE deposits.pk = batch.pk
+    RETURNING deposits.pk
+"""
+
+
+def convert_in_batches(statement: str) -> None:
+    """Run a batch update over consecutive key ranges until no row is left, committing every batch."""
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        parameters = {"batch_size": BATCH_SIZE}
+        after = ""
+        while keys := connection.execute(sa.text(statement.format(after=after)), parameters).scalars().all():
+            parameters["last_pk"] = str(max(keys))
+            after = "pk > CAST(:last_pk AS uuid) AND"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "deposits",
+        sa.Column("calculation_values", postgresql.ARRAY(postgresql.DOUBLE_PRECISION()), nullable=True),
+    )
+    convert_in_batches(PACK_BATCH)
+
+
+def downgrade() -> None:
+    convert_in_batches(UNPACK_BATCH)
+    op.drop_column("deposits", "calculation_values")
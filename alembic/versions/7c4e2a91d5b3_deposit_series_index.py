@@ -0,0 +1,34 @@
+"""index deposits by series
+
+Revision ID: 7c4e2a91d5b3
+Revises: 3b1f6c2d9a47
+Create Date: 2026-10-19 11:04:17.283519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4e2a91d5b3"
+down_revision: Union[str, None] = "3b1f6c2d9a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the lookup of the longest stored result for a date, amount and rate from the index alone;
+    # the unique constraint starts with (date, periods) and would scan every period count of a date.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_deposits_series",
+            "deposits",
+            ["date", "amount", "rate", "periods"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_deposits_series", table_name="deposits", postgresql_concurrently=True)
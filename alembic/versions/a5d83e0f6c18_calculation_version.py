@@ -0,0 +1,29 @@
+"""add calculation version
+
+Revision ID: a5d83e0f6c18
+Revises: 7c4e2a91d5b3
+Create Date: 2026-10-19 12:21:05.640872
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a5d83e0f6c18"
+down_revision: Union[str, None] = "7c4e2a91d5b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every existing row was produced by the first version of the formulas; a constant default
+    # is stored in the catalog only, so the table is not rewritten.
+    op.add_column("deposits", sa.Column("calculation_version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("deposits", "calculation_version")
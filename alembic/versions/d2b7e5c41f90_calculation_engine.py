@@ -0,0 +1,34 @@
+"""add calculation engine and rounding
+
+Revision ID: d2b7e5c41f90
+Revises: a5d83e0f6c18
+Create Date: 2026-10-19 16:02:47.318205
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b7e5c41f90"
+down_revision: Union[str, None] = "a5d83e0f6c18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows are labeled with the default engine; a constant default is stored in the catalog
+    # only, so the table is not rewritten. Rows cached by a "fixed" deployment are recomputed by
+    # run_recompute.py once labeled as "float".
+    op.add_column(
+        "deposits", sa.Column("calculation_engine", sa.String(length=16), server_default="float", nullable=False)
+    )
+    op.add_column("deposits", sa.Column("calculation_rounding", sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("deposits", "calculation_rounding")
+    op.drop_column("deposits", "calculation_engine")
@@ -0,0 +1,78 @@
+"""
+Command line entry point for the microbenchmark suite.
+
+Usage:
+    python -m benchmarks --output bench.json
+    python -m benchmarks --baseline benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks --filter compute_deposit --update-baseline
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks import hot_paths  # noqa: F401
+from benchmarks.core import compare, load_results, run_benchmarks, save_results
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (list[str] | None): Arguments to parse. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run hot path microbenchmarks.")
+    parser.add_argument("--filter", dest="pattern", help="Run only benchmarks whose name contains this substring.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown. Defaults to 0.2.")
+    parser.add_argument("--repeat", type=int, default=9, help="Number of timed repeats. Defaults to 9.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimal seconds per repeat. Defaults to 0.2.")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with these results.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmarks, store the results and report regressions against the baseline.
+
+    Args:
+        argv (list[str] | None): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: Exit code, 1 if any benchmark regressed beyond its threshold, 0 otherwise.
+    """
+    args = parse_args(argv)
+    results = run_benchmarks(pattern=args.pattern, repeat=args.repeat, min_time=args.min_time)
+
+    if args.output:
+        save_results(results, args.output)
+
+    if args.update_baseline:
+        baseline = load_results(args.baseline) if args.baseline.exists() else {"results": {}}
+        baseline["meta"] = results["meta"]
+        for name, result in results["results"].items():
+            threshold = baseline["results"].get(name, {}).get("threshold")
+            baseline["results"][name] = result if threshold is None else {**result, "threshold": threshold}
+        save_results(baseline, args.baseline)
+        sys.stdout.write(json.dumps(results, indent=2) + "\n")
+        return 0
+
+    if not args.baseline.exists():
+        sys.stdout.write(json.dumps(results, indent=2) + "\n")
+        return 0
+
+    report = compare(results, load_results(args.baseline), threshold=args.threshold)
+    sys.stdout.write(json.dumps({"results": results["results"], "comparison": report}, indent=2) + "\n")
+    return 1 if any(entry["regression"] for entry in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Minimal microbenchmark harness.
+
+Provides a registry of benchmark cases, a timing routine built on `timeit`,
+and helpers to store results as JSON and compare them against a stored baseline.
+"""
+
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable
+
+_REGISTRY: dict[str, tuple[Callable[[], Callable[[], object]], dict[str, float | int]]] = {}
+
+
+def benchmark(
+    name: str, repeat: int = 0, min_time: float = 0.0
+) -> Callable[[Callable[[], Callable[[], object]]], Callable[[], Callable[[], object]]]:
+    """
+    Register a benchmark case under the given name.
+
+    The decorated function is a setup function: it prepares the inputs and returns
+    a zero-argument callable that performs one operation to be timed.
+
+    Args:
+        name (str): Unique benchmark name, e.g. "compute_deposit.short".
+        repeat (int): Minimal number of timed repeats for this case, on top of the run-wide default.
+        min_time (float): Minimal duration of one repeat in seconds for this case, on top of the run-wide default.
+
+    Returns:
+        Callable: The decorator registering the setup function.
+    """
+
+    def decorator(setup: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+        if name in _REGISTRY:
+            raise ValueError(f"Benchmark {name!r} is already registered")
+        _REGISTRY[name] = (setup, {"repeat": repeat, "min_time": min_time})
+        return setup
+
+    return decorator
+
+
+def get_benchmarks(
+    pattern: str | None = None,
+) -> dict[str, tuple[Callable[[], Callable[[], object]], dict[str, float | int]]]:
+    """
+    Get registered benchmark cases.
+
+    Args:
+        pattern (str | None): Optional substring to filter benchmark names by.
+
+    Returns:
+        dict[str, tuple]: Benchmark setup functions and their timing options keyed by name, in sorted order.
+    """
+    return {name: _REGISTRY[name] for name in sorted(_REGISTRY) if pattern is None or pattern in name}
+
+
+def reference_workload() -> int:
+    """Run a fixed pure-Python workload used to normalize timings for the speed of the machine."""
+    return sum(len(str(i * i)) for i in range(1_000))
+
+
+def _calibrate(timer: timeit.Timer, min_time: float) -> int:
+    """Find the number of loops for which one timing takes at least `min_time` seconds."""
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time:
+            return loops
+        loops = loops * 2 if elapsed <= 0 else max(loops * 2, int(loops * min_time / elapsed) + 1)
+
+
+def measure(operation: Callable[[], object], repeat: int = 9, min_time: float = 0.2) -> dict[str, float | int]:
+    """
+    Time a single operation.
+
+    The number of loops per repeat is calibrated so that one repeat takes at least `min_time` seconds.
+    Every repeat is immediately followed by a timing of `reference_workload`, and the ratio of the two
+    is reported as "relative". The relative time cancels out machine speed and load that affect both
+    timings alike, so it is the value used for regression checks; its median over all repeats is
+    reported, as a single lucky or unlucky repeat does not move it.
+
+    Args:
+        operation (Callable[[], object]): The operation to time.
+        repeat (int): Number of timed repeats. Defaults to 9.
+        min_time (float): Minimal duration of one repeat in seconds. Defaults to 0.2.
+
+    Returns:
+        dict[str, float | int]: Nanoseconds per operation (best and median), the median relative time,
+            loops and repeats.
+    """
+    timer, reference = timeit.Timer(operation), timeit.Timer(reference_workload)
+    loops = _calibrate(timer, min_time)
+    reference_loops = _calibrate(reference, min(min_time, 0.05))
+
+    timings, ratios = [], []
+    for _ in range(repeat):
+        elapsed = timer.timeit(loops) / loops
+        timings.append(elapsed * 1e9)
+        ratios.append(elapsed / (reference.timeit(reference_loops) / reference_loops))
+    timings.sort()
+    ratios.sort()
+    return {
+        "ns_per_op": round(timings[0], 1),
+        "median_ns_per_op": round(timings[len(timings) // 2], 1),
+        "relative": round(ratios[len(ratios) // 2], 6),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(pattern: str | None = None, repeat: int = 9, min_time: float = 0.2) -> dict:
+    """
+    Run registered benchmarks and collect machine-readable results.
+
+    Cases registered with larger `repeat` or `min_time` values use those instead.
+
+    Args:
+        pattern (str | None): Optional substring to filter benchmark names by.
+        repeat (int): Number of timed repeats per benchmark. Defaults to 9.
+        min_time (float): Minimal duration of one repeat in seconds. Defaults to 0.2.
+
+    Returns:
+        dict: Results document with environment metadata and per-benchmark timings.
+    """
+    results = {}
+    for name, (setup, options) in get_benchmarks(pattern).items():
+        results[name] = measure(
+            setup(), repeat=max(repeat, options["repeat"]), min_time=max(min_time, options["min_time"])
+        )
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.2) -> list[dict]:
+    """
+    Compare benchmark results against a baseline.
+
+    A benchmark regresses when its median relative time (see `measure`) exceeds the baseline by more
+    than `threshold`. A per-benchmark threshold stored in the baseline under "threshold" overrides
+    the default one; it should be set at the run-to-run noise measured for that benchmark.
+
+    Args:
+        current (dict): Results document produced by `run_benchmarks`.
+        baseline (dict): Results document used as reference.
+        threshold (float): Allowed relative slowdown, e.g. 0.2 for 20%. Defaults to 0.2.
+
+    Returns:
+        list[dict]: One entry per benchmark present in both documents, with the ratio and regression flag.
+    """
+    report = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        allowed = reference.get("threshold", threshold)
+        ratio = result["relative"] / reference["relative"]
+        report.append(
+            {
+                "name": name,
+                "baseline_relative": reference["relative"],
+                "current_relative": result["relative"],
+                "ratio": round(ratio, 3),
+                "threshold": allowed,
+                "regression": ratio > 1 + allowed,
+            }
+        )
+    return report
+
+
+def load_results(path: Path) -> dict:
+    """
+    Load a results document from a JSON file.
+
+    Args:
+        path (Path): Path to the JSON file.
+
+    Returns:
+        dict: The results document.
+    """
+    return json.loads(path.read_text())
+
+
+def save_results(results: dict, path: Path) -> None:
+    """
+    Save a results document to a JSON file.
+
+    Args:
+        results (dict): The results document.
+        path (Path): Path to the JSON file.
+    """
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
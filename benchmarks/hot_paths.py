@@ -0,0 +1,196 @@
+"""
+Benchmarks for the compute and validation hot paths.
+
+Covers `compute_deposit`, the calculation engines, the month helpers, `DepositRequest`
+validation and request decoding (including date parsing) and `validation_exception_handler`,
+for short and 60-period inputs, single and bulk.
+"""
+
+import json
+from datetime import datetime
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Callable
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from benchmarks.core import benchmark
+from src.api.app import validation_exception_handler
+from src.constants.deposit import DepositConstants
+from src.schemas.deposits import DepositRequest
+from src.utils.deposit import compute_deposit, last_day_of_month, month_end_keys, next_month
+from src.utils.fixed_point import compute_deposit_fixed
+from src.utils.validation import decode_json_body
+
+BULK_SIZE = 1_000
+
+SHORT_PAYLOAD = {"date": "31.01.2023", "periods": 3, "amount": 100_000, "rate": 5.0}
+LONG_PAYLOAD = {"date": "31.01.2023", "periods": DepositConstants.MAX_PERIODS.value, "amount": 100_000, "rate": 5.0}
+INVALID_PAYLOAD = {"date": "32.13.2023", "periods": 120, "amount": -5000, "rate": 0.0}
+
+
+def _bulk_payloads(periods: int) -> list[dict]:
+    """Build distinct payloads spread over dates, amounts and rates."""
+    return [
+        {
+            "date": f"{1 + i % 28:02d}.{1 + i % 12:02d}.{2000 + i % 30}",
+            "periods": periods,
+            "amount": 10_000 + i * 17,
+            "rate": round(1.0 + (i % 70) / 10, 1),
+        }
+        for i in range(BULK_SIZE)
+    ]
+
+
+@benchmark("compute_deposit.short")
+def bench_compute_short() -> Callable[[], object]:
+    """Compute a single 3-period deposit."""
+    payload = DepositRequest(**SHORT_PAYLOAD)
+    return lambda: compute_deposit(payload)
+
+
+@benchmark("compute_deposit.long")
+def bench_compute_long() -> Callable[[], object]:
+    """Compute a single 60-period deposit."""
+    payload = DepositRequest(**LONG_PAYLOAD)
+    return lambda: compute_deposit(payload)
+
+
+@benchmark("compute_deposit.bulk_short", repeat=15, min_time=1.0)
+def bench_compute_bulk_short() -> Callable[[], object]:
+    """Compute a batch of 3-period deposits."""
+    payloads = [DepositRequest(**item) for item in _bulk_payloads(3)]
+    return lambda: [compute_deposit(payload) for payload in payloads]
+
+
+@benchmark("compute_deposit.bulk_long", repeat=15, min_time=1.0)
+def bench_compute_bulk_long() -> Callable[[], object]:
+    """Compute a batch of 60-period deposits."""
+    payloads = [DepositRequest(**item) for item in _bulk_payloads(DepositConstants.MAX_PERIODS.value)]
+    return lambda: [compute_deposit(payload) for payload in payloads]
+
+
+@benchmark("engine.float")
+def bench_engine_float() -> Callable[[], object]:
+    """Compute a 60-period deposit with the float engine."""
+    payload = DepositRequest(**LONG_PAYLOAD)
+    return lambda: compute_deposit(payload)
+
+
+@benchmark("engine.fixed")
+def bench_engine_fixed() -> Callable[[], object]:
+    """Compute a 60-period deposit with the integer fixed-point engine."""
+    payload = DepositRequest(**LONG_PAYLOAD)
+    return lambda: compute_deposit_fixed(payload)
+
+
+@benchmark("engine.decimal")
+def bench_engine_decimal() -> Callable[[], object]:
+    """Compute a 60-period deposit with `Decimal` arithmetic, the reference for the fixed-point engine."""
+    payload = DepositRequest(**LONG_PAYLOAD)
+    cent = Decimal("0.01")
+
+    def compute() -> dict[str, float]:
+        """Compound the balance month by month with `Decimal`."""
+        factor = 1 + Decimal(repr(payload.rate)) / 1200
+        balance, values = Decimal(payload.amount), []
+        for _ in range(payload.periods):
+            balance *= factor
+            values.append(float(balance.quantize(cent, rounding=ROUND_HALF_EVEN)))
+        return dict(zip(month_end_keys(payload.date, payload.periods), values, strict=True))
+
+    return compute
+
+
+@benchmark("month_helpers.last_day_of_month")
+def bench_last_day_of_month() -> Callable[[], object]:
+    """Get the last day of a month."""
+    date = datetime(2024, 2, 10)
+    return lambda: last_day_of_month(date)
+
+
+@benchmark("month_helpers.next_month")
+def bench_next_month() -> Callable[[], object]:
+    """Advance to the next month across a year boundary."""
+    date = datetime(2023, 12, 31)
+    return lambda: next_month(date)
+
+
+@benchmark("month_helpers.timeline_long")
+def bench_month_timeline() -> Callable[[], object]:
+    """Build a 60 month-end timeline the way `compute_deposit` walks it."""
+    start = datetime(2023, 1, 15)
+
+    def timeline() -> list[datetime]:
+        """Walk the month ends."""
+        date = last_day_of_month(start)
+        dates = []
+        for _ in range(DepositConstants.MAX_PERIODS.value):
+            dates.append(date)
+            date = last_day_of_month(next_month(date))
+        return dates
+
+    return timeline
+
+
+@benchmark("validation.single")
+def bench_validation_single() -> Callable[[], object]:
+    """Validate a single request payload."""
+    return lambda: DepositRequest(**SHORT_PAYLOAD)
+
+
+@benchmark("validation.bulk", repeat=15, min_time=1.0)
+def bench_validation_bulk() -> Callable[[], object]:
+    """Validate a batch of distinct request payloads."""
+    payloads = _bulk_payloads(12)
+    return lambda: [DepositRequest(**item) for item in payloads]
+
+
+@benchmark("validation.parse_date")
+def bench_parse_date() -> Callable[[], object]:
+    """Parse a date string with the `DepositRequest` validator."""
+    return lambda: DepositRequest.parse_date("31.01.2023")
+
+
+@benchmark("validation.parse_date_strptime")
+def bench_parse_date_strptime() -> Callable[[], object]:
+    """Parse a date string with `datetime.strptime`, as the validator did before the fast parser."""
+    return lambda: datetime.strptime("31.01.2023", DepositConstants.DATE_FORMAT.value)
+
+
+@benchmark("decode.two_pass")
+def bench_decode_two_pass() -> Callable[[], object]:
+    """Decode a raw request body to Python objects, then validate them, like FastAPI's body parsing."""
+    body = json.dumps(SHORT_PAYLOAD).encode()
+    return lambda: DepositRequest.model_validate(json.loads(body))
+
+
+@benchmark("decode.single_pass")
+def bench_decode_single_pass() -> Callable[[], object]:
+    """Decode and validate a raw request body in one `model_validate_json` pass."""
+    body = json.dumps(SHORT_PAYLOAD).encode()
+    return lambda: decode_json_body(DepositRequest, body, "application/json")
+
+
+@benchmark("validation.invalid")
+def bench_validation_invalid() -> Callable[[], object]:
+    """Validate a payload where every field is invalid."""
+
+    def validate() -> object:
+        """Validate and return the raised error."""
+        try:
+            return DepositRequest(**INVALID_PAYLOAD)
+        except ValidationError as exc:
+            return exc
+
+    return validate
+
+
+@benchmark("validation_exception_handler.single")
+def bench_validation_exception_handler() -> Callable[[], object]:
+    """Format a validation error response for an all-invalid payload."""
+    try:
+        DepositRequest(**INVALID_PAYLOAD)
+    except ValidationError as exc:
+        errors = exc.errors()
+    return lambda: validation_exception_handler(None, RequestValidationError(errors))
@@ -0,0 +1,405 @@
+"""
+Asynchronous load generator for the `calculate-deposit` endpoint.
+
+Replays a configurable payload distribution against a live server or an in-process
+ASGI application, drives either a target request rate (open loop) or a fixed number
+of concurrent workers (closed loop) and reports throughput, latency percentiles
+and an error breakdown.
+
+Every non-200 response counts as an error. Responses of the rate limiter (429) and of the
+admission control (503) are also reported separately: all requests come from one address
+without an API key and share one rate limit bucket, so a run with throttled requests measures
+the limiter rather than the service and should be repeated with RATE_LIMIT_ENABLED=False.
+
+Usage:
+    python -m benchmarks.loadgen --url http://localhost:3779 --rps 200 --duration 30 --distribution hot
+    python -m benchmarks.loadgen --in-process --concurrency 32 --requests 5000 --distribution mixed --hit-ratio 0.8
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import AsyncGenerator, Callable
+
+import httpx
+
+from src.constants.deposit import DepositConstants
+
+ENDPOINT = "/api/v1/deposit/calculate-deposit"
+DISTRIBUTIONS = ("hot", "unique", "mixed")
+HOT_KEYS = 100
+UNIQUE_KEY_SPACE = 10**12
+BASE_DATE = date(2000, 1, 1)
+
+
+def unique_payload(index: int) -> dict:
+    """
+    Build a valid payload that is unique for every index.
+
+    Args:
+        index (int): Sequence number of the payload.
+
+    Returns:
+        dict: The request payload.
+    """
+    amounts = DepositConstants.MAX_AMOUNT.value - DepositConstants.MIN_AMOUNT.value + 1
+    day, amount = divmod(index, amounts)
+    return {
+        "date": (BASE_DATE + timedelta(days=day)).strftime(DepositConstants.DATE_FORMAT.value),
+        "periods": 1 + index % DepositConstants.MAX_PERIODS.value,
+        "amount": DepositConstants.MIN_AMOUNT.value + amount,
+        "rate": round(DepositConstants.MIN_RATE.value + index % 71 / 10, 1),
+    }
+
+
+def payload_generator(
+    distribution: str, hit_ratio: float = 0.8, seed: int | None = None, run_id: int | None = None
+) -> Callable[[], dict]:
+    """
+    Create a payload factory for the given distribution.
+
+    Distributions:
+        hot: a small pool of keys with Zipf-like skew, almost every request is a cache hit.
+        unique: every payload is new, every request is a miss.
+        mixed: `hit_ratio` of requests reuse the hot pool, the rest are unique.
+
+    The hot pool is the same in every run. Unique payloads start at an offset derived from `run_id`,
+    not from `seed`, so repeated runs against a persistent database keep missing even with the same
+    seed; reuse a `run_id` only after truncating the deposits table.
+
+    Args:
+        distribution (str): One of "hot", "unique" or "mixed".
+        hit_ratio (float): Share of hot-pool requests for the "mixed" distribution. Defaults to 0.8.
+        seed (int | None): Random seed for the request mix and hot-key choice.
+        run_id (int | None): Identifier of the run selecting the unique key range. Defaults to the current time.
+
+    Returns:
+        Callable[[], dict]: A function returning the next payload.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}. Expected one of {', '.join(DISTRIBUTIONS)}")
+
+    rng = random.Random(seed)
+    hot_pool = [unique_payload(index) for index in range(HOT_KEYS)]
+    hot_weights = [1 / rank for rank in range(1, HOT_KEYS + 1)]
+    offset = random.Random(time.time_ns() if run_id is None else run_id).randrange(UNIQUE_KEY_SPACE)
+    counter = iter(range(HOT_KEYS + offset, sys.maxsize))
+
+    def hot() -> dict:
+        return rng.choices(hot_pool, weights=hot_weights)[0]
+
+    def unique() -> dict:
+        return unique_payload(next(counter))
+
+    if distribution == "hot":
+        return hot
+    if distribution == "unique":
+        return unique
+    return lambda: hot() if rng.random() < hit_ratio else unique()
+
+
+def percentile(sorted_values: list[float], share: float) -> float:
+    """
+    Get a nearest-rank percentile from sorted values.
+
+    Args:
+        sorted_values (list[float]): Values in ascending order.
+        share (float): Percentile as a fraction, e.g. 0.95.
+
+    Returns:
+        float: The percentile value, or 0.0 for an empty list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(int(len(sorted_values) * share + 0.999999) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class LoadStats:
+    """Collects per-request outcomes of a load test run."""
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.statuses: Counter[str] = Counter()
+        self.unique_violations = 0
+        self.in_flight: Counter[tuple] = Counter()
+
+    def record(self, latency: float, outcome: str, contended: bool) -> None:
+        """
+        Record a finished request.
+
+        A 500 on a payload that was concurrently in flight in another request is counted as a
+        suspected unique violation: both requests missed and raced to insert the same row.
+
+        Args:
+            latency (float): Request latency in seconds.
+            outcome (str): Response status code or exception name.
+            contended (bool): Whether the same payload was in flight when the request was sent.
+        """
+        self.latencies.append(latency)
+        self.statuses[outcome] += 1
+        if outcome == "500" and contended:
+            self.unique_violations += 1
+
+    def report(self, elapsed: float) -> dict:
+        """
+        Summarize the run.
+
+        Args:
+            elapsed (float): Wall-clock duration of the run in seconds.
+
+        Returns:
+            dict: Throughput, latency percentiles in milliseconds and error breakdown, with the requests
+                rejected by the rate limiter (429) and shed by the admission control (503) also counted
+                on their own.
+        """
+        latencies = sorted(self.latencies)
+        total = len(latencies)
+        errors = {status: count for status, count in self.statuses.items() if status != "200"}
+        return {
+            "requests": total,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50) * 1000, 3),
+                "p95": round(percentile(latencies, 0.95) * 1000, 3),
+                "p99": round(percentile(latencies, 0.99) * 1000, 3),
+                "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+            "statuses": dict(sorted(self.statuses.items())),
+            "errors": {
+                "total": sum(errors.values()),
+                "by_status": dict(sorted(errors.items())),
+                "unique_violation_500": self.unique_violations,
+                "throttled_429": self.statuses["429"],
+                "shed_503": self.statuses["503"],
+            },
+        }
+
+
+async def send(client: httpx.AsyncClient, payload: dict, stats: LoadStats) -> None:
+    """
+    Send one request and record its outcome.
+
+    Args:
+        client (httpx.AsyncClient): The HTTP client.
+        payload (dict): The request payload.
+        stats (LoadStats): The statistics collector.
+    """
+    key = tuple(payload.values())
+    contended = stats.in_flight[key] > 0
+    stats.in_flight[key] += 1
+    start = time.perf_counter()
+    try:
+        response = await client.post(ENDPOINT, json=payload)
+        outcome = str(response.status_code)
+    except httpx.HTTPError as exc:
+        outcome = type(exc).__name__
+    finally:
+        stats.in_flight[key] -= 1
+        if not stats.in_flight[key]:
+            del stats.in_flight[key]
+    stats.record(time.perf_counter() - start, outcome, contended)
+
+
+async def run_closed_loop(
+    client: httpx.AsyncClient,
+    next_payload: Callable[[], dict],
+    stats: LoadStats,
+    concurrency: int,
+    deadline: float,
+    requests: int | None,
+) -> None:
+    """
+    Keep `concurrency` requests in flight until the deadline or request budget is reached.
+
+    Args:
+        client (httpx.AsyncClient): The HTTP client.
+        next_payload (Callable[[], dict]): Payload factory.
+        stats (LoadStats): The statistics collector.
+        concurrency (int): Number of concurrent workers.
+        deadline (float): `time.perf_counter()` value at which to stop.
+        requests (int | None): Total number of requests to send, unlimited if None.
+    """
+    budget = iter(range(requests)) if requests is not None else None
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            if budget is not None and next(budget, None) is None:
+                return
+            await send(client, next_payload(), stats)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient,
+    next_payload: Callable[[], dict],
+    stats: LoadStats,
+    rps: float,
+    deadline: float,
+    requests: int | None,
+) -> None:
+    """
+    Start requests at a fixed rate regardless of how fast responses come back.
+
+    Args:
+        client (httpx.AsyncClient): The HTTP client.
+        next_payload (Callable[[], dict]): Payload factory.
+        stats (LoadStats): The statistics collector.
+        rps (float): Target request rate per second.
+        deadline (float): `time.perf_counter()` value at which to stop sending.
+        requests (int | None): Total number of requests to send, unlimited if None.
+    """
+    tasks = set()
+    interval = 1 / rps
+    next_start = time.perf_counter()
+    sent = 0
+    while next_start < deadline and (requests is None or sent < requests):
+        delay = next_start - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(send(client, next_payload(), stats))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        sent += 1
+        next_start += interval
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+@asynccontextmanager
+async def in_process_client() -> AsyncGenerator[httpx.AsyncClient, None]:
+    """
+    Create a client bound to the in-process application, running its lifespan.
+
+    Yields:
+        httpx.AsyncClient: The HTTP client.
+    """
+    from run_app import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadgen") as client:
+            yield client
+
+
+@asynccontextmanager
+async def remote_client(url: str, limit: int) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """
+    Create a client for a live server.
+
+    Args:
+        url (str): Base URL of the server.
+        limit (int): Maximum number of concurrent connections.
+
+    Yields:
+        httpx.AsyncClient: The HTTP client.
+    """
+    limits = httpx.Limits(max_connections=limit, max_keepalive_connections=limit)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        yield client
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """
+    Execute a load test run.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+        dict: The run report.
+    """
+    next_payload = payload_generator(args.distribution, hit_ratio=args.hit_ratio, seed=args.seed, run_id=args.run_id)
+    stats = LoadStats()
+    limit = args.concurrency if args.rps is None else max(int(args.rps), 1)
+    clients = in_process_client() if args.in_process else remote_client(args.url, limit)
+
+    async with clients as client:
+        warmup_stats = LoadStats()
+        for _ in range(args.warmup):
+            await send(client, next_payload(), warmup_stats)
+        start = time.perf_counter()
+        deadline = start + args.duration
+        if args.rps is None:
+            await run_closed_loop(client, next_payload, stats, args.concurrency, deadline, args.requests)
+        else:
+            await run_open_loop(client, next_payload, stats, args.rps, deadline, args.requests)
+        elapsed = time.perf_counter() - start
+
+    report = stats.report(elapsed)
+    report["config"] = {
+        "target": "in-process" if args.in_process else args.url,
+        "distribution": args.distribution,
+        "hit_ratio": args.hit_ratio if args.distribution == "mixed" else None,
+        "mode": "open-loop" if args.rps is not None else "closed-loop",
+        "rps": args.rps,
+        "concurrency": args.concurrency if args.rps is None else None,
+        "seed": args.seed,
+        "run_id": args.run_id,
+    }
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (list[str] | None): Arguments to parse. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadgen", description=__doc__.split("\n\n")[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:3779", help="Base URL of a running server.")
+    target.add_argument("--in-process", action="store_true", help="Drive the ASGI app in this process.")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="mixed", help="Payload distribution.")
+    parser.add_argument("--hit-ratio", type=float, default=0.8, help="Hot-pool share for 'mixed'. Defaults to 0.8.")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--rps", type=float, help="Target request rate (open loop).")
+    load.add_argument("--concurrency", type=int, default=16, help="Concurrent workers (closed loop). Defaults to 16.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Run duration in seconds. Defaults to 10.")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests.")
+    parser.add_argument("--warmup", type=int, default=0, help="Untimed requests sent before the run.")
+    parser.add_argument("--seed", type=int, help="Random seed for the request mix and hot-key choice.")
+    parser.add_argument(
+        "--run-id",
+        type=int,
+        default=time.time_ns(),
+        help="Selects the unique key range. Defaults to the current time, so every run misses.",
+    )
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the load generator and print the JSON report.
+
+    Args:
+        argv (list[str] | None): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: Exit code.
+    """
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    document = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(document + "\n")
+    sys.stdout.write(document + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Cold start benchmark of the application.
+
+Starts fresh interpreters with `python -X importtime`, each importing `run_app`, running the
+application lifespan and serving one request in process, and reports the time to import the
+application, the time to the first response and the modules that took longest to import.
+
+Usage:
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 10 --top 20 --output startup.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ENDPOINT = "/api/v1/metrics"
+
+# Runs in the child interpreter; prints the timings of one cold start as JSON.
+CHILD = """
+import asyncio, json, sys, time
+
+start = time.perf_counter()
+import httpx
+from run_app import app
+imported = time.perf_counter()
+
+
+async def first_request():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            response = await client.get(sys.argv[1])
+            return response.status_code, time.perf_counter()
+
+
+status, responded = asyncio.run(first_request())
+timings = {"import_ms": (imported - start) * 1e3, "first_request_ms": (responded - start) * 1e3}
+print(json.dumps({"status": status, **timings}))
+"""
+
+
+def parse_importtime(output: str) -> dict[str, int]:
+    """
+    Parse the report written to stderr by `python -X importtime`.
+
+    Args:
+        output (str): The stderr of the interpreter.
+
+    Returns:
+        dict[str, int]: Cumulative import time in microseconds, including nested imports, keyed by module name.
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        modules[fields[2].strip()] = int(fields[1])
+    return modules
+
+
+def top_modules(modules: dict[str, int], count: int = 10) -> list[dict[str, float | str]]:
+    """
+    Get the modules with the largest cumulative import time.
+
+    Args:
+        modules (dict[str, int]): Cumulative import times in microseconds, as returned by `parse_importtime`.
+        count (int): Number of modules to return. Defaults to 10.
+
+    Returns:
+        list[dict[str, float | str]]: Module names and cumulative import times in milliseconds, slowest first.
+    """
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:count]
+    return [{"module": name, "cumulative_ms": round(micros / 1e3, 3)} for name, micros in slowest]
+
+
+def cold_start(endpoint: str = ENDPOINT) -> tuple[dict, dict[str, int]]:
+    """
+    Start the application once in a fresh interpreter.
+
+    Args:
+        endpoint (str): Path of the first request. Defaults to the metrics endpoint.
+
+    Returns:
+        tuple[dict, dict[str, int]]: The timings of the run and its cumulative import times per module.
+
+    Raises:
+        RuntimeError: If the child interpreter fails.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, endpoint], cwd=ROOT, capture_output=True, text=True
+    )
+    if process.returncode:
+        raise RuntimeError(f"Cold start failed:\n{process.stderr[-2000:]}")
+    return json.loads(process.stdout.splitlines()[-1]), parse_importtime(process.stderr)
+
+
+def run(runs: int = 5, top: int = 10, endpoint: str = ENDPOINT) -> dict:
+    """
+    Measure several cold starts.
+
+    Timings are reported as the median and the best run. The import breakdown is taken from the run with
+    the median time to first request.
+
+    Args:
+        runs (int): Number of cold starts. Defaults to 5.
+        top (int): Number of slowest modules to report. Defaults to 10.
+        endpoint (str): Path of the first request. Defaults to the metrics endpoint.
+
+    Returns:
+        dict: The benchmark report.
+    """
+    starts = sorted((cold_start(endpoint) for _ in range(runs)), key=lambda start: start[0]["first_request_ms"])
+    timings = [timing for timing, _ in starts]
+    report = {"runs": runs, "endpoint": endpoint, "status": sorted({timing["status"] for timing in timings})}
+    for name in ("import_ms", "first_request_ms"):
+        values = [timing[name] for timing in timings]
+        report[name] = {"median": round(statistics.median(values), 3), "best": round(min(values), 3)}
+    report["slowest_imports"] = top_modules(starts[len(starts) // 2][1], top)
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv (list[str] | None): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts. Defaults to 5.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to report. Defaults to 10.")
+    parser.add_argument("--endpoint", default=ENDPOINT, help=f"Path of the first request. Defaults to {ENDPOINT}.")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the startup benchmark and print the JSON report.
+
+    Args:
+        argv (list[str] | None): Command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: Exit code.
+    """
+    args = parse_args(argv)
+    report = run(runs=args.runs, top=args.top, endpoint=args.endpoint)
+    document = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(document + "\n")
+    sys.stdout.write(document + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,15 @@
-import uvicorn
-
-from settings import AppSettings
+from settings import AppSettings, get_settings
 from src.api.app import create_app
-from src.utils.logging.config import get_logging_config
 
-app_settings = AppSettings()
+app_settings = get_settings(AppSettings)
 app = create_app(settings=app_settings)
 
 if __name__ == "__main__":
+    # Imported only when serving directly, so importing `app` (by `uvicorn run_app:app` or the tests) stays cheap.
+    import uvicorn
+
+    from src.utils.logging.config import get_logging_config
+
     uvicorn.run(
         app,
         host="0.0.0.0",
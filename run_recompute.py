@@ -0,0 +1,63 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from settings import (
+    AppSettings,
+    ComputeSettings,
+    PostgresSettings,
+    RecomputeSettings,
+    StorageSettings,
+    get_settings,
+)
+from src.services.recompute import RecomputeJob
+from src.utils.calculator import DepositCalculator
+from src.utils.logging.logger import init_logger
+from src.utils.storage import ResultStorage
+
+
+async def main() -> int:
+    """
+    Recompute the stale calculation results with the configured engine and throttling.
+
+    Returns:
+        int: The number of rows recomputed.
+    """
+    recompute_settings = get_settings(RecomputeSettings)
+    compute_settings = get_settings(ComputeSettings)
+    storage_settings = get_settings(StorageSettings)
+    engine = create_async_engine(get_settings(PostgresSettings).url)
+    executor = ProcessPoolExecutor(
+        max_workers=recompute_settings.WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=os.nice,
+        initargs=(recompute_settings.NICE,),
+    )
+    job = RecomputeJob(
+        session_factory=sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False),
+        calculator=DepositCalculator(engine=compute_settings.ENGINE, rounding=compute_settings.ROUNDING),
+        storage=ResultStorage(
+            write_legacy=storage_settings.WRITE_LEGACY,
+            engine=compute_settings.ENGINE,
+            rounding=compute_settings.ROUNDING,
+        ),
+        executor=executor,
+        chunk_size=recompute_settings.CHUNK_SIZE,
+        workers=recompute_settings.WORKERS,
+        pause=recompute_settings.PAUSE,
+    )
+    try:
+        return await job.run()
+    finally:
+        executor.shutdown(wait=True)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    app_settings = get_settings(AppSettings)
+    init_logger(app_settings.TITLE, app_settings.IS_DEBUG)
+    asyncio.run(main())
@@ -1,11 +1,17 @@
 """
 Configuration settings for the application and PostgreSQL database.
 
-Provides settings for connecting to the database and configuring the application behavior.
+Provides settings for connecting to the database and configuring the application behavior, and
+`get_settings`, which reads each of them from the environment once per process.
 """
 
+from functools import lru_cache
+from typing import Literal, TypeVar
+
 from pydantic_settings import BaseSettings
 
+SettingsT = TypeVar("SettingsT", bound=BaseSettings)
+
 
 class PostgresSettings(BaseSettings):
     """
@@ -95,3 +101,266 @@ class AppSettings(BaseSettings):
 
         case_sensitive = False
         env_prefix = "APP_"
+
+
+class ComputeSettings(BaseSettings):
+    """
+    Deposit calculation settings.
+
+    Attributes:
+        ENGINE (str): Calculation engine, "float" or "fixed" (exact integer minor units). Defaults to "float".
+        ROUNDING (str): Rounding of the "fixed" engine, "half_even" or "half_up". Defaults to "half_even".
+
+    Config:
+        case_sensitive (bool): Indicates if environment variables are case-sensitive. Defaults to False.
+        env_prefix (str): Prefix for environment variables. Defaults to "COMPUTE_".
+    """
+
+    ENGINE: Literal["float", "fixed"] = "float"
+    ROUNDING: Literal["half_even", "half_up"] = "half_even"
+
+    class Config:
+        """
+        Configuration options for ComputeSettings.
+
+        Attributes:
+            case_sensitive (bool): Whether environment variables are case-sensitive. Defaults to False.
+            env_prefix (str): The prefix for environment variables. Defaults to "COMPUTE_".
+        """
+
+        case_sensitive = False
+        env_prefix = "COMPUTE_"
+
+
+class ResponseSettings(BaseSettings):
+    """
+    Response encoding settings.
+
+    Attributes:
+        COMPRESSION_MIN_SIZE (int): Minimal encoded size in bytes of a calculation result that is compressed
+            when the client accepts gzip or Brotli. Defaults to 1024.
+        CACHE_CONTROL (str): `Cache-Control` header of cacheable calculation results. Defaults to
+            "public, max-age=3600".
+
+    Config:
+        case_sensitive (bool): Indicates if environment variables are case-sensitive. Defaults to False.
+        env_prefix (str): Prefix for environment variables. Defaults to "RESPONSE_".
+    """
+
+    COMPRESSION_MIN_SIZE: int = 1024
+    CACHE_CONTROL: str = "public, max-age=3600"
+
+    class Config:
+        """
+        Configuration options for ResponseSettings.
+
+        Attributes:
+            case_sensitive (bool): Whether environment variables are case-sensitive. Defaults to False.
+            env_prefix (str): The prefix for environment variables. Defaults to "RESPONSE_".
+        """
+
+        case_sensitive = False
+        env_prefix = "RESPONSE_"
+
+
+class DispatchSettings(BaseSettings):
+    """
+    Compute dispatch settings.
+
+    Work is measured in deposit months to compute, e.g. 12 for a 12-period deposit.
+
+    Attributes:
+        INLINE_MAX_WORK (int): Largest job run inline on the event loop. Defaults to 24.
+        PROCESS_MIN_WORK (int): Smallest job run in the process pool. Defaults to 30000.
+        THREAD_WORKERS (int): Size of the thread pool. Defaults to 4.
+        PROCESS_WORKERS (int | None): Size of the process pool. Defaults to the number of CPUs.
+
+    Config:
+        case_sensitive (bool): Indicates if environment variables are case-sensitive. Defaults to False.
+        env_prefix (str): Prefix for environment variables. Defaults to "DISPATCH_".
+    """
+
+    INLINE_MAX_WORK: int = 24
+    PROCESS_MIN_WORK: int = 30_000
+    THREAD_WORKERS: int = 4
+    PROCESS_WORKERS: int | None = None
+
+    class Config:
+        """
+        Configuration options for DispatchSettings.
+
+        Attributes:
+            case_sensitive (bool): Whether environment variables are case-sensitive. Defaults to False.
+            env_prefix (str): The prefix for environment variables. Defaults to "DISPATCH_".
+        """
+
+        case_sensitive = False
+        env_prefix = "DISPATCH_"
+
+
+class AdmissionSettings(BaseSettings):
+    """
+    Admission control settings for the deposit routes.
+
+    Attributes:
+        MAX_CONCURRENCY (int): Requests processed at once. Defaults to 64.
+        MAX_QUEUE (int): Requests waiting for a slot before new ones are shed. Defaults to 128.
+        REQUEST_TIMEOUT (float): Deadline of a request in seconds, including its time in the queue. It also
+            bounds Postgres statements, the wait for a pool connection and the wait for computations.
+            Defaults to 5.0.
+        RETRY_AFTER (int): `Retry-After` of shed requests in seconds. Defaults to 1.
+
+    Config:
+        case_sensitive (bool): Indicates if environment variables are case-sensitive. Defaults to False.
+        env_prefix (str): Prefix for environment variables. Defaults to "ADMISSION_".
+    """
+
+    MAX_CONCURRENCY: int = 64
+    MAX_QUEUE: int = 128
+    REQUEST_TIMEOUT: float = 5.0
+    RETRY_AFTER: int = 1
+
+    class Config:
+        """
+        Configuration options for AdmissionSettings.
+
+        Attributes:
+            case_sensitive (bool): Whether environment variables are case-sensitive. Defaults to False.
+            env_prefix (str): The prefix for environment variables. Defaults to "ADMISSION_".
+        """
+
+        case_sensitive = False
+        env_prefix = "ADMISSION_"
+
+
+class StorageSettings(BaseSettings):
+    """
+    Storage format settings for calculation results.
+
+    Attributes:
+        READ_LEGACY (bool): Whether results still stored only in the legacy JSONB column are read. Defaults to True.
+            Can be turned off once all rows have been converted to the array column.
+        WRITE_LEGACY (bool): Whether new results are also written to the legacy JSONB column, for instances
+            that cannot read the array column yet. Defaults to False.
+        STALE_POLICY (str): What to do with results of an older calculation version: "serve" them as they are
+            or "recompute" them on read. Defaults to "serve".
+
+    Config:
+        case_sensitive (bool): Indicates if environment variables are case-sensitive. Defaults to False.
+        env_prefix (str): Prefix for environment variables. Defaults to "STORAGE_".
+    """
+
+    READ_LEGACY: bool = True
+    WRITE_LEGACY: bool = False
+    STALE_POLICY: Literal["serve", "recompute"] = "serve"
+
+    class Config:
+        """
+        Configuration options for StorageSettings.
+
+        Attributes:
+            case_sensitive (bool): Whether environment variables are case-sensitive. Defaults to False.
+            env_prefix (str): The prefix for environment variables. Defaults to "STORAGE_".
+        """
+
+        case_sensitive = False
+        env_prefix = "STORAGE_"
+
+
+class RecomputeSettings(BaseSettings):
+    """
+    Settings of the background recompute job for stale calculation results.
+
+    Attributes:
+        CHUNK_SIZE (int): The number of rows read, recomputed and updated together. Defaults to 500.
+        WORKERS (int): The number of worker processes computing a chunk in parallel. Defaults to 2.
+        PAUSE (float): Seconds to wait between chunks, leaving database and CPU time to live traffic.
+            Defaults to 0.5.
+        NICE (int): The niceness added to the worker processes, so they yield the CPU to the application.
+            Defaults to 10.
+
+    Config:
+        case_sensitive (bool): Indicates if environment variables are case-sensitive. Defaults to False.
+        env_prefix (str): Prefix for environment variables. Defaults to "RECOMPUTE_".
+    """
+
+    CHUNK_SIZE: int = 500
+    WORKERS: int = 2
+    PAUSE: float = 0.5
+    NICE: int = 10
+
+    class Config:
+        """
+        Configuration options for RecomputeSettings.
+
+        Attributes:
+            case_sensitive (bool): Whether environment variables are case-sensitive. Defaults to False.
+            env_prefix (str): The prefix for environment variables. Defaults to "RECOMPUTE_".
+        """
+
+        case_sensitive = False
+        env_prefix = "RECOMPUTE_"
+
+
+class RateLimitSettings(BaseSettings):
+    """
+    Per-client rate limiting settings for the deposit routes.
+
+    Attributes:
+        ENABLED (bool): Whether requests are rate limited. Off by default, since every client behind one
+            address shares a bucket, e.g. a load generator. Defaults to False.
+        RATE (float): The average number of requests per second allowed to a client. Defaults to 20.0.
+        BURST (int): The number of requests a client may make at once. Defaults to 40.
+        IDLE_TTL (float): Seconds after which the bucket of an idle client is dropped. Defaults to 300.0.
+        MAX_CLIENTS (int): The maximal number of clients tracked in memory. Defaults to 100000.
+        API_KEY_HEADER (str): The header identifying a client; clients without it are identified by address.
+            Defaults to "X-API-Key".
+        BACKEND (str): "memory" for buckets of each worker process, or "sqlite" for buckets shared by the workers
+            of a host. Defaults to "memory".
+        SQLITE_PATH (str): The database file of the "sqlite" backend. Defaults to "/tmp/deposit-rate-limit.sqlite3".
+
+    Config:
+        case_sensitive (bool): Indicates if environment variables are case-sensitive. Defaults to False.
+        env_prefix (str): Prefix for environment variables. Defaults to "RATE_LIMIT_".
+    """
+
+    ENABLED: bool = False
+    RATE: float = 20.0
+    BURST: int = 40
+    IDLE_TTL: float = 300.0
+    MAX_CLIENTS: int = 100_000
+    API_KEY_HEADER: str = "X-API-Key"
+    BACKEND: Literal["memory", "sqlite"] = "memory"
+    SQLITE_PATH: str = "/tmp/deposit-rate-limit.sqlite3"
+
+    class Config:
+        """
+        Configuration options for RateLimitSettings.
+
+        Attributes:
+            case_sensitive (bool): Whether environment variables are case-sensitive. Defaults to False.
+            env_prefix (str): The prefix for environment variables. Defaults to "RATE_LIMIT_".
+        """
+
+        case_sensitive = False
+        env_prefix = "RATE_LIMIT_"
+
+
+@lru_cache
+def get_settings(settings_class: type[SettingsT]) -> SettingsT:
+    """
+    Get the shared instance of a settings class.
+
+    Building a settings object reads and validates the environment, so the application reads each class
+    once and shares the instance instead of building one per module or request.
+
+    Args:
+        settings_class (type[SettingsT]): The settings class, e.g. `AppSettings`.
+
+    Returns:
+        SettingsT: The instance built on the first call for `settings_class`.
+
+    Usage:
+        get_settings(AppSettings).TITLE
+    """
+    return settings_class()
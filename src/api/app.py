@@ -1,28 +1,83 @@
-from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker
 
-from settings import AppSettings, PostgresSettings
+from settings import (
+    AdmissionSettings,
+    AppSettings,
+    ComputeSettings,
+    DispatchSettings,
+    PostgresSettings,
+    RateLimitSettings,
+    ResponseSettings,
+    StorageSettings,
+    get_settings,
+)
+from src.api.middlewares.admission import AdmissionControlMiddleware, AdmissionLimiter
 from src.api.middlewares.exception import LogExceptionMiddleware
 from src.api.middlewares.logging import LogRequestsMiddleware
+from src.api.middlewares.rate_limit import RateLimitMiddleware, SqliteTokenBuckets, TokenBuckets
+from src.api.responses import ResultEncoder
 from src.api.routers.v1.deposit import router as deposit_router_v1
+from src.api.routers.v1.export import router as export_router_v1
+from src.api.routers.v1.metrics import router as metrics_router_v1
 from src.schemas.exceptions import ValidationError
+from src.utils.calculator import DepositCalculator
+from src.utils.deadlines import DeadlineExceededError, DeadlineSession, is_statement_timeout, set_statement_timeout
+from src.utils.dispatch import ComputeDispatcher
 from src.utils.logging.logger import init_logger
+from src.utils.storage import ResultStorage
+from src.utils.validation import format_validation_errors
 
 
 def setup_middlewares(app: FastAPI) -> None:
     """
     Configure middleware for the FastAPI application.
 
+    Admission control is added first, so that shed requests are still logged, and rate limiting
+    around it, so that throttled requests never wait for an admission slot. The admission limiter
+    and the token buckets are kept in the application state for the metrics endpoint.
+
     Args:
         app (FastAPI): The FastAPI application instance where middleware will be added.
     """
+    admission_settings = get_settings(AdmissionSettings)
+    app.state.admission = AdmissionLimiter(
+        max_concurrency=admission_settings.MAX_CONCURRENCY, max_queue=admission_settings.MAX_QUEUE
+    )
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        limiter=app.state.admission,
+        timeout=admission_settings.REQUEST_TIMEOUT,
+        retry_after=admission_settings.RETRY_AFTER,
+    )
+    rate_limit_settings = get_settings(RateLimitSettings)
+    if rate_limit_settings.BACKEND == "sqlite":
+        app.state.rate_limiter = SqliteTokenBuckets(
+            path=rate_limit_settings.SQLITE_PATH,
+            rate=rate_limit_settings.RATE,
+            burst=rate_limit_settings.BURST,
+            idle_ttl=rate_limit_settings.IDLE_TTL,
+        )
+    else:
+        app.state.rate_limiter = TokenBuckets(
+            rate=rate_limit_settings.RATE,
+            burst=rate_limit_settings.BURST,
+            idle_ttl=rate_limit_settings.IDLE_TTL,
+            max_clients=rate_limit_settings.MAX_CLIENTS,
+        )
+    if rate_limit_settings.ENABLED:
+        app.add_middleware(
+            RateLimitMiddleware,
+            buckets=app.state.rate_limiter,
+            api_key_header=rate_limit_settings.API_KEY_HEADER,
+        )
     app.add_middleware(
         LogExceptionMiddleware,
     )
@@ -42,48 +97,93 @@ def validation_exception_handler(request: Request, exc: RequestValidationError)
     Returns:
         JSONResponse: A formatted response with a 400 status code and validation error messages.
     """
-    error_message = "; ".join([f"{err['loc'][-1]}: {err['msg']}" for err in exc.errors()])
+    error_message = format_validation_errors(exc.errors())
     return JSONResponse(
         status_code=400,
         content={"error": error_message},
     )
 
 
+def deadline_exceeded_handler(request: Request, exc: DeadlineExceededError) -> JSONResponse:
+    """
+    Handle requests that did not finish before their deadline.
+
+    Args:
+        request (Request): The incoming HTTP request that ran out of time.
+        exc (DeadlineExceededError): The exception raised when the deadline passed.
+
+    Returns:
+        JSONResponse: A 503 response with `Retry-After`.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Request deadline exceeded, retry later"},
+        headers={"Retry-After": str(get_settings(AdmissionSettings).RETRY_AFTER)},
+    )
+
+
+def database_error_handler(request: Request, exc: DBAPIError) -> JSONResponse:
+    """
+    Handle database statements cancelled by the request deadline like other missed deadlines.
+
+    Args:
+        request (Request): The incoming HTTP request whose statement failed.
+        exc (DBAPIError): The database error.
+
+    Raises:
+        DBAPIError: Any other database error, unchanged.
+
+    Returns:
+        JSONResponse: A 503 response with `Retry-After`.
+    """
+    if not is_statement_timeout(exc):
+        raise exc
+    return deadline_exceeded_handler(request, DeadlineExceededError())
+
+
 def edit_openapi(app: FastAPI) -> None:
     """
     Customize the OpenAPI schema to replace default validation errors.
 
     Updates the schema to use a custom "ValidationError" model and adjusts
-    the response codes and examples for validation errors.
+    the response codes and examples for validation errors. Generating the schema walks every
+    route and model, so it is deferred: `app.openapi` is replaced with a function that builds
+    and edits the schema on the first request for it and caches the result.
 
     Args:
         app (FastAPI): The FastAPI application instance with the schema to modify.
     """
-    if app.openapi_schema:
-        return app.openapi_schema
+    generate_openapi = app.openapi
+
+    def openapi() -> dict:
+        if app.openapi_schema:
+            return app.openapi_schema
+
+        openapi_schema = generate_openapi()
+        schemas = openapi_schema.get("components", {}).get("schemas", {})
+        schemas.pop("HTTPValidationError", None)
 
-    openapi_schema = app.openapi()
-    schemas = openapi_schema.get("components", {}).get("schemas", {})
-    schemas.pop("HTTPValidationError", None)
+        openapi_schema["components"]["schemas"]["ValidationError"] = ValidationError.model_json_schema()
 
-    openapi_schema["components"]["schemas"]["ValidationError"] = ValidationError.model_json_schema()
+        for path in openapi_schema["paths"].values():
+            for method in path.values():
+                responses = method.get("responses", {})
+                if "422" in responses:
+                    responses["400"] = {
+                        "description": "Validation Error",
+                        "content": {
+                            "application/json": {
+                                "example": {"error": "field_name: validation message"},
+                                "schema": {"$ref": "#/components/schemas/ValidationError"},
+                            }
+                        },
+                    }
+                    del responses["422"]
 
-    for path in openapi_schema["paths"].values():
-        for method in path.values():
-            responses = method.get("responses", {})
-            if "422" in responses:
-                responses["400"] = {
-                    "description": "Validation Error",
-                    "content": {
-                        "application/json": {
-                            "example": {"error": "field_name: validation message"},
-                            "schema": {"$ref": "#/components/schemas/ValidationError"},
-                        }
-                    },
-                }
-                del responses["422"]
+        app.openapi_schema = openapi_schema
+        return openapi_schema
 
-    app.openapi_schema = openapi_schema
+    app.openapi = openapi
 
 
 @asynccontextmanager
@@ -91,8 +191,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     Define the application's lifespan, initializing and cleaning up resources.
 
-    This function initializes the database engine, session factory, and thread pool
-    executor when the application starts, and disposes of them on shutdown.
+    This function initializes the database engine, session factory, deposit calculator, result
+    encoder, compute dispatcher and result storage format when the application starts, and disposes
+    of them on shutdown.
 
     Args:
         app (FastAPI): The FastAPI application instance.
@@ -100,15 +201,45 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Yields:
         None: Indicates the application lifespan's active state.
     """
-    pg_settings = PostgresSettings()
-    app.state.engine = create_async_engine(pg_settings.url, echo=True)
-    app.state.async_session_factory = sessionmaker(bind=app.state.engine, class_=AsyncSession, expire_on_commit=False)
-    app.state.executor = ThreadPoolExecutor()
+    # Imported here so that importing the application does not load the asyncio extension and its driver glue.
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    pg_settings = get_settings(PostgresSettings)
+    app.state.engine = create_async_engine(
+        pg_settings.url, echo=True, pool_timeout=get_settings(AdmissionSettings).REQUEST_TIMEOUT
+    )
+    app.state.async_session_factory = sessionmaker(
+        bind=app.state.engine, class_=AsyncSession, sync_session_class=DeadlineSession, expire_on_commit=False
+    )
+    compute_settings = get_settings(ComputeSettings)
+    app.state.calculator = DepositCalculator(engine=compute_settings.ENGINE, rounding=compute_settings.ROUNDING)
+    response_settings = get_settings(ResponseSettings)
+    app.state.result_encoder = ResultEncoder(
+        min_size=response_settings.COMPRESSION_MIN_SIZE, cache_control=response_settings.CACHE_CONTROL
+    )
+    dispatch_settings = get_settings(DispatchSettings)
+    app.state.dispatcher = ComputeDispatcher(
+        inline_max_work=dispatch_settings.INLINE_MAX_WORK,
+        process_min_work=dispatch_settings.PROCESS_MIN_WORK,
+        thread_workers=dispatch_settings.THREAD_WORKERS,
+        process_workers=dispatch_settings.PROCESS_WORKERS,
+    )
+    storage_settings = get_settings(StorageSettings)
+    app.state.result_storage = ResultStorage(
+        read_legacy=storage_settings.READ_LEGACY,
+        write_legacy=storage_settings.WRITE_LEGACY,
+        stale_policy=storage_settings.STALE_POLICY,
+        engine=compute_settings.ENGINE,
+        rounding=compute_settings.ROUNDING,
+    )
 
     yield
 
     await app.state.engine.dispose()
-    app.state.executor.shutdown(wait=True)
+    app.state.dispatcher.shutdown()
+
+
+event.listen(DeadlineSession, "after_begin", set_statement_timeout)
 
 
 def create_app(settings: AppSettings) -> FastAPI:
@@ -116,7 +247,8 @@ def create_app(settings: AppSettings) -> FastAPI:
     Create and configure the FastAPI application.
 
     This function initializes logging, configures middleware, registers routes, sets
-    up exception handlers, and modifies the OpenAPI schema.
+    up exception handlers, and installs the OpenAPI schema customization, which only runs
+    once the schema is first requested.
 
     Args:
         settings (AppSettings): Application settings containing configuration values.
@@ -132,7 +264,11 @@ def create_app(settings: AppSettings) -> FastAPI:
     )
     setup_middlewares(app)
     app.include_router(deposit_router_v1)
+    app.include_router(metrics_router_v1)
+    app.include_router(export_router_v1)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(DeadlineExceededError, deadline_exceeded_handler)
+    app.add_exception_handler(DBAPIError, database_error_handler)
     edit_openapi(app)
 
     return app
@@ -1,58 +1,112 @@
-from asyncio import AbstractEventLoop, get_running_loop
-from concurrent.futures import ThreadPoolExecutor
-from typing import AsyncGenerator
-
 from fastapi import Depends, Request
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 
+from src.api.responses import ResultEncoder
+from src.schemas.deposits import DepositRequest
 from src.services.deposits import DepositService
+from src.utils.calculator import DepositCalculator
+from src.utils.dispatch import ComputeDispatcher
+from src.utils.storage import ResultStorage
+from src.utils.validation import decode_json_body
+
+
+async def get_session_factory(request: Request) -> sessionmaker:
+    """
+    Provides the application's session factory.
+
+
+    Args:
+        request (Request): The current FastAPI request object.
+
+    Returns:
+        sessionmaker: The session factory.
+    """
+    return request.app.state.async_session_factory
 
 
-async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+async def get_calculator(request: Request) -> DepositCalculator:
     """
-    Provides an asynchronous database session from the application's session factory.
+    Provides the deposit calculator configured in the application state.
 
     Args:
         request (Request): The current FastAPI request object.
 
-    Yields:
-        AsyncSession: The database session for the request context.
+    Returns:
+        DepositCalculator: The deposit calculator.
     """
-    async with request.app.state.async_session_factory() as session:
-        yield session
+    return request.app.state.calculator
 
 
-async def get_executor(request: Request) -> ThreadPoolExecutor:
+async def get_result_encoder(request: Request) -> ResultEncoder:
     """
-    Provides the thread pool executor configured in the application state.
+    Provides the calculation result encoder configured in the application state.
 
     Args:
         request (Request): The current FastAPI request object.
 
     Returns:
-        ThreadPoolExecutor: The thread pool executor.
+        ResultEncoder: The result encoder.
     """
-    return request.app.state.executor
+    return request.app.state.result_encoder
 
 
-async def get_event_loop() -> AbstractEventLoop:
+async def get_deposit_request(request: Request) -> DepositRequest:
     """
-    Provides the currently running asyncio event loop.
+    Provides the deposit parameters decoded from the raw JSON request body.
+
+    Replaces FastAPI's body parsing, which decodes the JSON into Python objects before validating them,
+    with a single `model_validate_json` pass; validation errors are reported the same way.
+
+    Args:
+        request (Request): The current FastAPI request object.
 
     Returns:
-        AbstractEventLoop: The current event loop.
+        DepositRequest: The validated deposit parameters.
     """
-    return get_running_loop()
+    return decode_json_body(DepositRequest, await request.body(), request.headers.get("content-type"))
 
 
-async def get_deposit_service(session: AsyncSession = Depends(get_db_session)) -> DepositService:
+async def get_dispatcher(request: Request) -> ComputeDispatcher:
     """
-    Provides an instance of the DepositService using the provided database session.
+    Provides the compute dispatcher configured in the application state.
+
+    Args:
+        request (Request): The current FastAPI request object.
+
+    Returns:
+        ComputeDispatcher: The compute dispatcher.
+    """
+    return request.app.state.dispatcher
+
+
+async def get_result_storage(request: Request) -> ResultStorage:
+    """
+    Provides the calculation result storage format configured in the application state.
+
+    Args:
+        request (Request): The current FastAPI request object.
+
+    Returns:
+        ResultStorage: The result storage format.
+    """
+    return request.app.state.result_storage
+
+
+async def get_deposit_service(
+    session_factory: sessionmaker = Depends(get_session_factory),
+    storage: ResultStorage = Depends(get_result_storage),
+) -> DepositService:
+    """
+    Provides an instance of the DepositService using the application's session factory.
+
+    No session is opened here: the service opens one per query, so requests that never reach the
+    database (cached, rejected or not modified) never take a connection from the pool.
 
     Args:
-        session (AsyncSession): The database session dependency.
+        session_factory (sessionmaker): The session factory dependency.
+        storage (ResultStorage): The result storage format dependency.
 
     Returns:
         DepositService: An instance of the deposit service.
     """
-    return DepositService(session=session)
+    return DepositService(session_factory=session_factory, storage=storage)
@@ -0,0 +1,124 @@
+import asyncio
+from collections import deque
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.utils.deadlines import deadline_scope
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit with a bounded wait queue.
+
+    At most `max_concurrency` requests run at once; up to `max_queue` more wait for a slot in arrival
+    order, and any further request is rejected right away.
+    """
+
+    def __init__(self, max_concurrency: int = 64, max_queue: int = 128) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def acquire(self, timeout: float) -> bool:
+        """
+        Take a slot, waiting for at most `timeout` seconds if all of them are in use.
+
+        Args:
+            timeout (float): The longest time to wait in the queue.
+
+        Returns:
+            bool: True if a slot was taken and must be released, False if the request was shed.
+        """
+        if self.active < self.max_concurrency and not self.waiters:
+            self.active += 1
+            return True
+        if len(self.waiters) >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            async with asyncio.timeout(timeout):
+                await waiter
+            return True
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            self.timed_out += 1
+            return False
+        finally:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Free a slot, handing it to the longest waiting request if there is one."""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        Get the current state and counters of the limiter.
+
+        Returns:
+            dict[str, int]: Running and waiting requests, and requests shed because the queue was full
+                or their wait timed out.
+        """
+        return {
+            "active": self.active,
+            "waiting": len(self.waiters),
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    Middleware that sheds load in front of the routes under `path_prefix`.
+
+    Admitted requests get a deadline of `timeout` seconds, which includes their time in the queue.
+    Requests that find the queue full, or do not get a slot before their deadline, are answered with
+    503 and `Retry-After` without reaching the application. Written as a plain ASGI middleware so that
+    the slot is held until a streamed response is complete.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: AdmissionLimiter,
+        path_prefix: str = "/api/v1/deposit",
+        timeout: float = 5.0,
+        retry_after: int = 1,
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.path_prefix = path_prefix
+        self.timeout = timeout
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        with deadline_scope(self.timeout):
+            if not await self.limiter.acquire(self.timeout):
+                response = JSONResponse(
+                    status_code=503,
+                    content={"detail": "Service overloaded, retry later"},
+                    headers={"Retry-After": str(self.retry_after)},
+                )
+                await response(scope, receive, send)
+                return
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.limiter.release()
@@ -5,9 +5,9 @@ from fastapi import HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from settings import AppSettings
+from settings import AppSettings, get_settings
 
-logger = logging.getLogger(AppSettings().TITLE)
+logger = logging.getLogger(get_settings(AppSettings).TITLE)
 
 
 class LogExceptionMiddleware(BaseHTTPMiddleware):
@@ -5,9 +5,9 @@ from typing import Awaitable, Callable
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from settings import AppSettings
+from settings import AppSettings, get_settings
 
-logger = logging.getLogger(AppSettings().TITLE)
+logger = logging.getLogger(get_settings(AppSettings).TITLE)
 
 
 class LogRequestsMiddleware(BaseHTTPMiddleware):
@@ -0,0 +1,265 @@
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from settings import AppSettings, get_settings
+
+logger = logging.getLogger(get_settings(AppSettings).TITLE)
+
+
+class TokenBuckets:
+    """
+    Per-client token buckets held in process memory.
+
+    Every client may make `burst` requests at once and `rate` requests per second on average. A bucket
+    is a `[tokens, updated, throttled]` list in an ordered dict kept in least recently used order, so
+    buckets idle for more than `idle_ttl` seconds are evicted from its front in constant time per
+    request, and the least recently used ones once there are more than `max_clients`. With an
+    `idle_ttl` of at least `burst / rate`, evicted buckets had refilled completely, so eviction never
+    grants a client more than a full bucket.
+    """
+
+    def __init__(self, rate: float, burst: int, idle_ttl: float = 300.0, max_clients: int = 100_000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.idle_ttl = idle_ttl
+        self.max_clients = max_clients
+        self.buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self.allowed = 0
+        self.throttled = 0
+
+    def take(self, key: str, now: float) -> float:
+        """
+        Take a token from the bucket of a client.
+
+        Args:
+            key (str): The client identity.
+            now (float): The current monotonic time in seconds.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the seconds until the next token is available.
+        """
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = [float(self.burst), now, 0]
+        else:
+            self.buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        self.evict(now)
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            self.allowed += 1
+            return 0.0
+        bucket[2] += 1
+        self.throttled += 1
+        return (1 - bucket[0]) / self.rate
+
+    def evict(self, now: float) -> None:
+        """
+        Drop idle buckets and the least recently used ones above the size limit.
+
+        Args:
+            now (float): The current monotonic time in seconds.
+        """
+        while self.buckets:
+            key, bucket = next(iter(self.buckets.items()))
+            if now - bucket[1] <= self.idle_ttl and len(self.buckets) <= self.max_clients:
+                return
+            del self.buckets[key]
+
+    async def acquire(self, key: str) -> float:
+        """
+        Take a token for a request of a client.
+
+        Args:
+            key (str): The client identity.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the seconds until the next token is available.
+        """
+        return self.take(key, time.monotonic())
+
+    async def snapshot(self, top: int = 10) -> dict[str, int | dict[str, int]]:
+        """
+        Get the throttle counters.
+
+        Args:
+            top (int): The number of most throttled clients to report. Defaults to 10.
+
+        Returns:
+            dict: The number of tracked clients, the allowed and throttled requests, and the throttled
+                requests of the most throttled clients still tracked.
+        """
+        throttled = sorted(((bucket[2], key) for key, bucket in self.buckets.items() if bucket[2]), reverse=True)
+        return {
+            "clients": len(self.buckets),
+            "allowed": self.allowed,
+            "throttled": self.throttled,
+            "top_throttled": {key: int(count) for count, key in throttled[:top]},
+        }
+
+
+class SqliteTokenBuckets(TokenBuckets):
+    """
+    Token buckets shared by the worker processes of a host through a local SQLite database.
+
+    Each request takes its token in an immediate transaction, so concurrent workers update a bucket one
+    after the other. Wall clock time is used, as monotonic clocks are not comparable across processes,
+    and the blocking database calls run in a thread. Idle buckets are deleted every `EVICT_EVERY` requests.
+    If the database fails, e.g. stays locked by another worker for longer than the timeout, the request is
+    allowed and the error is logged and counted, so the limiter never turns into a server error. The
+    allowed, throttled and failed totals count the requests of this process only.
+    """
+
+    EVICT_EVERY = 1000
+
+    def __init__(self, path: str, rate: float, burst: int, idle_ttl: float = 300.0) -> None:
+        import sqlite3
+
+        super().__init__(rate=rate, burst=burst, idle_ttl=idle_ttl)
+        self.connection = sqlite3.connect(path, timeout=1.0, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, throttled INTEGER NOT NULL) "
+            "WITHOUT ROWID"
+        )
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.failed = 0
+        self.database_error = sqlite3.Error
+
+    def take(self, key: str, now: float) -> float:
+        with self.lock:
+            try:
+                self.connection.execute("BEGIN IMMEDIATE")
+                row = self.connection.execute(
+                    "SELECT tokens, updated, throttled FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, throttled = float(self.burst), 0
+                if row is not None:
+                    tokens, throttled = min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate), row[2]
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+                if wait:
+                    throttled += 1
+                else:
+                    tokens -= 1
+                self.connection.execute(
+                    "INSERT INTO buckets (key, tokens, updated, throttled) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated, "
+                    "throttled = excluded.throttled",
+                    (key, tokens, now, throttled),
+                )
+                self.calls += 1
+                if self.calls % self.EVICT_EVERY == 0:
+                    self.evict(now)
+                self.connection.execute("COMMIT")
+            except self.database_error:
+                self.rollback()
+                self.failed += 1
+                self.allowed += 1
+                logger.warning("Rate limit store failed, request allowed", exc_info=True)
+                return 0.0
+            except BaseException:
+                self.rollback()
+                raise
+        if wait:
+            self.throttled += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def rollback(self) -> None:
+        if self.connection.in_transaction:
+            self.connection.execute("ROLLBACK")
+
+    def evict(self, now: float) -> None:
+        self.connection.execute("DELETE FROM buckets WHERE updated < ?", (now - self.idle_ttl,))
+
+    async def acquire(self, key: str) -> float:
+        return await asyncio.to_thread(self.take, key, time.time())
+
+    async def snapshot(self, top: int = 10) -> dict[str, int | dict[str, int]]:
+        def query() -> tuple[int, list[tuple[str, int]]]:
+            with self.lock:
+                clients = self.connection.execute("SELECT count(*) FROM buckets").fetchone()[0]
+                throttled = self.connection.execute(
+                    "SELECT key, throttled FROM buckets WHERE throttled > 0 ORDER BY throttled DESC LIMIT ?", (top,)
+                ).fetchall()
+            return clients, throttled
+
+        clients, throttled = await asyncio.to_thread(query)
+        return {
+            "clients": clients,
+            "allowed": self.allowed,
+            "throttled": self.throttled,
+            "failed": self.failed,
+            "top_throttled": dict(throttled),
+        }
+
+
+def client_key(scope: Scope, api_key_header: str = "x-api-key") -> str:
+    """
+    Get the identity a request is rate limited by.
+
+    Args:
+        scope (Scope): The ASGI scope of the request.
+        api_key_header (str): The lower-case name of the header carrying the API key. Defaults to "x-api-key".
+
+    Returns:
+        str: "key:" and a digest of the API key, so that keys are not exposed in metrics, or "ip:" and the
+            client address for requests without one.
+    """
+    header = api_key_header.encode()
+    for name, value in scope.get("headers", []):
+        if name == header and value:
+            return "key:" + hashlib.sha256(value).hexdigest()[:16]
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class RateLimitMiddleware:
+    """
+    Middleware that rate limits the routes under `path_prefix` per client.
+
+    Clients are identified by their API key, or by their address without one. Requests beyond the rate
+    of their client's token bucket are answered with 429 and `Retry-After` without reaching the
+    application, so they take neither an admission slot nor a database connection.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        buckets: TokenBuckets,
+        path_prefix: str = "/api/v1/deposit",
+        api_key_header: str = "X-API-Key",
+    ) -> None:
+        self.app = app
+        self.buckets = buckets
+        self.path_prefix = path_prefix
+        self.api_key_header = api_key_header.lower()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        wait = await self.buckets.acquire(client_key(scope, self.api_key_header))
+        if wait:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded, retry later"},
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -0,0 +1,77 @@
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.constants.deposit import FormatConstants
+from src.utils.formats import compress, content_codings, encode_result, media_types, negotiate
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body is produced while the request body is still being read.
+
+    `StreamingResponse` listens on `receive` for a client disconnect while streaming, which
+    consumes the request body messages the body iterator is reading at the same time and
+    silently drops parts of the upload. This response only streams and leaves `receive` to
+    the body iterator; a disconnect surfaces there as `ClientDisconnect`.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+class ResultEncoder:
+    """
+    Encodes calculation results according to the content negotiation headers of a request.
+
+    Results are encoded in the format chosen by `Accept` (the dict form as JSON by default, or the
+    columnar form as JSON or MessagePack) and compressed with the coding chosen by `Accept-Encoding`
+    once the encoded body reaches `min_size` bytes. Cacheable responses carry `cache_control`.
+    """
+
+    VARY = "Accept, Accept-Encoding"
+
+    def __init__(self, min_size: int = 1024, cache_control: str = "public, max-age=3600") -> None:
+        self.min_size = min_size
+        self.cache_control = cache_control
+
+    def negotiate(self, request: Request) -> tuple[str, str | None]:
+        """
+        Choose the representation of a result for a request.
+
+        Args:
+            request (Request): The current request.
+
+        Returns:
+            tuple[str, str | None]: The media type and the content coding used for bodies of at
+                least `min_size` bytes, or None if the client accepts no compression. A request
+                accepting none of the formats gets the default one.
+        """
+        media_type = negotiate(media_types(), request.headers.get("accept")) or FormatConstants.JSON_MEDIA_TYPE.value
+        coding = negotiate(content_codings(), request.headers.get("accept-encoding", "identity"))
+        return media_type, coding
+
+    def response(
+        self, request: Request, result: dict[str, float], status_code: int = 200, headers: dict[str, str] | None = None
+    ) -> Response:
+        """
+        Build the response for a calculation result.
+
+        Args:
+            request (Request): The current request.
+            result (dict[str, float]): The deposit values keyed by month-end date.
+            status_code (int): The response status code. Defaults to 200.
+            headers (dict[str, str] | None): Additional response headers.
+
+        Returns:
+            Response: The encoded and possibly compressed result.
+        """
+        media_type, coding = self.negotiate(request)
+        body = encode_result(result, media_type)
+        headers = {"Vary": self.VARY, **(headers or {})}
+        if coding is not None and len(body) >= self.min_size:
+            body = compress(body, coding)
+            headers["Content-Encoding"] = coding
+        return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
@@ -1,23 +1,78 @@
-from asyncio import AbstractEventLoop
-from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, AsyncGenerator
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 
-from src.api.depends import get_deposit_service, get_event_loop, get_executor
-from src.schemas.deposits import DepositRequest
+from src.api.depends import (
+    get_calculator,
+    get_deposit_request,
+    get_deposit_service,
+    get_dispatcher,
+    get_result_encoder,
+)
+from src.api.responses import ResultEncoder, UploadStreamingResponse
+from src.constants.deposit import BulkConstants, DepositConstants, FormatConstants
+from src.schemas.deposits import (
+    ColumnarDepositResponse,
+    DepositRequest,
+    PortfolioRequest,
+    PortfolioResponse,
+    SolveRequest,
+    SolveResponse,
+    SweepRequest,
+    SweepResponse,
+)
+from src.schemas.exceptions import ValidationError
 from src.services.deposits import DepositService
-from src.utils.deposit import compute_deposit
+from src.utils.bulk import (
+    deposit_key,
+    encode_results,
+    iter_chunks,
+    iter_lines,
+    iter_rows,
+    parse_csv_header,
+    prepend,
+)
+from src.utils.calculator import DepositCalculator
+from src.utils.deadlines import renew_deadline
+from src.utils.deposit import aggregate_portfolio, maturity_date, sweep_deposit, take_months
+from src.utils.dispatch import ComputeDispatcher
+from src.utils.http_cache import canonical_params, etag_matches, make_etag
+from src.utils.solver import deposit_value, solve_amount, solve_periods
 
 router = APIRouter(prefix="/api/v1/deposit", tags=["deposit"])
 
 
-@router.post("/calculate-deposit")
+RESULT_RESPONSES = {
+    200: {
+        "content": {
+            FormatConstants.COLUMNAR_MEDIA_TYPE.value: {"schema": ColumnarDepositResponse.model_json_schema()},
+            FormatConstants.MSGPACK_MEDIA_TYPE.value: {},
+        }
+    }
+}
+
+
+@router.post(
+    "/calculate-deposit",
+    response_model=dict[str, float],
+    responses=RESULT_RESPONSES,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": DepositRequest.model_json_schema()}},
+        }
+    },
+)
 async def calculate_deposit(
-    payload: DepositRequest,
+    request: Request,
+    payload: DepositRequest = Depends(get_deposit_request),
     deposit_service: DepositService = Depends(get_deposit_service),
-    executor: ThreadPoolExecutor = Depends(get_executor),
-    loop: AbstractEventLoop = Depends(get_event_loop),
-) -> dict[str, str | float]:
+    calculator: DepositCalculator = Depends(get_calculator),
+    result_encoder: ResultEncoder = Depends(get_result_encoder),
+    dispatcher: ComputeDispatcher = Depends(get_dispatcher),
+) -> Response:
     """
     Calculate or retrieve deposit details.
 
@@ -25,18 +80,303 @@ async def calculate_deposit(
     If the same parameters already exist in the database, it retrieves the existing result.
     Otherwise, it performs the calculation, saves the result to the database, and returns it.
 
+    The result is a dict keyed by month-end date by default. Clients can request the columnar form
+    (the first month end and a values array) with `Accept: application/vnd.deposit.columnar+json`
+    or, if MessagePack is installed, `Accept: application/msgpack`. Large results are compressed
+    according to `Accept-Encoding`. The body is decoded by `get_deposit_request` in a single pass.
+
     Args:
+        request (Request): The current request, used for content negotiation.
         payload (DepositRequest): The deposit parameters.
         deposit_service (DepositService): Dependency for interacting with the database.
-        executor (ThreadPoolExecutor): Thread pool for running blocking computations.
-        loop (AbstractEventLoop): Current asyncio event loop.
+        calculator (DepositCalculator): The configured calculation engine.
+        result_encoder (ResultEncoder): Encoder of the negotiated response format.
+        dispatcher (ComputeDispatcher): Runs blocking computations inline or in a pool by size.
+
+    Returns:
+        Response: The calculation result in the negotiated format.
+    """
+    calculation_result = await get_or_compute(payload, deposit_service, calculator, dispatcher)
+    return result_encoder.response(request, calculation_result)
+
+
+@router.get(
+    "/calculate-deposit",
+    response_model=dict[str, float],
+    responses={**RESULT_RESPONSES, 304: {"description": "Not Modified"}},
+)
+async def get_deposit(
+    request: Request,
+    payload: Annotated[DepositRequest, Query()],
+    deposit_service: DepositService = Depends(get_deposit_service),
+    calculator: DepositCalculator = Depends(get_calculator),
+    result_encoder: ResultEncoder = Depends(get_result_encoder),
+    dispatcher: ComputeDispatcher = Depends(get_dispatcher),
+) -> Response:
+    """
+    Calculate or retrieve deposit details, cacheably.
+
+    A `GET` variant of the `POST` endpoint taking the deposit parameters as query parameters, so that
+    browsers and shared caches can store the result. Responses carry a strong `ETag` derived from the
+    canonical parameters, the calculation engine and version and the negotiated representation, and the configured
+    `Cache-Control`. A request whose `If-None-Match` matches gets 304 without a database lookup.
+
+    Args:
+        request (Request): The current request, used for content negotiation and conditional headers.
+        payload (DepositRequest): The deposit parameters.
+        deposit_service (DepositService): Dependency for interacting with the database.
+        calculator (DepositCalculator): The configured calculation engine.
+        result_encoder (ResultEncoder): Encoder of the negotiated response format.
+        dispatcher (ComputeDispatcher): Runs blocking computations inline or in a pool by size.
+
+    Returns:
+        Response: The calculation result in the negotiated format, or 304 Not Modified.
+    """
+    media_type, coding = result_encoder.negotiate(request)
+    etag = make_etag(
+        canonical_params(payload),
+        calculator.engine,
+        calculator.rounding,
+        str(DepositConstants.CALCULATION_VERSION.value),
+        media_type,
+        coding or "identity",
+    )
+    headers = {"ETag": etag, "Cache-Control": result_encoder.cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"Vary": result_encoder.VARY, **headers})
+    calculation_result = await get_or_compute(payload, deposit_service, calculator, dispatcher)
+    return result_encoder.response(request, calculation_result, headers=headers)
+
+
+async def get_or_compute(
+    payload: DepositRequest,
+    deposit_service: DepositService,
+    calculator: DepositCalculator,
+    dispatcher: ComputeDispatcher,
+) -> dict[str, float]:
+    """
+    Retrieve a stored calculation result, or calculate and store it.
+
+    The longest stored result for the same date, amount and rate is reused: a longer one is cut to
+    the requested periods, and a shorter one is extended with only the missing months and upgraded
+    in place, instead of storing a second row with the same leading months. A stored result that
+    cannot be served, e.g. a stale one under the "recompute" policy, is recomputed for all of its
+    months and replaced in place. So is a stale one served under the "serve" policy once it has to be
+    extended, since the upgraded row is labeled with the current version and must not keep months
+    computed by the old formulas.
+
+    Args:
+        payload (DepositRequest): The deposit parameters.
+        deposit_service (DepositService): Service for interacting with the database.
+        calculator (DepositCalculator): The configured calculation engine.
+        dispatcher (ComputeDispatcher): Runs blocking computations inline or in a pool by size.
+
+    Returns:
+        dict[str, float]: The deposit values keyed by month-end date.
+    """
+    deposit = await deposit_service.get_longest(payload)
+    stored = deposit_service.result(deposit) if deposit else None
+    if stored is not None and deposit.periods >= payload.periods:
+        return take_months(stored, payload.date, payload.periods)
+    if stored is not None and not deposit_service.is_stale(deposit):
+        tail = await dispatcher.run(payload.periods - deposit.periods, calculator.compute, payload, deposit.periods)
+        calculation_result = take_months(stored | tail, payload.date, payload.periods)
+        await deposit_service.upgrade(deposit, calculation_result)
+        return calculation_result
+    if not deposit:
+        calculation_result = await dispatcher.run(payload.periods, calculator.compute, payload)
+        await deposit_service.create(payload, calculation_result)
+        return calculation_result
+    periods = max(deposit.periods, payload.periods)
+    calculation_result = await dispatcher.run(
+        periods, calculator.compute, payload.model_copy(update={"periods": periods})
+    )
+    await deposit_service.upgrade(deposit, calculation_result)
+    return take_months(calculation_result, payload.date, payload.periods)
+
+
+@router.post(
+    "/calculate-deposit/bulk",
+    response_class=UploadStreamingResponse,
+    responses={
+        200: {"content": {BulkConstants.NDJSON_MEDIA_TYPE.value: {}}},
+        400: {"model": ValidationError, "description": "Invalid CSV header"},
+        415: {"description": "Unsupported media type"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                BulkConstants.NDJSON_MEDIA_TYPE.value: {
+                    "schema": {"type": "string"},
+                    "example": '{"date": "01.01.2023", "periods": 12, "amount": 100000, "rate": 5.0}\n',
+                },
+                BulkConstants.CSV_MEDIA_TYPE.value: {
+                    "schema": {"type": "string"},
+                    "example": "date,periods,amount,rate\n01.01.2023,12,100000,5.0\n",
+                },
+            },
+        }
+    },
+)
+async def calculate_deposits_bulk(
+    request: Request,
+    deposit_service: DepositService = Depends(get_deposit_service),
+    calculator: DepositCalculator = Depends(get_calculator),
+    dispatcher: ComputeDispatcher = Depends(get_dispatcher),
+) -> Response:
+    """
+    Calculate deposit details for a streamed batch of scenarios.
+
+    This endpoint accepts an NDJSON or CSV body with one deposit scenario per line and processes it
+    in chunks: each chunk is validated, looked up in the database with a single query, the missing
+    results are computed and persisted in one batch, and the results are streamed back as NDJSON.
+    Invalid rows are reported inline and do not fail the rest of the upload. Each record carries
+    the 1-based line number of its row in the upload; the CSV header and blank lines are counted.
+
+    A CSV header is optional and its column names are case-insensitive; without one, the columns
+    are "date,periods,amount,rate". Each chunk gets the full request deadline; its lookup and insert
+    each hold a database connection only while they run.
+
+    Args:
+        request (Request): The current request, whose body is consumed as a stream.
+        deposit_service (DepositService): Dependency for interacting with the database.
+        calculator (DepositCalculator): The configured calculation engine.
+        dispatcher (ComputeDispatcher): Runs blocking computations inline or in a pool by size.
+
+    Raises:
+        HTTPException: 415 if the body is neither NDJSON nor CSV.
 
     Returns:
-        dict[str, str | float]: The calculation result as a dictionary.
-    """
-    deposit = await deposit_service.get(payload)
-    if deposit:
-        return deposit.calculation_result
-    calculation_result = await loop.run_in_executor(executor, compute_deposit, payload)
-    await deposit_service.create(payload, calculation_result)
-    return calculation_result
+        Response: One `{"line": n, "result": {...}}` or `{"line": n, "error": "..."}` record per row.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in (BulkConstants.NDJSON_MEDIA_TYPE.value, BulkConstants.CSV_MEDIA_TYPE.value):
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported media type: {media_type or 'none'}. "
+            f"Expected {BulkConstants.NDJSON_MEDIA_TYPE.value} or {BulkConstants.CSV_MEDIA_TYPE.value}",
+        )
+
+    lines = iter_lines(request.stream())
+    header = None
+    if media_type == BulkConstants.CSV_MEDIA_TYPE.value:
+        first = await anext(lines, None)
+        try:
+            header = parse_csv_header(first[1]) if first and isinstance(first[1], str) else None
+        except ValueError as exc:
+            return JSONResponse(status_code=400, content={"error": str(exc)})
+        if first and header is None:
+            lines = prepend(first, lines)
+    rows = iter_rows(lines, media_type, header=header)
+
+    async def stream_results() -> AsyncGenerator[bytes, None]:
+        async for chunk in iter_chunks(rows):
+            renew_deadline()
+            payloads = [payload for _, payload, _ in chunk if payload is not None]
+            records = await deposit_service.get_many(payloads)
+            results = {key: deposit_service.result(deposit) for key, deposit in records.items()}
+            missing = list({deposit_key(p): p for p in payloads if results.get(deposit_key(p)) is None}.values())
+            work = sum(payload.periods for payload in missing)
+            computed = await dispatcher.run(work, calculator.compute_many, missing) if missing else []
+            await deposit_service.create_many(missing, computed)
+
+            results.update(zip(map(deposit_key, missing), computed, strict=True))
+            yield encode_results(
+                {"line": number, "error": error}
+                if payload is None
+                else {"line": number, "result": results[deposit_key(payload)]}
+                for number, payload, error in chunk
+            )
+
+    return UploadStreamingResponse(stream_results(), media_type=BulkConstants.NDJSON_MEDIA_TYPE.value)
+
+
+@router.post("/portfolio")
+async def calculate_portfolio(
+    payload: PortfolioRequest,
+    dispatcher: ComputeDispatcher = Depends(get_dispatcher),
+) -> PortfolioResponse:
+    """
+    Calculate the aggregated balance of a portfolio of deposits.
+
+    This endpoint replaces fetching every deposit of a portfolio separately and summing the results
+    by date: it returns one series with the total balance for each month end, from the first month
+    of the earliest deposit to the last month of the latest one.
+
+    Args:
+        payload (PortfolioRequest): The deposits of the portfolio.
+        dispatcher (ComputeDispatcher): Runs blocking computations inline or in a pool by size.
+
+    Returns:
+        PortfolioResponse: The first month end and the balances for consecutive month ends.
+    """
+    work = sum(deposit.periods for deposit in payload.deposits)
+    start, values = await dispatcher.run(work, aggregate_portfolio, payload.deposits)
+    return PortfolioResponse(start=start.strftime(DepositConstants.DATE_FORMAT.value), values=values)
+
+
+@router.post("/sweep")
+async def calculate_sweep(
+    payload: SweepRequest,
+    dispatcher: ComputeDispatcher = Depends(get_dispatcher),
+) -> SweepResponse:
+    """
+    Calculate deposit balances for a grid of interest rates and numbers of periods.
+
+    This endpoint replaces one `calculate-deposit` call per rate and period count: it returns the
+    balance at maturity for every combination, with rates as rows and period counts as columns.
+
+    Args:
+        payload (SweepRequest): The start date, amount and the swept rates and period counts.
+        dispatcher (ComputeDispatcher): Runs blocking computations inline or in a pool by size.
+
+    Returns:
+        SweepResponse: The swept rates, period counts, maturity dates and the balance matrix.
+    """
+    rates = payload.rates
+    work = len(rates) * max(payload.periods)
+    values = await dispatcher.run(work, sweep_deposit, payload.amount, rates, payload.periods)
+    return SweepResponse(
+        rates=rates,
+        periods=payload.periods,
+        maturity_dates=[
+            maturity_date(payload.date, periods).strftime(DepositConstants.DATE_FORMAT.value)
+            for periods in payload.periods
+        ],
+        values=values,
+    )
+
+
+@router.post("/solve", responses={400: {"model": ValidationError, "description": "Validation Error"}})
+async def solve_deposit(payload: SolveRequest) -> SolveResponse:
+    """
+    Find the minimal deposit amount or number of months reaching a target balance.
+
+    Exactly one of `amount` and `periods` is given, and the other one is solved for. The result
+    is the smallest value within the `DepositConstants` bounds for which `calculate-deposit`
+    returns a final balance of at least `target`.
+
+    Args:
+        payload (SolveRequest): The target balance and the fixed deposit parameters.
+
+    Raises:
+        RequestValidationError: If the target is not reachable within the bounds.
+
+    Returns:
+        SolveResponse: The solved parameters and the balance at maturity.
+    """
+    try:
+        if payload.amount is None:
+            amount, periods = solve_amount(payload.target, payload.rate, payload.periods), payload.periods
+        else:
+            amount, periods = payload.amount, solve_periods(payload.target, payload.amount, payload.rate)
+    except ValueError as exc:
+        raise RequestValidationError([{"type": "value_error", "loc": ("body", "target"), "msg": str(exc)}]) from None
+
+    return SolveResponse(
+        amount=amount,
+        periods=periods,
+        balance=deposit_value(amount, payload.rate, periods),
+        maturity_date=maturity_date(payload.date, periods).strftime(DepositConstants.DATE_FORMAT.value),
+    )
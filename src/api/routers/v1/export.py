@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Annotated, AsyncGenerator
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from src.api.depends import get_calculator, get_deposit_service, get_dispatcher
+from src.constants.deposit import BulkConstants, DepositConstants
+from src.schemas.deposits import DepositRequest, ExportRequest
+from src.schemas.exceptions import ValidationError
+from src.services.deposits import DepositService
+from src.utils.calculator import DepositCalculator
+from src.utils.dispatch import ComputeDispatcher
+from src.utils.export import csv_header, encode_csv, encode_ndjson
+
+router = APIRouter(prefix="/api/v1/export", tags=["export"])
+
+
+@router.get(
+    "/deposits",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {BulkConstants.CSV_MEDIA_TYPE.value: {}, BulkConstants.NDJSON_MEDIA_TYPE.value: {}}},
+        400: {"model": ValidationError, "description": "Invalid export parameters"},
+    },
+)
+async def export_deposits(
+    params: Annotated[ExportRequest, Query()],
+    deposit_service: DepositService = Depends(get_deposit_service),
+    calculator: DepositCalculator = Depends(get_calculator),
+    dispatcher: ComputeDispatcher = Depends(get_dispatcher),
+) -> StreamingResponse:
+    """
+    Export the stored deposits as a stream.
+
+    Deposits are read through a server-side cursor and written batch by batch as they arrive, so a
+    full export runs in constant memory and as a single query instead of many paged ones. Deposits
+    can be limited to a range of start dates. Each deposit is one CSV row or NDJSON line with its whole
+    calculation result (JSON-encoded in CSV), or, flattened, one row per month with its month end and
+    value. The route is outside the deposit routes, so exports are not cut off by the request deadline.
+
+    Deposits whose stored result cannot be served, e.g. stale ones under the "recompute" policy or
+    ones computed by another engine, are recomputed batch by batch for the export. They are not
+    written back; that is left to the recompute job.
+
+    Args:
+        params (ExportRequest): The output format and the date range.
+        deposit_service (DepositService): Dependency for interacting with the database.
+        calculator (DepositCalculator): The configured calculation engine.
+        dispatcher (ComputeDispatcher): Runs blocking computations inline or in a pool by size.
+
+    Returns:
+        StreamingResponse: The deposits as a CSV or NDJSON attachment.
+    """
+    if params.format == "csv":
+        media_type = BulkConstants.CSV_MEDIA_TYPE.value
+        encode = encode_csv
+    else:
+        media_type = BulkConstants.NDJSON_MEDIA_TYPE.value
+        encode = encode_ndjson
+
+    async def stream_export() -> AsyncGenerator[bytes, None]:
+        if params.format == "csv":
+            yield csv_header(params.flatten)
+        async for batch in deposit_service.stream(params.date_from, params.date_to):
+            missing = [record for record in batch if record["calculation_result"] is None]
+            if missing:
+                payloads = [
+                    DepositRequest.model_construct(
+                        date=datetime.strptime(record["date"], DepositConstants.DATE_FORMAT.value),
+                        periods=record["periods"],
+                        amount=record["amount"],
+                        rate=record["rate"],
+                    )
+                    for record in missing
+                ]
+                work = sum(payload.periods for payload in payloads)
+                computed = await dispatcher.run(work, calculator.compute_many, payloads)
+                for record, calculation_result in zip(missing, computed, strict=True):
+                    record["calculation_result"] = calculation_result
+            yield encode(batch, params.flatten)
+
+    return StreamingResponse(
+        stream_export(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="deposits.{params.format}"'},
+    )
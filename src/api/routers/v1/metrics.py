@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Request
+
+from src.api.depends import get_dispatcher
+from src.utils.dispatch import ComputeDispatcher
+
+router = APIRouter(prefix="/api/v1/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics(request: Request, dispatcher: ComputeDispatcher = Depends(get_dispatcher)) -> dict[str, dict]:
+    """
+    Get runtime metrics of the service.
+
+    Args:
+        request (Request): The current request, whose application state holds the admission and rate limiters.
+        dispatcher (ComputeDispatcher): The compute dispatcher whose job timings are reported.
+
+    Returns:
+        dict[str, dict]: The job count and total, mean and maximal time per dispatch mode under "dispatch",
+            the running, waiting and shed requests of the deposit routes under "admission", and the allowed
+            and throttled requests in total and of the most throttled clients under "rate_limit".
+    """
+    return {
+        "dispatch": dispatcher.metrics.snapshot(),
+        "admission": request.app.state.admission.snapshot(),
+        "rate_limit": await request.app.state.rate_limiter.snapshot(),
+    }
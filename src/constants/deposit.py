@@ -16,6 +16,10 @@ class DepositConstants(Enum):
         MAX_RATE (float): Maximum interest rate.
 
         DATE_FORMAT (str): The expected format for deposit dates.
+        DATE_CACHE_SIZE (int): Number of recently parsed date strings kept in memory.
+
+        CALCULATION_VERSION (int): Version of the calculation formulas, stored with every result. Must be
+            increased with every change that alters calculated values, e.g. their rounding.
     """
 
     MIN_PERIODS: int = 1
@@ -28,3 +32,92 @@ class DepositConstants(Enum):
     MAX_RATE: float = 8.0
 
     DATE_FORMAT: str = "%d.%m.%Y"
+    DATE_CACHE_SIZE: int = 4096
+
+    CALCULATION_VERSION: int = 1
+
+
+class BulkConstants(Enum):
+    """
+    Enumeration for bulk scenario import constants.
+
+    Attributes:
+        CHUNK_SIZE (int): Number of rows validated, computed and persisted together.
+        MAX_LINE_LENGTH (int): Longest accepted line in characters; longer lines are reported as row errors.
+
+        NDJSON_MEDIA_TYPE (str): Media type of newline-delimited JSON uploads and results.
+        CSV_MEDIA_TYPE (str): Media type of CSV uploads.
+    """
+
+    CHUNK_SIZE: int = 500
+    MAX_LINE_LENGTH: int = 4096
+
+    NDJSON_MEDIA_TYPE: str = "application/x-ndjson"
+    CSV_MEDIA_TYPE: str = "text/csv"
+
+
+class ExportConstants(Enum):
+    """
+    Enumeration for deposits export constants.
+
+    Attributes:
+        BATCH_SIZE (int): Number of rows fetched from the server-side cursor and encoded together.
+        CSV_FIELDS (tuple): Columns of a CSV export, with the JSON-encoded result in the last one.
+        FLAT_CSV_FIELDS (tuple): Columns of a flattened CSV export, with one row per deposit month.
+    """
+
+    BATCH_SIZE: int = 1000
+
+    CSV_FIELDS: tuple = ("date", "periods", "amount", "rate", "calculation_result")
+    FLAT_CSV_FIELDS: tuple = ("date", "periods", "amount", "rate", "month_end", "value")
+
+
+class PortfolioConstants(Enum):
+    """
+    Enumeration for portfolio aggregation constants.
+
+    Attributes:
+        MIN_DEPOSITS (int): Minimum number of deposits in a portfolio.
+        MAX_DEPOSITS (int): Maximum number of deposits in a portfolio.
+    """
+
+    MIN_DEPOSITS: int = 1
+    MAX_DEPOSITS: int = 100
+
+
+class SweepConstants(Enum):
+    """
+    Enumeration for scenario sweep constants.
+
+    Attributes:
+        DEFAULT_RATE_STEP (float): Default step between swept interest rates.
+        MIN_RATE_STEP (float): Minimum step between swept interest rates.
+
+        MAX_PERIODS (int): Maximum number of swept period counts.
+    """
+
+    DEFAULT_RATE_STEP: float = 0.1
+    MIN_RATE_STEP: float = 0.01
+
+    MAX_PERIODS: int = 60
+
+
+class FormatConstants(Enum):
+    """
+    Enumeration for response format constants.
+
+    Attributes:
+        JSON_MEDIA_TYPE (str): Media type of the default result form, a dict keyed by month-end date.
+        COLUMNAR_MEDIA_TYPE (str): Media type of the columnar result form, the first month end and a values array.
+        MSGPACK_MEDIA_TYPE (str): Media type of the columnar result form encoded as MessagePack.
+
+        GZIP_LEVEL (int): Compression level of gzip responses.
+        BROTLI_QUALITY (int): Compression quality of Brotli responses.
+    """
+
+    JSON_MEDIA_TYPE: str = "application/json"
+    COLUMNAR_MEDIA_TYPE: str = "application/vnd.deposit.columnar+json"
+    MSGPACK_MEDIA_TYPE: str = "application/msgpack"
+
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 5
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, DateTime, Float, Integer, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION, JSONB
 
 from src.models.core import Base
 
@@ -9,14 +9,19 @@ class Deposit(Base):
     ORM model for the 'deposits' table.
 
     Represents a deposit record with unique parameters (date, periods, amount, and rate).
-    Stores calculation results in a JSONB field.
+    Stores calculation results as an array of values; the month-end keys are derived from the date.
+    Rows written before the array column existed keep their results in the legacy JSONB field.
 
     Attributes:
         date (DateTime): The date of the deposit.
         periods (Integer): The number of periods for the deposit.
         amount (Integer): The amount deposited.
         rate (Float): The interest rate of the deposit.
-        calculation_result (JSONB): The JSONB column to store calculation results.
+        calculation_result (JSONB): The legacy JSONB column with calculation results keyed by date.
+        calculation_values (ARRAY): The calculation results at the consecutive month ends.
+        calculation_version (Integer): The version of the calculation formulas that produced the results.
+        calculation_engine (String): The calculation engine that produced the results, "float" or "fixed".
+        calculation_rounding (String): The rounding mode of the "fixed" engine, NULL for the "float" engine.
     """
 
     __tablename__ = "deposits"
@@ -26,5 +31,12 @@ class Deposit(Base):
     amount = Column(Integer, nullable=False)
     rate = Column(Float, nullable=False)
     calculation_result = Column(JSONB)
-
-    __table_args__ = (UniqueConstraint("date", "periods", "amount", "rate", name="uq_deposit_params"),)
+    calculation_values = Column(ARRAY(DOUBLE_PRECISION))
+    calculation_version = Column(Integer, nullable=False, server_default="1")
+    calculation_engine = Column(String(16), nullable=False, server_default="float")
+    calculation_rounding = Column(String(16))
+
+    __table_args__ = (
+        UniqueConstraint("date", "periods", "amount", "rate", name="uq_deposit_params"),
+        Index("ix_deposits_series", "date", "amount", "rate", "periods"),
+    )
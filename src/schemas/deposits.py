@@ -1,8 +1,10 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
-from src.constants.deposit import DepositConstants
+from src.constants.deposit import DepositConstants, PortfolioConstants, SweepConstants
+from src.utils.dates import parse_date_string
 
 
 class DepositRequest(BaseModel):
@@ -28,7 +30,175 @@ class DepositRequest(BaseModel):
     @field_validator("date", mode="before")
     def parse_date(cls, value: str) -> datetime:  # noqa: N805
         """Convert string to datetime object based on the expected format."""
-        try:
-            return datetime.strptime(value, DepositConstants.DATE_FORMAT.value)
-        except ValueError:
-            raise ValueError(f"Invalid date format: {value}. Expected format: dd.mm.yyyy") from None
+        if isinstance(value, str):
+            try:
+                return parse_date_string(value)
+            except ValueError:
+                pass
+        raise ValueError(f"Invalid date format: {value}. Expected format: dd.mm.yyyy")
+
+
+class ColumnarDepositResponse(BaseModel):
+    """Schema for the columnar form of a deposit calculation response."""
+
+    start: str = Field(description="First month end of the series in dd.mm.yyyy format", examples=["31.01.2023"])
+    values: list[float] = Field(description="Deposit value for each consecutive month end starting at `start`")
+
+
+class PortfolioRequest(BaseModel):
+    """Schema for portfolio aggregation request."""
+
+    deposits: list[DepositRequest] = Field(
+        min_length=PortfolioConstants.MIN_DEPOSITS.value,
+        max_length=PortfolioConstants.MAX_DEPOSITS.value,
+        description="Deposits held in the portfolio",
+    )
+
+
+class PortfolioResponse(BaseModel):
+    """Schema for portfolio aggregation response."""
+
+    start: str = Field(description="First month end of the series in dd.mm.yyyy format", examples=["31.01.2023"])
+    values: list[float] = Field(description="Total balance for each consecutive month end starting at `start`")
+
+
+class SweepRequest(BaseModel):
+    """Schema for scenario sweep request."""
+
+    date: datetime = Field(description="Date in dd.mm.yyyy format", examples=["01.01.2023"])
+    amount: int = Field(
+        ge=DepositConstants.MIN_AMOUNT.value,
+        le=DepositConstants.MAX_AMOUNT.value,
+        description="Deposit amount",
+    )
+    rate_from: float = Field(
+        default=DepositConstants.MIN_RATE.value,
+        ge=DepositConstants.MIN_RATE.value,
+        le=DepositConstants.MAX_RATE.value,
+        description="First interest rate of the sweep",
+    )
+    rate_to: float = Field(
+        default=DepositConstants.MAX_RATE.value,
+        ge=DepositConstants.MIN_RATE.value,
+        le=DepositConstants.MAX_RATE.value,
+        description="Last interest rate of the sweep, inclusive",
+    )
+    rate_step: float = Field(
+        default=SweepConstants.DEFAULT_RATE_STEP.value,
+        ge=SweepConstants.MIN_RATE_STEP.value,
+        description="Step between swept interest rates",
+    )
+    periods: list[int] = Field(
+        min_length=1,
+        max_length=SweepConstants.MAX_PERIODS.value,
+        description="Numbers of deposit months to sweep",
+        examples=[[3, 6, 12, 24, 36]],
+    )
+
+    @field_validator("date", mode="before")
+    def parse_date(cls, value: str) -> datetime:  # noqa: N805
+        """Convert string to datetime object based on the expected format."""
+        return DepositRequest.parse_date(value)
+
+    @field_validator("periods")
+    def check_periods(cls, value: list[int]) -> list[int]:  # noqa: N805
+        """Ensure every period count is within the deposit bounds."""
+        low, high = DepositConstants.MIN_PERIODS.value, DepositConstants.MAX_PERIODS.value
+        if any(not low <= periods <= high for periods in value):
+            raise ValueError(f"Each value should be between {low} and {high}")
+        return value
+
+    @model_validator(mode="after")
+    def check_rates(self) -> "SweepRequest":
+        """Ensure the rate range is ordered."""
+        if self.rate_from > self.rate_to:
+            raise ValueError("rate_from should be less than or equal to rate_to")
+        return self
+
+    @property
+    def rates(self) -> list[float]:
+        """The swept interest rates, from `rate_from` to `rate_to` inclusive."""
+        count = int((self.rate_to - self.rate_from) / self.rate_step + 1e-9) + 1
+        return [round(self.rate_from + i * self.rate_step, 6) for i in range(count)]
+
+
+class SweepResponse(BaseModel):
+    """Schema for scenario sweep response."""
+
+    rates: list[float] = Field(description="Swept interest rates, one per row of `values`")
+    periods: list[int] = Field(description="Swept numbers of deposit months, one per column of `values`")
+    maturity_dates: list[str] = Field(description="Last month end of each swept period count in dd.mm.yyyy format")
+    values: list[list[float]] = Field(description="Balance at maturity for each rate (row) and period count (column)")
+
+
+class SolveRequest(BaseModel):
+    """Schema for target balance solver request. Exactly one of `amount` and `periods` is given."""
+
+    date: datetime = Field(description="Date in dd.mm.yyyy format", examples=["01.01.2023"])
+    target: float = Field(gt=0, description="Balance to reach", examples=[150000])
+    rate: float = Field(
+        ge=DepositConstants.MIN_RATE.value,
+        le=DepositConstants.MAX_RATE.value,
+        description="Interest rate",
+    )
+    amount: int | None = Field(
+        default=None,
+        ge=DepositConstants.MIN_AMOUNT.value,
+        le=DepositConstants.MAX_AMOUNT.value,
+        description="Deposit amount; omit to solve for the minimal amount",
+    )
+    periods: int | None = Field(
+        default=None,
+        ge=DepositConstants.MIN_PERIODS.value,
+        le=DepositConstants.MAX_PERIODS.value,
+        description="Number of deposit months; omit to solve for the minimal number of months",
+    )
+
+    @field_validator("date", mode="before")
+    def parse_date(cls, value: str) -> datetime:  # noqa: N805
+        """Convert string to datetime object based on the expected format."""
+        return DepositRequest.parse_date(value)
+
+    @model_validator(mode="after")
+    def check_unknown(self) -> "SolveRequest":
+        """Ensure exactly one of `amount` and `periods` is left to solve for."""
+        if (self.amount is None) == (self.periods is None):
+            raise ValueError("Exactly one of amount and periods should be given")
+        return self
+
+
+class SolveResponse(BaseModel):
+    """Schema for target balance solver response."""
+
+    amount: int = Field(description="Deposit amount")
+    periods: int = Field(description="Number of deposit months")
+    balance: float = Field(description="Balance at maturity, as returned by calculate-deposit")
+    maturity_date: str = Field(description="Date of the balance in dd.mm.yyyy format", examples=["31.12.2023"])
+
+
+class ExportRequest(BaseModel):
+    """Schema for deposits export request."""
+
+    format: Literal["csv", "ndjson"] = Field(default="ndjson", description="Output format")
+    flatten: bool = Field(
+        default=False,
+        description="Write one row per deposit month instead of one row per deposit with the whole result",
+    )
+    date_from: datetime | None = Field(
+        default=None, description="Earliest deposit date in dd.mm.yyyy format", examples=["01.01.2023"]
+    )
+    date_to: datetime | None = Field(
+        default=None, description="Latest deposit date in dd.mm.yyyy format", examples=["31.12.2023"]
+    )
+
+    @field_validator("date_from", "date_to", mode="before")
+    def parse_date(cls, value: str | None) -> datetime | None:  # noqa: N805
+        """Convert string to datetime object based on the expected format."""
+        return None if value is None else DepositRequest.parse_date(value)
+
+    @model_validator(mode="after")
+    def check_range(self) -> "ExportRequest":
+        """Ensure the date range is not empty."""
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from should not be after date_to")
+        return self
@@ -1,34 +1,105 @@
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import TYPE_CHECKING, AsyncIterator, Callable
 
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+
+from src.constants.deposit import DepositConstants, ExportConstants
 from src.models.deposits import Deposit
+from src.schemas.deposits import DepositRequest
+from src.utils.storage import ResultStorage
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class DepositService:
-    """Service for interacting with the deposits table."""
+    """
+    Service for interacting with the deposits table.
 
-    def __init__(self, session: AsyncSession) -> None:
-        self.session = session
+    Every operation opens its own session and closes it as soon as its last statement completes,
+    so a database connection is only taken from the pool while a query actually runs. Results are
+    stored and read in the format chosen by `storage`.
+    """
 
-    async def get(self, payload: Deposit) -> Deposit | None:
+    def __init__(self, session_factory: Callable[[], "AsyncSession"], storage: ResultStorage | None = None) -> None:
+        self.session_factory = session_factory
+        self.storage = storage or ResultStorage()
+
+    def result(self, deposit: Deposit) -> dict[str, float] | None:
         """
-        Retrieve a deposit record by its parameters.
+        Get the calculation result of a deposit record.
+
+        Args:
+            deposit (Deposit): The deposit record.
+
+        Returns:
+            dict[str, float] | None: The deposit values keyed by month-end date, or None if the record
+                has no result in a readable format.
+        """
+        return self.storage.result(deposit)
+
+    def is_stale(self, deposit: Deposit) -> bool:
+        """
+        Check whether a deposit record holds a result of an older version of the calculation formulas.
+
+        Args:
+            deposit (Deposit): The deposit record.
+
+        Returns:
+            bool: True if the result was produced by an older version.
+        """
+        return self.storage.is_stale(deposit)
+
+    async def get_longest(self, payload: DepositRequest) -> Deposit | None:
+        """
+        Retrieve the deposit record with the most periods for the date, amount and rate of a request.
+
+        The results of deposits differing only in their periods are prefixes of each other, so the
+        longest stored one serves every shorter request and is the starting point of longer ones.
 
         Args:
             payload (DepositRequest): The request object containing deposit details.
 
         Returns:
-            Deposit | None: The matching deposit record or None if not found.
-        """
-        result = await self.session.execute(
-            select(Deposit).where(
-                Deposit.date == payload.date,
-                Deposit.periods == payload.periods,
-                Deposit.amount == payload.amount,
-                Deposit.rate == payload.rate,
+            Deposit | None: The matching deposit record with the most periods or None if not found.
+        """
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Deposit)
+                .where(
+                    Deposit.date == payload.date,
+                    Deposit.amount == payload.amount,
+                    Deposit.rate == payload.rate,
+                )
+                .order_by(Deposit.periods.desc())
+                .limit(1)
             )
-        )
-        return result.scalar_one_or_none()
+            return result.scalar_one_or_none()
+
+    async def get_many(self, payloads: list[DepositRequest]) -> dict[tuple, Deposit]:
+        """
+        Retrieve deposit records for a batch of parameters in a single query.
+
+        Args:
+            payloads (list[DepositRequest]): The request objects containing deposit details.
+
+        Returns:
+            dict[tuple, Deposit]: The matching records keyed by (date, periods, amount, rate).
+        """
+        keys = {(payload.date, payload.periods, payload.amount, payload.rate) for payload in payloads}
+        if not keys:
+            return {}
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Deposit).where(
+                    tuple_(Deposit.date, Deposit.periods, Deposit.amount, Deposit.rate).in_(list(keys))
+                )
+            )
+            return {
+                (deposit.date, deposit.periods, deposit.amount, deposit.rate): deposit for deposit in result.scalars()
+            }
 
     async def create(self, payload: Deposit, calculation_result: dict) -> None:
         """
@@ -43,7 +114,113 @@ class DepositService:
             periods=payload.periods,
             amount=payload.amount,
             rate=payload.rate,
-            calculation_result=calculation_result,
+            **self.storage.columns(calculation_result),
         )
-        self.session.add(deposit)
-        await self.session.commit()
+        async with self.session_factory() as session:
+            session.add(deposit)
+            await session.commit()
+
+    async def upgrade(self, deposit: Deposit, calculation_result: dict) -> bool:
+        """
+        Replace the calculation result of a stored deposit record in place.
+
+        Used to extend a record to more periods and to bring a stale one to the current calculation
+        version. The update only applies if the record still has the periods it was read with, and is
+        skipped if a record with the new periods was inserted concurrently.
+
+        Args:
+            deposit (Deposit): The stored deposit record.
+            calculation_result (dict): The new calculation result, with at least the periods of the record.
+
+        Returns:
+            bool: True if the record was upgraded.
+        """
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    update(Deposit)
+                    .where(Deposit.pk == deposit.pk, Deposit.periods == deposit.periods)
+                    .values(periods=len(calculation_result), **self.storage.columns(calculation_result))
+                )
+                await session.commit()
+        except IntegrityError:
+            return False
+        return bool(result.rowcount)
+
+    async def create_many(self, payloads: list[DepositRequest], calculation_results: list[dict]) -> None:
+        """
+        Create deposit records for a batch in a single statement.
+
+        Rows that already exist, e.g. inserted concurrently by another request, are skipped.
+
+        Args:
+            payloads (list[DepositRequest]): The request objects containing deposit details.
+            calculation_results (list[dict]): The calculation results, in the order of `payloads`.
+        """
+        if not payloads:
+            return
+        async with self.session_factory() as session:
+            await session.execute(
+                insert(Deposit).on_conflict_do_nothing(constraint="uq_deposit_params"),
+                [
+                    {
+                        "date": payload.date,
+                        "periods": payload.periods,
+                        "amount": payload.amount,
+                        "rate": payload.rate,
+                        **self.storage.columns(calculation_result),
+                    }
+                    for payload, calculation_result in zip(payloads, calculation_results, strict=True)
+                ],
+            )
+            await session.commit()
+
+    async def stream(
+        self,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        batch_size: int = ExportConstants.BATCH_SIZE.value,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Stream deposit records in batches through a server-side cursor.
+
+        Rows are fetched `batch_size` at a time, so the table is never loaded as a whole, and in no
+        particular order, so the database does not have to sort it. The session stays open until the
+        stream is exhausted or closed.
+
+        Args:
+            date_from (datetime | None): The earliest deposit date to include.
+            date_to (datetime | None): The latest deposit date to include.
+            batch_size (int): The number of rows per batch.
+
+        Yields:
+            list[dict]: Deposit parameters, with the date as a dd.mm.yyyy string, and their calculation result.
+        """
+        query = select(
+            Deposit.date,
+            Deposit.periods,
+            Deposit.amount,
+            Deposit.rate,
+            Deposit.calculation_values,
+            Deposit.calculation_result,
+            Deposit.calculation_version,
+            Deposit.calculation_engine,
+            Deposit.calculation_rounding,
+        ).execution_options(yield_per=batch_size)
+        if date_from is not None:
+            query = query.where(Deposit.date >= date_from)
+        if date_to is not None:
+            query = query.where(Deposit.date <= date_to)
+        async with self.session_factory() as session:
+            result = await session.stream(query)
+            async for partition in result.partitions():
+                yield [
+                    {
+                        "date": row.date.strftime(DepositConstants.DATE_FORMAT.value),
+                        "periods": row.periods,
+                        "amount": row.amount,
+                        "rate": row.rate,
+                        "calculation_result": self.storage.result(row),
+                    }
+                    for row in partition
+                ]
@@ -0,0 +1,173 @@
+"""
+Background recompute of stale calculation results.
+
+Brings every row whose result was produced by an older version of the calculation formulas, or by
+another engine or rounding mode than the configured one, to the current version and engine, without
+truncating the table and losing its cached results. Rows are read in chunks by keyset pagination on
+the primary key, each chunk is computed in parallel in a process pool and written back with one
+batched update, and the job pauses between chunks so that live traffic keeps most of the database
+and CPU time.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, AsyncIterator, Callable
+
+from sqlalchemy import Row, bindparam, or_, select, update
+
+from settings import AppSettings, get_settings
+from src.models.deposits import Deposit
+from src.schemas.deposits import DepositRequest
+from src.utils.calculator import DepositCalculator
+from src.utils.storage import ResultStorage
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(get_settings(AppSettings).TITLE)
+
+
+class RecomputeJob:
+    """
+    Recomputes stale calculation results chunk by chunk.
+
+    A chunk is split into `workers` parts computed at the same time in `executor`. The update of a row
+    only applies if its periods and version are still the ones it was read with, so results written
+    concurrently by the application are never overwritten.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], "AsyncSession"],
+        calculator: DepositCalculator,
+        storage: ResultStorage,
+        executor: Executor,
+        chunk_size: int = 500,
+        workers: int = 2,
+        pause: float = 0.5,
+    ) -> None:
+        self.session_factory = session_factory
+        self.calculator = calculator
+        self.storage = storage
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.pause = pause
+
+    async def stale_chunks(self) -> AsyncIterator[list[Row]]:
+        """
+        Read the stale rows, and the rows computed by another engine, in chunks ordered by primary key.
+
+        Each chunk starts after the last key of the previous one, so every query is an index range scan
+        however far the job has progressed, and no transaction is held open between chunks.
+
+        Yields:
+            list[Row]: Up to `chunk_size` rows with the key, parameters and version of stale deposits.
+        """
+        last_pk = None
+        while True:
+            query = (
+                select(
+                    Deposit.pk, Deposit.date, Deposit.periods, Deposit.amount, Deposit.rate, Deposit.calculation_version
+                )
+                .where(
+                    or_(
+                        Deposit.calculation_version < self.storage.version,
+                        Deposit.calculation_engine != self.storage.engine,
+                        Deposit.calculation_rounding.is_distinct_from(self.storage.rounding),
+                    )
+                )
+                .order_by(Deposit.pk)
+                .limit(self.chunk_size)
+            )
+            if last_pk is not None:
+                query = query.where(Deposit.pk > last_pk)
+            async with self.session_factory() as session:
+                rows = (await session.execute(query)).all()
+            if not rows:
+                return
+            last_pk = rows[-1].pk
+            yield rows
+
+    async def compute(self, rows: list[Row]) -> list[dict[str, float]]:
+        """
+        Compute the current results of a chunk in parallel.
+
+        Args:
+            rows (list[Row]): The stale rows.
+
+        Returns:
+            list[dict[str, float]]: The calculation results, in the order of `rows`.
+        """
+        payloads = [
+            DepositRequest.model_construct(date=row.date, periods=row.periods, amount=row.amount, rate=row.rate)
+            for row in rows
+        ]
+        size = -(-len(payloads) // self.workers)
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, self.calculator.compute_many, payloads[start : start + size])
+                for start in range(0, len(payloads), size)
+            )
+        )
+        return [result for part in parts for result in part]
+
+    async def store(self, rows: list[Row], calculation_results: list[dict[str, float]]) -> None:
+        """
+        Write the results of a chunk with a single batched update.
+
+        Args:
+            rows (list[Row]): The stale rows.
+            calculation_results (list[dict[str, float]]): Their new results, in the order of `rows`.
+        """
+        table = Deposit.__table__
+        statement = (
+            update(table)
+            .where(
+                table.c.pk == bindparam("row_pk"),
+                table.c.periods == bindparam("row_periods"),
+                table.c.calculation_version == bindparam("row_version"),
+            )
+            .values(
+                calculation_values=bindparam("new_values"),
+                calculation_result=bindparam("new_result"),
+                calculation_version=bindparam("new_version"),
+                calculation_engine=bindparam("new_engine"),
+                calculation_rounding=bindparam("new_rounding"),
+            )
+        )
+        parameters = []
+        for row, calculation_result in zip(rows, calculation_results, strict=True):
+            columns = self.storage.columns(calculation_result)
+            parameters.append(
+                {
+                    "row_pk": row.pk,
+                    "row_periods": row.periods,
+                    "row_version": row.calculation_version,
+                    "new_values": columns["calculation_values"],
+                    "new_result": columns["calculation_result"],
+                    "new_version": columns["calculation_version"],
+                    "new_engine": columns["calculation_engine"],
+                    "new_rounding": columns["calculation_rounding"],
+                }
+            )
+        async with self.session_factory() as session:
+            await session.execute(statement, parameters)
+            await session.commit()
+
+    async def run(self) -> int:
+        """
+        Recompute every stale row.
+
+        Returns:
+            int: The number of rows recomputed.
+        """
+        total = 0
+        async for rows in self.stale_chunks():
+            await self.store(rows, await self.compute(rows))
+            total += len(rows)
+            logger.info("Recomputed stale results", extra={"rows": total, "version": self.storage.version})
+            await asyncio.sleep(self.pause)
+        return total
@@ -0,0 +1,243 @@
+"""
+Utility functions for bulk deposit scenario import.
+
+Provides incremental parsing of NDJSON and CSV request bodies into validated
+`DepositRequest` rows, grouped into fixed-size chunks so that arbitrarily large
+uploads are processed with bounded memory.
+"""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Iterator
+
+from pydantic import ValidationError
+
+from src.constants.deposit import BulkConstants
+from src.schemas.deposits import DepositRequest
+from src.utils.validation import format_validation_errors
+
+CSV_FIELDS = ("date", "periods", "amount", "rate")
+
+
+async def iter_lines(
+    stream: AsyncIterator[bytes], max_length: int = BulkConstants.MAX_LINE_LENGTH.value
+) -> AsyncIterator[tuple[int, str | ValueError]]:
+    """
+    Split a byte stream into text lines without buffering the whole body.
+
+    Invalid UTF-8 sequences are replaced with U+FFFD, so they fail validation of their row
+    instead of the whole upload. A line longer than `max_length` characters is dropped up to
+    the next line break as soon as it exceeds the limit and reported as an error in its place.
+
+    Args:
+        stream (AsyncIterator[bytes]): The raw request body chunks.
+        max_length (int): The longest accepted line in characters. Defaults to `BulkConstants.MAX_LINE_LENGTH`.
+
+    Yields:
+        tuple[int, str | ValueError]: The 1-based physical line number and the line without the trailing
+            line break, or the error for a line that is too long. Blank lines are skipped but still counted.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    too_long = ValueError(f"body: Line longer than {max_length} characters")
+    tail = ""
+    skipping = False
+    number = 0
+    async for chunk in stream:
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for line in lines:
+            number += 1
+            if skipping or len(line) > max_length:
+                skipping = False
+                yield number, too_long
+            elif line.strip():
+                yield number, line.rstrip("\r")
+        if len(tail) > max_length:
+            skipping, tail = True, ""
+    tail += decoder.decode(b"", final=True)
+    if skipping or len(tail) > max_length:
+        yield number + 1, too_long
+    elif tail.strip():
+        yield number + 1, tail.rstrip("\r")
+
+
+async def prepend(
+    item: tuple[int, str | ValueError], lines: AsyncIterator[tuple[int, str | ValueError]]
+) -> AsyncIterator[tuple[int, str | ValueError]]:
+    """
+    Put an already consumed line back in front of the remaining lines.
+
+    Args:
+        item (tuple[int, str | ValueError]): The consumed line.
+        lines (AsyncIterator[tuple[int, str | ValueError]]): The remaining lines.
+
+    Yields:
+        tuple[int, str | ValueError]: `item` followed by every item of `lines`.
+    """
+    yield item
+    async for line in lines:
+        yield line
+
+
+def parse_csv_header(line: str) -> list[str] | None:
+    """
+    Parse the first line of a CSV upload as a header, if it is one.
+
+    Column names are matched case-insensitively and surrounding whitespace is ignored.
+    Extra columns are allowed and ignored during validation.
+
+    Args:
+        line (str): The first non-blank line of the upload.
+
+    Returns:
+        list[str] | None: The normalized column names, or None if the line names none of
+            the expected columns and should be treated as data.
+
+    Raises:
+        ValueError: If the line names some of the expected columns but not all of them.
+    """
+    header = [column.strip().lower() for column in next(csv.reader([line]))]
+    missing = [field for field in CSV_FIELDS if field not in header]
+    if not missing:
+        return header
+    if len(missing) == len(CSV_FIELDS):
+        return None
+    raise ValueError(f"header: Missing columns: {', '.join(missing)}")
+
+
+def parse_ndjson_line(line: str) -> dict:
+    """
+    Parse one NDJSON record.
+
+    Args:
+        line (str): A single JSON object.
+
+    Returns:
+        dict: The decoded record.
+
+    Raises:
+        ValueError: If the line is not a JSON object.
+    """
+    try:
+        row = json.loads(line)
+    except json.JSONDecodeError:
+        raise ValueError("body: Invalid JSON") from None
+    if not isinstance(row, dict):
+        raise ValueError("body: Expected a JSON object")
+    return row
+
+
+def parse_csv_line(line: str, header: list[str]) -> dict:
+    """
+    Parse one CSV record into a dict keyed by the header columns.
+
+    Args:
+        line (str): A single CSV record.
+        header (list[str]): Column names from the first line of the upload.
+
+    Returns:
+        dict: The decoded record.
+
+    Raises:
+        ValueError: If the number of values does not match the header.
+    """
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        raise ValueError(f"body: Expected {len(header)} values, got {len(values)}")
+    return dict(zip(header, values, strict=True))
+
+
+def validate_row(row: dict) -> DepositRequest:
+    """
+    Validate a decoded record as a deposit request.
+
+    Args:
+        row (dict): The decoded record.
+
+    Returns:
+        DepositRequest: The validated request.
+
+    Raises:
+        ValueError: With the same message format as the API validation errors.
+    """
+    try:
+        return DepositRequest(**row)
+    except ValidationError as exc:
+        raise ValueError(format_validation_errors(exc.errors())) from None
+
+
+async def iter_rows(
+    lines: AsyncIterator[tuple[int, str | ValueError]], media_type: str, header: list[str] | None = None
+) -> AsyncIterator[tuple[int, DepositRequest | None, str | None]]:
+    """
+    Decode and validate uploaded records one by one.
+
+    Args:
+        lines (AsyncIterator[tuple[int, str | ValueError]]): Numbered text lines of the upload, without the
+            CSV header, as returned by `iter_lines`.
+        media_type (str): Either `BulkConstants.CSV_MEDIA_TYPE` or `BulkConstants.NDJSON_MEDIA_TYPE`.
+        header (list[str] | None): CSV column names. Defaults to "date,periods,amount,rate".
+
+    Yields:
+        tuple[int, DepositRequest | None, str | None]: The line number and either
+            the validated request or the error message.
+    """
+    is_csv = media_type == BulkConstants.CSV_MEDIA_TYPE.value
+    header = header or list(CSV_FIELDS)
+    async for number, line in lines:
+        if isinstance(line, ValueError):
+            yield number, None, str(line)
+            continue
+        try:
+            row = parse_csv_line(line, header) if is_csv else parse_ndjson_line(line)
+            yield number, validate_row(row), None
+        except ValueError as exc:
+            yield number, None, str(exc)
+
+
+async def iter_chunks(rows: AsyncIterator[tuple], size: int = BulkConstants.CHUNK_SIZE.value) -> AsyncIterator[list]:
+    """
+    Group an async stream of items into lists of at most `size` items.
+
+    Args:
+        rows (AsyncIterator[tuple]): The items to group.
+        size (int): Maximum chunk size. Defaults to `BulkConstants.CHUNK_SIZE`.
+
+    Yields:
+        list: The next chunk.
+    """
+    chunk = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def deposit_key(payload: DepositRequest) -> tuple:
+    """
+    Get the identity of a deposit request, matching the unique constraint of the deposits table.
+
+    Args:
+        payload (DepositRequest): The deposit request.
+
+    Returns:
+        tuple: The (date, periods, amount, rate) tuple.
+    """
+    return payload.date, payload.periods, payload.amount, payload.rate
+
+
+def encode_results(lines: Iterator[dict]) -> bytes:
+    """
+    Encode result records as NDJSON.
+
+    Args:
+        lines (Iterator[dict]): The result records.
+
+    Returns:
+        bytes: One JSON document per line.
+    """
+    return "".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines).encode()
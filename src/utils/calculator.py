@@ -0,0 +1,57 @@
+from functools import partial
+
+from src.schemas.deposits import DepositRequest
+from src.utils.deposit import compute_deposit, compute_deposits
+from src.utils.fixed_point import ROUNDING_MODES, compute_deposit_fixed, compute_deposits_fixed
+
+ENGINES = ("float", "fixed")
+
+
+class DepositCalculator:
+    """
+    Calculation engine selected by configuration.
+
+    The "float" engine is `compute_deposit`. The "fixed" engine computes exact balances in integer
+    minor units with the configured rounding mode; its values can differ from the float engine by
+    one minor unit where the float result lands near a rounding tie.
+    """
+
+    def __init__(self, engine: str = "float", rounding: str = "half_even") -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}. Expected one of {', '.join(ENGINES)}")
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"Unknown rounding mode: {rounding}. Expected one of {', '.join(ROUNDING_MODES)}")
+        self.engine = engine
+        self.rounding = rounding
+        if engine == "fixed":
+            self._compute = partial(compute_deposit_fixed, rounding=rounding)
+            self._compute_many = partial(compute_deposits_fixed, rounding=rounding)
+        else:
+            self._compute = compute_deposit
+            self._compute_many = compute_deposits
+
+    def compute(self, payload: DepositRequest, start: int = 0) -> dict[str, float]:
+        """
+        Calculate the compound growth of a deposit over time.
+
+        Args:
+            payload (DepositRequest): The deposit details.
+            start (int): The number of leading months to skip, e.g. the length of a stored result being
+                extended. Defaults to 0.
+
+        Returns:
+            dict[str, float]: The deposit values keyed by month-end date.
+        """
+        return self._compute(payload, start=start)
+
+    def compute_many(self, payloads: list[DepositRequest]) -> list[dict[str, float]]:
+        """
+        Calculate the compound growth for a batch of deposits.
+
+        Args:
+            payloads (list[DepositRequest]): The deposit details.
+
+        Returns:
+            list[dict[str, float]]: The calculation results, in the order of `payloads`.
+        """
+        return self._compute_many(payloads)
@@ -0,0 +1,36 @@
+"""
+Utility functions for parsing request dates.
+
+`datetime.strptime` is by far the most expensive part of validating a `DepositRequest`.
+Dates in the canonical dd.mm.yyyy form are parsed by slicing instead, and recently seen
+date strings are memoized, as the same start dates recur across requests.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+from src.constants.deposit import DepositConstants
+
+
+@lru_cache(maxsize=DepositConstants.DATE_CACHE_SIZE.value)
+def parse_date_string(value: str) -> datetime:
+    """
+    Parse a date string in the `DATE_FORMAT` format.
+
+    Accepts exactly what `datetime.strptime(value, DATE_FORMAT)` accepts: strings other than
+    the zero-padded dd.mm.yyyy form, e.g. "1.1.2023", fall back to `strptime`.
+
+    Args:
+        value (str): The date string.
+
+    Returns:
+        datetime: The parsed date.
+
+    Raises:
+        ValueError: If the string is not a valid date in the expected format.
+    """
+    if len(value) == 10 and value[2] == "." and value[5] == "." and value.isascii():
+        day, month, year = value[:2], value[3:5], value[6:]
+        if day.isdigit() and month.isdigit() and year.isdigit():
+            return datetime(int(year), int(month), int(day))
+    return datetime.strptime(value, DepositConstants.DATE_FORMAT.value)
@@ -0,0 +1,120 @@
+"""
+Per-request deadlines.
+
+The admission control middleware sets a deadline for every request it admits. Work done on behalf
+of the request reads the remaining time from a context variable: database transactions get a
+matching Postgres `statement_timeout`, and waits for the compute pools are cancelled once it passes.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import Connection
+from sqlalchemy.orm import Session, SessionTransaction
+
+request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+request_timeout: ContextVar[float | None] = ContextVar("request_timeout", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """Raised when the work for a request does not finish before its deadline."""
+
+
+@contextmanager
+def deadline_scope(timeout: float) -> Iterator[None]:
+    """
+    Set the deadline of the current request to `timeout` seconds from now for the duration of the block.
+
+    Args:
+        timeout (float): The time budget in seconds.
+
+    Yields:
+        None: While the deadline is in effect.
+    """
+    timeout_token = request_timeout.set(timeout)
+    deadline_token = request_deadline.set(time.monotonic() + timeout)
+    try:
+        yield
+    finally:
+        request_deadline.reset(deadline_token)
+        request_timeout.reset(timeout_token)
+
+
+def renew_deadline() -> None:
+    """
+    Restart the time budget of the current request.
+
+    Used by long-running streaming requests that give each unit of work, e.g. each chunk of an
+    upload, the full budget. Does nothing outside of a request with a deadline.
+    """
+    timeout = request_timeout.get()
+    if timeout is not None:
+        request_deadline.set(time.monotonic() + timeout)
+
+
+def remaining() -> float | None:
+    """
+    Get the time left until the deadline of the current request.
+
+    Returns:
+        float | None: The remaining seconds, negative once the deadline has passed, or None without a deadline.
+    """
+    deadline = request_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    """
+    Fail fast if the deadline of the current request has passed.
+
+    Raises:
+        DeadlineExceededError: If no time is left.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError
+
+
+class DeadlineSession(Session):
+    """Session whose transactions are limited to the remaining time of the current request."""
+
+
+def set_statement_timeout(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    """
+    Apply the remaining request time as the Postgres `statement_timeout` of a new transaction.
+
+    Registered as the "after_begin" event of `DeadlineSession`. `SET LOCAL` only lasts until the end of
+    the transaction, so pooled connections do not keep the timeout.
+
+    Args:
+        session (Session): The session beginning the transaction.
+        transaction (SessionTransaction): The new transaction.
+        connection (Connection): The connection the transaction runs on.
+
+    Raises:
+        DeadlineExceededError: If the deadline has already passed.
+    """
+    left = remaining()
+    if left is None:
+        return
+    if left <= 0:
+        raise DeadlineExceededError
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}")
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    """
+    Check whether a database error is a statement cancelled by `statement_timeout`.
+
+    Args:
+        exc (BaseException): The error raised by the driver, possibly wrapped by SQLAlchemy.
+
+    Returns:
+        bool: True for the Postgres "query_canceled" error.
+    """
+    for error in (exc, getattr(exc, "orig", None), getattr(getattr(exc, "orig", None), "__cause__", None)):
+        if getattr(error, "sqlstate", None) == "57014":
+            return True
+    return False
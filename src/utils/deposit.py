@@ -2,13 +2,13 @@
 Utility functions for deposit calculation.
 
 Provides helper functions for calculating the last day of a month, advancing to the next month,
-and computing the growth of a deposit over a specified period.
+computing the growth of a deposit over a specified period, aggregating a portfolio of deposits
+over a shared month-end timeline and sweeping a grid of rates and periods.
 """
 
-from calendar import monthrange
+from calendar import isleap, mdays, monthrange
 from datetime import datetime
 
-from src.constants.deposit import DepositConstants
 from src.schemas.deposits import DepositRequest
 
 
@@ -41,21 +41,192 @@ def next_month(date: datetime) -> datetime:
     return datetime(next_year, next_month, 1)
 
 
-def compute_deposit(payload: DepositRequest) -> dict[str, float]:
+def month_end_keys(date: datetime, periods: int, start: int = 0) -> list[str]:
+    """
+    Get the result keys of a deposit: its consecutive month ends formatted as strings.
+
+    Formats the day, month and year directly instead of building and formatting a `datetime`
+    per month, which otherwise dominates the cost of a calculation.
+
+    Args:
+        date (datetime): The start date of the deposit.
+        periods (int): The number of months.
+        start (int): The number of leading months to skip. Defaults to 0.
+
+    Returns:
+        list[str]: The month ends of months `start + 1` to `periods`, counting the month of `date` as
+            the first, in the `DATE_FORMAT` ("%d.%m.%Y") format.
+    """
+    keys = []
+    first = month_index(date)
+    for index in range(first + start, first + periods):
+        year, month = divmod(index, 12)
+        day = mdays[month + 1] + (month == 1 and isleap(year))
+        keys.append(f"{day:02d}.{month + 1:02d}.{year:04d}")
+    return keys
+
+
+def compute_deposit(payload: DepositRequest, start: int = 0) -> dict[str, float]:
     """
     Calculate the compound growth of a deposit over time.
 
+    Every month is computed from the amount on its own, so a result can be extended with the months
+    after a stored one by passing its length as `start`.
+
     Args:
         payload (DepositRequest): The deposit details, including the start date, periods, amount, and rate.
+        start (int): The number of leading months to skip. Defaults to 0.
 
     Returns:
         dict[str, float]:
             A dictionary where keys are dates (as strings) and values are the deposit values on those dates.
     """
-    results = {}
-    date = last_day_of_month(payload.date)
-    for i in range(1, payload.periods + 1):
-        future_value = payload.amount * (1 + payload.rate / 100 / 12) ** i
-        results[date.strftime(DepositConstants.DATE_FORMAT.value)] = round(future_value, 2)
-        date = last_day_of_month(next_month(date))
-    return results
+    growth = 1 + payload.rate / 100 / 12
+    keys = month_end_keys(payload.date, payload.periods, start)
+    return {key: round(payload.amount * growth**i, 2) for i, key in enumerate(keys, start + 1)}
+
+
+def compute_deposits(payloads: list[DepositRequest]) -> list[dict[str, float]]:
+    """
+    Calculate the compound growth for a batch of deposits.
+
+    Running a whole batch in one call lets callers hand it to an executor in a single hop.
+
+    Args:
+        payloads (list[DepositRequest]): The deposit details.
+
+    Returns:
+        list[dict[str, float]]: The calculation results, in the order of `payloads`.
+    """
+    return [compute_deposit(payload) for payload in payloads]
+
+
+def month_index(date: datetime) -> int:
+    """
+    Get the number of months since the start of year 0 for a given date.
+
+    Args:
+        date (datetime): The date to convert.
+
+    Returns:
+        int: The month index, so that consecutive months have consecutive indices.
+    """
+    return date.year * 12 + date.month - 1
+
+
+def take_months(result: dict[str, float], date: datetime, periods: int) -> dict[str, float]:
+    """
+    Get the first months of a calculation result, in date order.
+
+    Args:
+        result (dict[str, float]): A calculation result with at least `periods` months, in any key order.
+        date (datetime): The start date of the deposit.
+        periods (int): The number of months to take.
+
+    Returns:
+        dict[str, float]: The result for a deposit of `periods` months.
+    """
+    return {key: result[key] for key in month_end_keys(date, periods)}
+
+
+def month_end_from_index(index: int) -> datetime:
+    """
+    Get the last day of the month with the given month index.
+
+    Args:
+        index (int): The month index as returned by `month_index`.
+
+    Returns:
+        datetime: A datetime object representing the last day of that month.
+    """
+    year, month = divmod(index, 12)
+    return datetime(year, month + 1, monthrange(year, month + 1)[1])
+
+
+def growth_series(amount: int, rate: float, periods: int) -> list[float]:
+    """
+    Calculate the rounded deposit values for consecutive months.
+
+    Uses the same formula and rounding as `compute_deposit`, so the values match its results.
+
+    Args:
+        amount (int): The deposit amount.
+        rate (float): The annual interest rate in percent.
+        periods (int): The number of months.
+
+    Returns:
+        list[float]: The deposit values at the end of months 1 to `periods`.
+    """
+    growth = 1 + rate / 100 / 12
+    return [round(amount * growth**i, 2) for i in range(1, periods + 1)]
+
+
+def aggregate_portfolio(payloads: list[DepositRequest]) -> tuple[datetime, list[float]]:
+    """
+    Calculate the total balance of a portfolio of deposits for every month end.
+
+    All deposits are aligned on one contiguous month-end timeline, from the first month of the
+    earliest deposit to the last month of the latest one. Each deposit's series is added into its
+    slice of the timeline in one pass, and series are shared between deposits with equal amount
+    and rate. A month end is summed exactly like the client-side merge of `compute_deposit` results
+    by date; months not covered by any deposit have a balance of 0.0.
+
+    Args:
+        payloads (list[DepositRequest]): The deposits of the portfolio.
+
+    Returns:
+        tuple[datetime, list[float]]: The first month end of the timeline and the balances for
+            consecutive month ends starting there.
+    """
+    starts = [month_index(payload.date) for payload in payloads]
+    first = min(starts)
+    last = max(start + payload.periods for start, payload in zip(starts, payloads, strict=True))
+    totals = [0.0] * (last - first)
+
+    series_cache: dict[tuple[int, float], list[float]] = {}
+    for start, payload in zip(starts, payloads, strict=True):
+        series = series_cache.get((payload.amount, payload.rate))
+        if series is None or len(series) < payload.periods:
+            series = growth_series(payload.amount, payload.rate, payload.periods)
+            series_cache[(payload.amount, payload.rate)] = series
+        offset = start - first
+        window = slice(offset, offset + payload.periods)
+        totals[window] = map(float.__add__, totals[window], series)
+
+    return month_end_from_index(first), [round(total, 2) for total in totals]
+
+
+def maturity_date(date: datetime, periods: int) -> datetime:
+    """
+    Get the last month end of a deposit, i.e. the date of its last calculated value.
+
+    Args:
+        date (datetime): The start date of the deposit.
+        periods (int): The number of months.
+
+    Returns:
+        datetime: The month end `periods - 1` months after the month of `date`.
+    """
+    return month_end_from_index(month_index(date) + periods - 1)
+
+
+def sweep_deposit(amount: int, rates: list[float], periods: list[int]) -> list[list[float]]:
+    """
+    Calculate the balance at maturity for every combination of interest rate and number of periods.
+
+    The monthly growth factor is computed once per rate and shared by all period counts of that rate.
+    Each cell equals the last value of `compute_deposit` for the same parameters.
+
+    Args:
+        amount (int): The deposit amount.
+        rates (list[float]): The annual interest rates in percent, one per row.
+        periods (list[int]): The numbers of months, one per column.
+
+    Returns:
+        list[list[float]]: The balances at maturity, indexed by rate and then by number of periods.
+    """
+    rows = []
+    for rate in rates:
+        growth = 1 + rate / 100 / 12
+        rows.append([round(amount * growth**count, 2) for count in periods])
+    return rows
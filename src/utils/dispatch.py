@@ -0,0 +1,157 @@
+"""
+Adaptive dispatch of blocking computations.
+
+A job is run inline on the event loop, in a bounded thread pool or in a process pool depending on
+its size, measured in work units (deposit months to compute). Handing a 12-month deposit to a thread
+costs more than computing it, while large batches only run in parallel in separate processes because
+of the GIL. Timings are recorded per mode, and waits respect the deadline of the current request.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+from src.utils.deadlines import DeadlineExceededError, check_deadline, remaining
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+ResultT = TypeVar("ResultT")
+
+MODES = ("inline", "thread", "process")
+
+
+class DispatchMetrics:
+    """Counts and timings of dispatched jobs per mode."""
+
+    def __init__(self) -> None:
+        self.counts = dict.fromkeys(MODES, 0)
+        self.totals = dict.fromkeys(MODES, 0.0)
+        self.maxima = dict.fromkeys(MODES, 0.0)
+
+    def record(self, mode: str, elapsed: float) -> None:
+        """
+        Record a finished job.
+
+        Args:
+            mode (str): The mode the job ran in.
+            elapsed (float): The wall time of the job in seconds, including the pool handoff.
+        """
+        self.counts[mode] += 1
+        self.totals[mode] += elapsed
+        self.maxima[mode] = max(self.maxima[mode], elapsed)
+
+    def snapshot(self) -> dict[str, dict[str, float | int]]:
+        """
+        Get the current metrics.
+
+        Returns:
+            dict[str, dict[str, float | int]]: Job count and total, mean and maximal time in milliseconds per mode.
+        """
+        return {
+            mode: {
+                "count": self.counts[mode],
+                "total_ms": round(self.totals[mode] * 1e3, 3),
+                "mean_ms": round(self.totals[mode] * 1e3 / self.counts[mode], 3) if self.counts[mode] else 0.0,
+                "max_ms": round(self.maxima[mode] * 1e3, 3),
+            }
+            for mode in MODES
+        }
+
+
+class ComputeDispatcher:
+    """
+    Runs blocking computations inline, in a thread pool or in a process pool by work size.
+
+    Jobs of at most `inline_max_work` units run inline, jobs of at least `process_min_work` units in the
+    process pool and everything in between in the thread pool. The process pool is only started by the
+    first job that needs it.
+    """
+
+    def __init__(
+        self,
+        inline_max_work: int = 24,
+        process_min_work: int = 30_000,
+        thread_workers: int = 4,
+        process_workers: int | None = None,
+    ) -> None:
+        self.inline_max_work = inline_max_work
+        self.process_min_work = process_min_work
+        self.process_workers = process_workers
+        self.thread_pool = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="compute")
+        self.process_pool: "ProcessPoolExecutor | None" = None
+        self.metrics = DispatchMetrics()
+
+    def mode(self, work: int) -> str:
+        """
+        Choose the mode for a job.
+
+        Args:
+            work (int): The size of the job in work units.
+
+        Returns:
+            str: "inline", "thread" or "process".
+        """
+        if work <= self.inline_max_work:
+            return "inline"
+        if work >= self.process_min_work:
+            return "process"
+        return "thread"
+
+    def pool(self, mode: str) -> Executor:
+        """
+        Get the executor of a pooled mode, starting the process pool if needed.
+
+        Args:
+            mode (str): "thread" or "process".
+
+        Returns:
+            Executor: The executor.
+        """
+        if mode == "thread":
+            return self.thread_pool
+        if self.process_pool is None:
+            # Loads multiprocessing, which most processes never need, only with the first process job.
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import get_context
+
+            self.process_pool = ProcessPoolExecutor(max_workers=self.process_workers, mp_context=get_context("spawn"))
+        return self.process_pool
+
+    async def run(self, work: int, func: Callable[..., ResultT], *args: object) -> ResultT:
+        """
+        Run a blocking function in the mode chosen for its work size.
+
+        Functions and arguments of process pool jobs must be picklable. Waiting for a pool is limited to
+        the remaining time of the current request, if it has a deadline; the job itself is not interrupted.
+
+        Args:
+            work (int): The size of the job in work units.
+            func (Callable[..., ResultT]): The function to run.
+            *args (object): Positional arguments of `func`.
+
+        Returns:
+            ResultT: The result of `func`.
+
+        Raises:
+            DeadlineExceededError: If the deadline of the current request passes before the job is done.
+        """
+        check_deadline()
+        mode = self.mode(work)
+        start = time.perf_counter()
+        try:
+            if mode == "inline":
+                return func(*args)
+            async with asyncio.timeout(remaining()):
+                return await asyncio.get_running_loop().run_in_executor(self.pool(mode), func, *args)
+        except TimeoutError:
+            raise DeadlineExceededError from None
+        finally:
+            self.metrics.record(mode, time.perf_counter() - start)
+
+    def shutdown(self) -> None:
+        """Shut down the pools, waiting for running jobs."""
+        self.thread_pool.shutdown(wait=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True)
@@ -0,0 +1,86 @@
+"""
+Utility functions for the deposits export.
+
+Encodes batches of exported deposit records as CSV or NDJSON. Every batch is encoded on its own,
+so an export is written with memory bounded by the batch size, however large the table is.
+"""
+
+import csv
+import io
+import json
+from typing import Iterable
+
+from src.constants.deposit import ExportConstants
+
+
+def flatten_records(records: Iterable[dict]) -> Iterable[dict]:
+    """
+    Split deposit records into one record per deposit month.
+
+    Args:
+        records (Iterable[dict]): Deposit records with their calculation result.
+
+    Yields:
+        dict: The deposit parameters with one month end and its value. Records without a result yield nothing.
+    """
+    for record in records:
+        params = {field: record[field] for field in ExportConstants.FLAT_CSV_FIELDS.value[:4]}
+        for month_end, value in (record["calculation_result"] or {}).items():
+            yield {**params, "month_end": month_end, "value": value}
+
+
+def csv_header(flatten: bool = False) -> bytes:
+    """
+    Get the header line of a CSV export.
+
+    Args:
+        flatten (bool): Whether the export has one row per deposit month. Defaults to False.
+
+    Returns:
+        bytes: The header line.
+    """
+    fields = ExportConstants.FLAT_CSV_FIELDS.value if flatten else ExportConstants.CSV_FIELDS.value
+    return (",".join(fields) + "\r\n").encode()
+
+
+def encode_csv(records: Iterable[dict], flatten: bool = False) -> bytes:
+    """
+    Encode a batch of deposit records as CSV lines, without a header.
+
+    Args:
+        records (Iterable[dict]): Deposit records with their calculation result.
+        flatten (bool): Whether to write one row per deposit month. Defaults to False.
+
+    Returns:
+        bytes: One CSV line per record, or per deposit month if flattened.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if flatten:
+        writer.writerows(
+            [record[field] for field in ExportConstants.FLAT_CSV_FIELDS.value] for record in flatten_records(records)
+        )
+    else:
+        writer.writerows(
+            [
+                *(record[field] for field in ExportConstants.CSV_FIELDS.value[:4]),
+                json.dumps(record["calculation_result"], separators=(",", ":")),
+            ]
+            for record in records
+        )
+    return buffer.getvalue().encode()
+
+
+def encode_ndjson(records: Iterable[dict], flatten: bool = False) -> bytes:
+    """
+    Encode a batch of deposit records as NDJSON.
+
+    Args:
+        records (Iterable[dict]): Deposit records with their calculation result.
+        flatten (bool): Whether to write one line per deposit month. Defaults to False.
+
+    Returns:
+        bytes: One JSON document per record, or per deposit month if flattened.
+    """
+    lines = flatten_records(records) if flatten else records
+    return "".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines).encode()
@@ -0,0 +1,131 @@
+"""
+Fixed-point integer engine for deposit calculation.
+
+Represents balances as integer minor units (kopecks) and the monthly growth factor as an exact
+ratio of integers, so every value is the exactly rounded compound balance, independent of float
+rounding and platform. Unlike `Decimal`, all arithmetic stays in native Python integers.
+"""
+
+from fractions import Fraction
+
+from src.schemas.deposits import DepositRequest
+from src.utils.deposit import month_end_keys
+
+MINOR_UNITS = 100
+ROUNDING_MODES = ("half_even", "half_up")
+
+
+def growth_ratio(rate: float) -> tuple[int, int]:
+    """
+    Get the exact monthly growth factor `1 + rate / 100 / 12` as a reduced integer ratio.
+
+    The rate is taken at its shortest decimal representation, e.g. 5.1 means exactly 51/10.
+
+    Args:
+        rate (float): The annual interest rate in percent.
+
+    Returns:
+        tuple[int, int]: The numerator and denominator of the growth factor.
+    """
+    factor = 1 + Fraction(repr(rate)) / 1200
+    return factor.numerator, factor.denominator
+
+
+def divide_rounded(numerator: int, denominator: int, rounding: str = "half_even") -> int:
+    """
+    Divide two non-negative integers, rounding the quotient to the nearest integer.
+
+    Args:
+        numerator (int): The dividend.
+        denominator (int): The divisor.
+        rounding (str): Tie-breaking rule, "half_even" or "half_up". Defaults to "half_even".
+
+    Returns:
+        int: The rounded quotient.
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and (rounding == "half_up" or quotient % 2)):
+        quotient += 1
+    return quotient
+
+
+def growth_minor(amount: int, rate: float, periods: int, rounding: str = "half_even", start: int = 0) -> list[int]:
+    """
+    Calculate the deposit values in minor units for consecutive months.
+
+    Args:
+        amount (int): The deposit amount.
+        rate (float): The annual interest rate in percent.
+        periods (int): The number of months.
+        rounding (str): Tie-breaking rule, "half_even" or "half_up". Defaults to "half_even".
+        start (int): The number of leading months to skip. Defaults to 0.
+
+    Returns:
+        list[int]: The deposit values in minor units at the end of months `start + 1` to `periods`.
+
+    Raises:
+        ValueError: If the rounding mode is unknown.
+    """
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Unknown rounding mode: {rounding}. Expected one of {', '.join(ROUNDING_MODES)}")
+    numerator, denominator = growth_ratio(rate)
+    balance, scale = amount * MINOR_UNITS * numerator**start, denominator**start
+    values = []
+    for _ in range(start, periods):
+        balance *= numerator
+        scale *= denominator
+        values.append(divide_rounded(balance, scale, rounding))
+    return values
+
+
+def compute_deposit_fixed(payload: DepositRequest, rounding: str = "half_even", start: int = 0) -> dict[str, float]:
+    """
+    Calculate the compound growth of a deposit over time with exact integer arithmetic.
+
+    Returns the same structure as `compute_deposit`; values are the exactly rounded balances.
+
+    Args:
+        payload (DepositRequest): The deposit details, including the start date, periods, amount, and rate.
+        rounding (str): Tie-breaking rule, "half_even" or "half_up". Defaults to "half_even".
+        start (int): The number of leading months to skip. Defaults to 0.
+
+    Returns:
+        dict[str, float]:
+            A dictionary where keys are dates (as strings) and values are the deposit values on those dates.
+    """
+    values = growth_minor(payload.amount, payload.rate, payload.periods, rounding, start)
+    return {
+        key: value / MINOR_UNITS
+        for key, value in zip(month_end_keys(payload.date, payload.periods, start), values, strict=True)
+    }
+
+
+def compute_deposits_fixed(payloads: list[DepositRequest], rounding: str = "half_even") -> list[dict[str, float]]:
+    """
+    Calculate the compound growth for a batch of deposits with exact integer arithmetic.
+
+    Value series are shared between deposits with equal amount and rate, and month-end keys
+    between deposits starting in the same month.
+
+    Args:
+        payloads (list[DepositRequest]): The deposit details.
+        rounding (str): Tie-breaking rule, "half_even" or "half_up". Defaults to "half_even".
+
+    Returns:
+        list[dict[str, float]]: The calculation results, in the order of `payloads`.
+    """
+    series: dict[tuple[int, float], list[float]] = {}
+    keys: dict[tuple[int, int], list[str]] = {}
+    results = []
+    for payload in payloads:
+        values = series.get((payload.amount, payload.rate))
+        if values is None or len(values) < payload.periods:
+            minor = growth_minor(payload.amount, payload.rate, payload.periods, rounding)
+            values = series[(payload.amount, payload.rate)] = [value / MINOR_UNITS for value in minor]
+        month = (payload.date.year, payload.date.month)
+        dates = keys.get(month)
+        if dates is None or len(dates) < payload.periods:
+            dates = keys[month] = month_end_keys(payload.date, payload.periods)
+        results.append(dict(zip(dates[: payload.periods], values[: payload.periods], strict=True)))
+    return results
@@ -0,0 +1,152 @@
+"""
+Utility functions for deposit response formats.
+
+Provides the columnar form of a calculation result, the encoding of results as JSON or
+MessagePack, gzip and Brotli compression, and the parsing of the `Accept` and
+`Accept-Encoding` headers used to negotiate them. MessagePack and Brotli are optional
+dependencies (the "formats" extra); without them these formats are not offered.
+"""
+
+import gzip
+import json
+
+from src.constants.deposit import FormatConstants
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the installed extras
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the installed extras
+    brotli = None
+
+
+def to_columnar(result: dict[str, float]) -> dict[str, str | list[float]]:
+    """
+    Convert a calculation result to its columnar form.
+
+    The keys of a result are consecutive month ends, so they are fully implied by the first one.
+
+    Args:
+        result (dict[str, float]): The deposit values keyed by month-end date.
+
+    Returns:
+        dict[str, str | list[float]]: The first month end as "start" and the values in order as "values".
+    """
+    return {"start": next(iter(result)), "values": list(result.values())}
+
+
+def media_types() -> list[str]:
+    """
+    Get the media types a calculation result can be encoded as, the default one first.
+
+    Returns:
+        list[str]: The supported media types.
+    """
+    types = [FormatConstants.JSON_MEDIA_TYPE.value, FormatConstants.COLUMNAR_MEDIA_TYPE.value]
+    if msgpack is not None:
+        types.append(FormatConstants.MSGPACK_MEDIA_TYPE.value)
+    return types
+
+
+def content_codings() -> list[str]:
+    """
+    Get the content codings a response body can be compressed with, the preferred one first.
+
+    Returns:
+        list[str]: The supported content codings.
+    """
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def parse_qualities(header: str) -> dict[str, float]:
+    """
+    Parse an `Accept` or `Accept-Encoding` header into quality values.
+
+    Args:
+        header (str): The header value, e.g. "application/json;q=0.9, */*;q=0.1".
+
+    Returns:
+        dict[str, float]: The lower-cased media ranges or codings and their quality values.
+            Malformed quality values count as 0, i.e. not acceptable.
+    """
+    qualities = {}
+    for item in header.split(","):
+        value, *params = item.split(";")
+        value = value.strip().lower()
+        if not value:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        qualities[value] = max(quality, qualities.get(value, 0.0))
+    return qualities
+
+
+def negotiate(offers: list[str], header: str | None) -> str | None:
+    """
+    Pick the offer with the highest quality value in a request header.
+
+    An exact match takes precedence over "type/*", "*/*" and "*" wildcards. Ties go to the
+    earlier offer.
+
+    Args:
+        offers (list[str]): Supported media types or codings, in order of preference.
+        header (str | None): The `Accept` or `Accept-Encoding` header value.
+
+    Returns:
+        str | None: The chosen offer, or None if none of them is acceptable. Without a header
+            the first offer is chosen.
+    """
+    if not header:
+        return offers[0]
+    qualities = parse_qualities(header)
+    chosen, best = None, 0.0
+    for offer in offers:
+        for candidate in (offer, offer.split("/")[0] + "/*", "*/*", "*"):
+            if candidate in qualities:
+                if qualities[candidate] > best:
+                    chosen, best = offer, qualities[candidate]
+                break
+    return chosen
+
+
+def encode_result(result: dict[str, float], media_type: str) -> bytes:
+    """
+    Encode a calculation result in the given format.
+
+    Args:
+        result (dict[str, float]): The deposit values keyed by month-end date.
+        media_type (str): One of `media_types()`.
+
+    Returns:
+        bytes: The encoded body.
+    """
+    if media_type == FormatConstants.JSON_MEDIA_TYPE.value:
+        return json.dumps(result, separators=(",", ":")).encode()
+    if media_type == FormatConstants.MSGPACK_MEDIA_TYPE.value:
+        return msgpack.packb(to_columnar(result))
+    return json.dumps(to_columnar(result), separators=(",", ":")).encode()
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    """
+    Compress a response body.
+
+    Args:
+        body (bytes): The encoded body.
+        coding (str): One of `content_codings()`.
+
+    Returns:
+        bytes: The compressed body.
+    """
+    if coding == "br":
+        return brotli.compress(body, quality=FormatConstants.BROTLI_QUALITY.value)
+    return gzip.compress(body, compresslevel=FormatConstants.GZIP_LEVEL.value)
@@ -0,0 +1,63 @@
+"""
+Utility functions for HTTP caching of deposit results.
+
+Deposit results are deterministic for given parameters and calculation engine, so a strong
+entity tag can be derived from them up front and a conditional request answered with
+304 Not Modified without touching the database.
+"""
+
+import hashlib
+
+from src.constants.deposit import DepositConstants
+from src.schemas.deposits import DepositRequest
+
+
+def canonical_params(payload: DepositRequest) -> str:
+    """
+    Get the canonical form of deposit parameters.
+
+    Equal requests have the same canonical form however they were spelled, e.g. "5" and "5.0"
+    for the rate.
+
+    Args:
+        payload (DepositRequest): The validated deposit parameters.
+
+    Returns:
+        str: The date, periods, amount and rate joined with "|".
+    """
+    date = payload.date.strftime(DepositConstants.DATE_FORMAT.value)
+    return f"{date}|{payload.periods}|{payload.amount}|{payload.rate!r}"
+
+
+def make_etag(*parts: str) -> str:
+    """
+    Build a strong entity tag from everything that determines a representation.
+
+    Args:
+        *parts (str): The canonical parameters and the representation details (engine, format, coding).
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an `If-None-Match` header against an entity tag.
+
+    Uses the weak comparison required for `If-None-Match`, so "W/" prefixes are ignored.
+
+    Args:
+        if_none_match (str | None): The header value, a list of entity tags or "*".
+        etag (str): The entity tag of the current representation.
+
+    Returns:
+        bool: True if the client's cached representation is current.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
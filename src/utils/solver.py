@@ -0,0 +1,81 @@
+"""
+Utility functions for solving deposit parameters from a target balance.
+
+Provides helpers for finding the minimal deposit amount or the minimal number of months
+needed to reach a target balance. Both start from the closed-form compound interest formula
+and then check the candidate against the exact formula and rounding of `compute_deposit`.
+"""
+
+import math
+
+from src.constants.deposit import DepositConstants
+
+
+def deposit_value(amount: int, rate: float, periods: int) -> float:
+    """
+    Calculate the deposit value after a number of months.
+
+    Uses the same formula and rounding as `compute_deposit`.
+
+    Args:
+        amount (int): The deposit amount.
+        rate (float): The annual interest rate in percent.
+        periods (int): The number of months.
+
+    Returns:
+        float: The deposit value at the end of month `periods`.
+    """
+    return round(amount * (1 + rate / 100 / 12) ** periods, 2)
+
+
+def solve_amount(target: float, rate: float, periods: int) -> int:
+    """
+    Find the minimal deposit amount reaching the target balance after the given number of months.
+
+    Args:
+        target (float): The balance to reach.
+        rate (float): The annual interest rate in percent.
+        periods (int): The number of months.
+
+    Returns:
+        int: The minimal amount within the deposit amount bounds.
+
+    Raises:
+        ValueError: If even the maximal deposit amount does not reach the target.
+    """
+    low, high = DepositConstants.MIN_AMOUNT.value, DepositConstants.MAX_AMOUNT.value
+    amount = max(math.ceil(target / (1 + rate / 100 / 12) ** periods), low)
+    while amount > low and deposit_value(amount - 1, rate, periods) >= target:
+        amount -= 1
+    while amount <= high and deposit_value(amount, rate, periods) < target:
+        amount += 1
+    if amount > high:
+        raise ValueError(f"Target {target} is not reachable in {periods} months with an amount up to {high}")
+    return amount
+
+
+def solve_periods(target: float, amount: int, rate: float) -> int:
+    """
+    Find the minimal number of months for the deposit to reach the target balance.
+
+    Args:
+        target (float): The balance to reach.
+        amount (int): The deposit amount.
+        rate (float): The annual interest rate in percent.
+
+    Returns:
+        int: The minimal number of months within the deposit period bounds.
+
+    Raises:
+        ValueError: If the target is not reached within the maximal number of months.
+    """
+    low, high = DepositConstants.MIN_PERIODS.value, DepositConstants.MAX_PERIODS.value
+    estimate = math.log(target / amount) / math.log(1 + rate / 100 / 12) if target > amount else low
+    periods = min(max(math.ceil(estimate), low), high + 1)
+    while periods > low and deposit_value(amount, rate, periods - 1) >= target:
+        periods -= 1
+    while periods <= high and deposit_value(amount, rate, periods) < target:
+        periods += 1
+    if periods > high:
+        raise ValueError(f"Target {target} is not reachable from {amount} within {high} months")
+    return periods
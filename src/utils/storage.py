@@ -0,0 +1,146 @@
+"""
+Storage format of calculation results.
+
+A result is stored as the plain array of its values in the `calculation_values` column. The keys,
+the consecutive month ends of the deposit, are rebuilt from its start date on read, so they take no
+space in the row and no JSONB decoding. Rows written before the array column existed keep their
+result in the `calculation_result` JSONB column until they are converted by migration 3b1f6c2d9a47.
+
+Every result is stored with the version of the formulas that produced it. Results of an older version
+are stale: they are either served as they are or treated as missing and recomputed, depending on the
+configured policy, until the recompute job has brought them up to date. Results are also stored with
+the engine and rounding mode that produced them; a result of another engine is never served, since
+the response would be labeled as output of the configured one, and is recomputed like a missing one.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Row
+
+from src.constants.deposit import DepositConstants
+from src.models.deposits import Deposit
+from src.utils.deposit import month_end_keys
+
+STALE_POLICIES = ("serve", "recompute")
+
+
+class ResultStorage:
+    """
+    Converts calculation results between their API and storage forms.
+
+    Attributes:
+        read_legacy (bool): Whether rows that only have a JSONB result are read. Defaults to True.
+        write_legacy (bool): Whether results are also written to the JSONB column, for instances that
+            cannot read the array column yet. Defaults to False.
+        stale_policy (str): "serve" to return results of older formula versions, or "recompute" to treat
+            them as missing. Defaults to "serve".
+        engine (str): The configured calculation engine, "float" or "fixed". Defaults to "float".
+        rounding (str | None): The rounding mode of the "fixed" engine; None for the "float" engine, which
+            has no rounding setting. Defaults to "half_even".
+        version (int): The current version of the calculation formulas. Defaults to `CALCULATION_VERSION`.
+    """
+
+    def __init__(
+        self,
+        read_legacy: bool = True,
+        write_legacy: bool = False,
+        stale_policy: str = "serve",
+        engine: str = "float",
+        rounding: str = "half_even",
+        version: int = DepositConstants.CALCULATION_VERSION.value,
+    ) -> None:
+        if stale_policy not in STALE_POLICIES:
+            raise ValueError(f"Unknown stale policy: {stale_policy}. Expected one of {', '.join(STALE_POLICIES)}")
+        self.read_legacy = read_legacy
+        self.write_legacy = write_legacy
+        self.stale_policy = stale_policy
+        self.engine = engine
+        self.rounding = rounding if engine == "fixed" else None
+        self.version = version
+
+    def columns(
+        self, calculation_result: dict[str, float]
+    ) -> dict[str, list[float] | dict[str, float] | int | str | None]:
+        """
+        Get the column values storing a calculation result of the current version and configured engine.
+
+        Args:
+            calculation_result (dict[str, float]): The deposit values keyed by month-end date, in date order.
+
+        Returns:
+            dict: The `calculation_values`, `calculation_result`, `calculation_version`, `calculation_engine`
+                and `calculation_rounding` column values.
+        """
+        return {
+            "calculation_values": list(calculation_result.values()),
+            "calculation_result": calculation_result if self.write_legacy else None,
+            "calculation_version": self.version,
+            "calculation_engine": self.engine,
+            "calculation_rounding": self.rounding,
+        }
+
+    def is_stale(self, deposit: Deposit | Row) -> bool:
+        """
+        Check whether a row holds a result of an older version of the formulas.
+
+        Args:
+            deposit (Deposit | Row): The deposit record, or a row with its `calculation_version` column.
+
+        Returns:
+            bool: True if the result was produced by an older version. Rows of newer versions, written by
+                already upgraded instances, are not stale.
+        """
+        return deposit.calculation_version is not None and deposit.calculation_version < self.version
+
+    def is_foreign(self, deposit: Deposit | Row) -> bool:
+        """
+        Check whether a row holds a result of another engine or rounding mode than the configured one.
+
+        Args:
+            deposit (Deposit | Row): The deposit record, or a row with its `calculation_engine` and
+                `calculation_rounding` columns.
+
+        Returns:
+            bool: True if the result was produced by another engine, or by the "fixed" engine with another
+                rounding mode.
+        """
+        if deposit.calculation_engine is None:
+            return False
+        return deposit.calculation_engine != self.engine or deposit.calculation_rounding != self.rounding
+
+    def result(self, deposit: Deposit | Row) -> dict[str, float] | None:
+        """
+        Get the calculation result stored in a row.
+
+        Args:
+            deposit (Deposit | Row): The deposit record, or a row with its date, both result columns, version,
+                engine and rounding mode.
+
+        Returns:
+            dict[str, float] | None: The deposit values keyed by month-end date, or None if the row has
+                no result in a readable format, a result of another engine, or a stale one under the
+                "recompute" policy.
+        """
+        if self.is_foreign(deposit):
+            return None
+        if self.stale_policy == "recompute" and self.is_stale(deposit):
+            return None
+        if deposit.calculation_values is not None:
+            return unpack_values(deposit.date, deposit.calculation_values)
+        if self.read_legacy:
+            return deposit.calculation_result
+        return None
+
+
+def unpack_values(date: datetime, values: list[float]) -> dict[str, float]:
+    """
+    Rebuild a calculation result from its stored values.
+
+    Args:
+        date (datetime): The start date of the deposit.
+        values (list[float]): The deposit values at the consecutive month ends.
+
+    Returns:
+        dict[str, float]: The deposit values keyed by month-end date.
+    """
+    return dict(zip(month_end_keys(date, len(values)), values, strict=True))
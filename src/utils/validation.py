@@ -0,0 +1,98 @@
+import json
+from typing import TypeVar
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+NOT_AN_OBJECT_ERROR = {
+    "type": "model_attributes_type",
+    "loc": ("body",),
+    "msg": "Input should be a valid dictionary or object to extract fields from",
+}
+
+
+def format_validation_errors(errors: list[dict]) -> str:
+    """
+    Format validation errors into a single client-facing message.
+
+    Each error is rendered as "<field>: <message>", where the field is the last element of the
+    error location. Errors without a location (e.g. malformed JSON) are attributed to "body".
+
+    Args:
+        errors (list[dict]): Validation errors as returned by `ValidationError.errors()`.
+
+    Returns:
+        str: The errors joined with "; ".
+
+    Usage:
+        format_validation_errors(exc.errors())  # "periods: Input should be less than or equal to 60"
+    """
+    return "; ".join(f"{err['loc'][-1] if err['loc'] else 'body'}: {err['msg']}" for err in errors)
+
+
+def is_json_media_type(content_type: str | None) -> bool:
+    """
+    Check whether a `Content-Type` header denotes JSON, the way FastAPI decides to parse a body as JSON.
+
+    Args:
+        content_type (str | None): The header value.
+
+    Returns:
+        bool: True for "application/json" and "application/*+json" media types.
+    """
+    if not content_type:
+        return False
+    maintype, _, subtype = content_type.split(";")[0].strip().lower().partition("/")
+    return maintype == "application" and (subtype == "json" or subtype.endswith("+json"))
+
+
+def body_error(body: bytes) -> dict:
+    """
+    Describe a request body that is not a JSON object, the way FastAPI reports it.
+
+    Only called on the error path, so parsing the body a second time is acceptable.
+
+    Args:
+        body (bytes): The raw request body.
+
+    Returns:
+        dict: A validation error located at the body.
+    """
+    try:
+        data = json.loads(body) if body else None
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        return {"type": "json_invalid", "loc": ("body", getattr(exc, "pos", 0)), "msg": "JSON decode error"}
+    if data is None:
+        return {"type": "missing", "loc": ("body",), "msg": "Field required"}
+    return NOT_AN_OBJECT_ERROR
+
+
+def decode_json_body(model: type[ModelT], body: bytes, content_type: str | None) -> ModelT:
+    """
+    Decode and validate a JSON request body in a single pass.
+
+    Validates the raw bytes with `model_validate_json` instead of decoding them to Python objects
+    first, and reports errors with the same locations and messages as FastAPI's body parsing.
+
+    Args:
+        model (type[ModelT]): The request model.
+        body (bytes): The raw request body.
+        content_type (str | None): The `Content-Type` header of the request.
+
+    Returns:
+        ModelT: The validated model.
+
+    Raises:
+        RequestValidationError: If the body is not a valid JSON object or fails validation.
+    """
+    if body and not is_json_media_type(content_type):
+        raise RequestValidationError([NOT_AN_OBJECT_ERROR])
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as exc:
+        errors = exc.errors(include_url=False)
+    if any(not error["loc"] for error in errors):
+        raise RequestValidationError([body_error(body)])
+    raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in errors])
@@ -1,5 +1,15 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import AsyncGenerator
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from src.api.depends import get_deposit_service, get_session_factory
+
 
 async def test_calculate_deposit_endpoint(client: TestClient) -> None:
     """
@@ -24,6 +34,88 @@ async def test_calculate_deposit_endpoint(client: TestClient) -> None:
     assert data["31.01.2023"] > payload["amount"]
 
 
+class _EmptyDepositService:
+    """Deposit service stub that finds no stored deposits and accepts every insert."""
+
+    async def get_longest(self, payload: object) -> None:
+        return None
+
+    async def create(self, payload: object, calculation_result: object) -> None:
+        return None
+
+
+async def test_calculate_deposit_response_formats(app: FastAPI, client: TestClient) -> None:
+    """
+    Test the /calculate-deposit endpoint negotiates the columnar form and compression.
+    """
+    payload = {"date": "01.01.2023", "periods": 60, "amount": 100000, "rate": 5.0}
+    app.dependency_overrides[get_deposit_service] = _EmptyDepositService
+    try:
+        default = client.post("/api/v1/deposit/calculate-deposit", json=payload, headers={"Accept-Encoding": "gzip"})
+        columnar = client.post(
+            "/api/v1/deposit/calculate-deposit",
+            json=payload,
+            headers={"Accept": "application/vnd.deposit.columnar+json", "Accept-Encoding": "identity"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert default.status_code == 200
+    assert default.headers["content-type"] == "application/json"
+    assert default.headers["content-encoding"] == "gzip"
+    assert columnar.status_code == 200
+    assert columnar.headers["content-type"] == "application/vnd.deposit.columnar+json"
+    assert "content-encoding" not in columnar.headers
+    assert columnar.json() == {"start": "31.01.2023", "values": list(default.json().values())}
+
+
+async def test_deposit_routes_are_not_rate_limited_by_default(app: FastAPI, client: TestClient) -> None:
+    """
+    Test that a burst from one client, like a load generator run, is not throttled with the default settings.
+    """
+    payload = {"date": "01.01.2023", "periods": 12, "amount": 100000, "rate": 5.0}
+    app.dependency_overrides[get_deposit_service] = _EmptyDepositService
+    try:
+        statuses = {client.post("/api/v1/deposit/calculate-deposit", json=payload).status_code for _ in range(100)}
+    finally:
+        app.dependency_overrides.clear()
+
+    assert statuses == {200}
+
+
+async def test_get_deposit_caching(app: FastAPI, client: TestClient) -> None:
+    """
+    Test the GET /calculate-deposit endpoint sends validators and answers a matching If-None-Match with 304.
+    """
+    service = _EmptyDepositService()
+    service.get_longest = AsyncMock(return_value=None)
+    app.dependency_overrides[get_deposit_service] = lambda: service
+    try:
+        response = client.get(
+            "/api/v1/deposit/calculate-deposit",
+            params={"date": "01.01.2023", "periods": 12, "amount": 100000, "rate": 5},
+        )
+        respelled = client.get(
+            "/api/v1/deposit/calculate-deposit",
+            params={"date": "01.01.2023", "periods": "12", "amount": 100000, "rate": "5.0"},
+            headers={"If-None-Match": response.headers.get("etag", "")},
+        )
+        invalid = client.get("/api/v1/deposit/calculate-deposit", params={"date": "32.13.2023", "periods": 120})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert len(response.json()) == 12
+    assert response.headers["cache-control"] == "public, max-age=3600"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    assert respelled.status_code == 304
+    assert respelled.headers["etag"] == response.headers["etag"]
+    assert service.get_longest.await_count == 1
+    assert invalid.status_code == 400
+    assert "date" in invalid.json()["error"]
+    assert "amount" in invalid.json()["error"]
+
+
 async def test_calculate_deposit_validation_error(client: TestClient) -> None:
     """
     Test the /calculate-deposit endpoint with invalid input.
@@ -47,3 +139,355 @@ async def test_calculate_deposit_validation_error(client: TestClient) -> None:
     assert "periods" in data["error"]
     assert "amount" in data["error"]
     assert "rate" in data["error"]
+
+
+async def test_calculate_deposits_bulk_reports_invalid_rows(client: TestClient) -> None:
+    """
+    Test the /calculate-deposit/bulk endpoint reports each invalid row inline with its line number.
+    """
+    body = "Date,Periods,Amount,Rate\n32.13.2023,12,100000,5.0\n\n01.01.2023,120,100000,5.0\n"
+
+    response = client.post(
+        "/api/v1/deposit/calculate-deposit/bulk",
+        content=body,
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["line"] for line in lines] == [2, 4]
+    assert "date" in lines[0]["error"]
+    assert "periods" in lines[1]["error"]
+
+
+async def test_calculate_deposits_bulk_rejects_bad_input(client: TestClient) -> None:
+    """
+    Test the /calculate-deposit/bulk endpoint rejects unsupported media types and incomplete CSV headers.
+    """
+    unsupported = client.post(
+        "/api/v1/deposit/calculate-deposit/bulk", content="{}", headers={"Content-Type": "text/plain"}
+    )
+    bad_header = client.post(
+        "/api/v1/deposit/calculate-deposit/bulk", content="date,periods\n", headers={"Content-Type": "text/csv"}
+    )
+
+    assert unsupported.status_code == 415
+    assert bad_header.status_code == 400
+    assert bad_header.json() == {"error": "header: Missing columns: amount, rate"}
+
+
+class _EmptyDatabaseSession:
+    """Session stub that finds no stored deposits and accepts every insert."""
+
+    async def __aenter__(self) -> "_EmptyDatabaseSession":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+    async def execute(self, *args: object) -> MagicMock:
+        result = MagicMock()
+        result.scalars = MagicMock(return_value=[])
+        return result
+
+    async def commit(self) -> None:
+        return None
+
+
+async def test_calculate_deposits_bulk_streams_every_row_of_a_chunked_upload(app: FastAPI) -> None:
+    """
+    Test that a body sent as many ASGI messages yields exactly one result per uploaded row.
+    """
+    rows = 2000
+    line = b'{"date": "01.01.2023", "periods": 3, "amount": 100000, "rate": 5.0}\n'
+
+    async def body() -> AsyncGenerator[bytes, None]:
+        for _ in range(rows // 10):
+            yield line * 10
+
+    app.dependency_overrides[get_session_factory] = lambda: _EmptyDatabaseSession
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client, asyncio.timeout(30):
+                response = await client.post(
+                    "/api/v1/deposit/calculate-deposit/bulk",
+                    content=body(),
+                    headers={"Content-Type": "application/x-ndjson"},
+                )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    results = [json.loads(result) for result in response.text.splitlines()]
+    assert [result["line"] for result in results] == list(range(1, rows + 1))
+    assert all("result" in result for result in results)
+
+
+async def test_calculate_portfolio_endpoint(client: TestClient) -> None:
+    """
+    Test the /portfolio endpoint returns one aggregated series.
+    """
+    deposit = {"date": "01.01.2023", "periods": 12, "amount": 100000, "rate": 5.0}
+
+    response = client.post("/api/v1/deposit/portfolio", json={"deposits": [deposit, {**deposit, "periods": 6}]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["start"] == "31.01.2023"
+    assert len(data["values"]) == 12
+    assert data["values"][0] > 2 * deposit["amount"]
+    assert data["values"][-1] < data["values"][0]
+
+
+async def test_calculate_portfolio_validation_error(client: TestClient) -> None:
+    """
+    Test the /portfolio endpoint rejects an empty portfolio.
+    """
+    response = client.post("/api/v1/deposit/portfolio", json={"deposits": []})
+
+    assert response.status_code == 400
+    assert "deposits" in response.json()["error"]
+
+
+async def test_metrics_endpoint_reports_dispatch_timings(client: TestClient) -> None:
+    """
+    Test the /metrics endpoint reports the jobs run by the compute dispatcher and the admission state.
+    """
+    before = client.get("/api/v1/metrics").json()
+    deposit = {"date": "01.01.2023", "periods": 12, "amount": 100000, "rate": 5.0}
+    client.post("/api/v1/deposit/portfolio", json={"deposits": [deposit]})
+    after = client.get("/api/v1/metrics").json()
+
+    assert set(after["dispatch"]) == {"inline", "thread", "process"}
+    assert sum(mode["count"] for mode in after["dispatch"].values()) == (
+        sum(mode["count"] for mode in before["dispatch"].values()) + 1
+    )
+    assert after["admission"]["active"] == 0
+    # Rate limiting is disabled by default, so no request passes through the buckets.
+    assert after["rate_limit"]["allowed"] == 0
+
+
+async def test_calculate_sweep_endpoint(client: TestClient) -> None:
+    """
+    Test the /sweep endpoint returns a rates x periods matrix.
+    """
+    payload = {"date": "01.01.2023", "amount": 100000, "rate_from": 5.0, "rate_to": 6.0, "periods": [6, 12]}
+
+    response = client.post("/api/v1/deposit/sweep", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["rates"]) == 11
+    assert data["maturity_dates"] == ["30.06.2023", "31.12.2023"]
+    assert len(data["values"]) == 11
+    assert all(len(row) == 2 for row in data["values"])
+    assert data["values"][-1][1] > data["values"][0][1]
+
+
+async def test_solve_deposit_endpoint(client: TestClient) -> None:
+    """
+    Test the /solve endpoint solves for the amount or the number of periods.
+    """
+    by_amount = client.post(
+        "/api/v1/deposit/solve", json={"date": "01.01.2023", "target": 110000, "rate": 5.0, "periods": 12}
+    )
+    by_periods = client.post(
+        "/api/v1/deposit/solve", json={"date": "01.01.2023", "target": 110000, "rate": 5.0, "amount": 100000}
+    )
+
+    assert by_amount.status_code == 200
+    assert by_amount.json()["periods"] == 12
+    assert by_amount.json()["balance"] >= 110000
+    assert by_periods.status_code == 200
+    assert by_periods.json()["amount"] == 100000
+    assert by_periods.json()["balance"] >= 110000
+
+
+async def test_solve_deposit_errors(client: TestClient) -> None:
+    """
+    Test the /solve endpoint rejects ambiguous requests and unreachable targets.
+    """
+    ambiguous = client.post("/api/v1/deposit/solve", json={"date": "01.01.2023", "target": 110000, "rate": 5.0})
+    unreachable = client.post(
+        "/api/v1/deposit/solve", json={"date": "01.01.2023", "target": 10**9, "rate": 5.0, "amount": 100000}
+    )
+
+    assert ambiguous.status_code == 400
+    assert unreachable.status_code == 400
+    assert unreachable.json()["error"].startswith("target: ")
+
+
+class _ExportDepositService:
+    """Deposit service stub that streams two batches of stored deposits."""
+
+    def __init__(self, stale: bool = False) -> None:
+        self.date_range = None
+        self.stale = stale
+
+    async def stream(self, date_from: object, date_to: object) -> AsyncGenerator[list[dict], None]:
+        self.date_range = (date_from, date_to)
+        for day in ("01", "02"):
+            yield [
+                {
+                    "date": f"{day}.01.2023",
+                    "periods": 2,
+                    "amount": 100000,
+                    "rate": 5.0,
+                    "calculation_result": None if self.stale else {"31.01.2023": 100416.67, "28.02.2023": 100835.07},
+                }
+            ]
+
+
+async def test_export_deposits_streams_csv_and_ndjson(app: FastAPI, client: TestClient) -> None:
+    """
+    Test the /export/deposits endpoint streams every batch in the requested format.
+    """
+    service = _ExportDepositService()
+    app.dependency_overrides[get_deposit_service] = lambda: service
+    try:
+        ndjson = client.get("/api/v1/export/deposits")
+        flat_csv = client.get(
+            "/api/v1/export/deposits",
+            params={"format": "csv", "flatten": "true", "date_from": "01.01.2023", "date_to": "31.01.2023"},
+        )
+        invalid = client.get("/api/v1/export/deposits", params={"date_from": "2023-01-01"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["date"] for line in ndjson.text.splitlines()] == ["01.01.2023", "02.01.2023"]
+    assert flat_csv.status_code == 200
+    assert flat_csv.headers["content-type"].startswith("text/csv")
+    assert flat_csv.headers["content-disposition"] == 'attachment; filename="deposits.csv"'
+    assert flat_csv.text.splitlines()[0] == "date,periods,amount,rate,month_end,value"
+    assert len(flat_csv.text.splitlines()) == 5
+    assert [date.day for date in service.date_range] == [1, 31]
+    assert invalid.status_code == 400
+    assert "date_from" in invalid.json()["error"]
+
+
+async def test_export_deposits_recomputes_unreadable_results(app: FastAPI, client: TestClient) -> None:
+    """
+    Test the /export/deposits endpoint recomputes results the storage does not serve, e.g. stale ones.
+    """
+    app.dependency_overrides[get_deposit_service] = lambda: _ExportDepositService(stale=True)
+    try:
+        response = client.get("/api/v1/export/deposits")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [json.loads(line)["calculation_result"] for line in response.text.splitlines()] == [
+        {"31.01.2023": 100416.67, "28.02.2023": 100835.07}
+    ] * 2
+
+
+async def test_calculate_deposit_reuses_longest_stored_result(app: FastAPI, client: TestClient) -> None:
+    """
+    Test the /calculate-deposit endpoint cuts a longer stored result and extends a shorter one in place.
+    """
+    from src.models.deposits import Deposit
+    from src.schemas.deposits import DepositRequest
+    from src.utils.deposit import compute_deposit
+    from src.utils.storage import ResultStorage
+
+    params = {"date": "15.11.2023", "amount": 100000, "rate": 5.0}
+    full = compute_deposit(DepositRequest(**params, periods=36))
+    stored = Deposit(date=datetime(2023, 11, 15), periods=24, calculation_values=list(full.values())[:24])
+    service = _EmptyDepositService()
+    service.result = ResultStorage().result
+    service.is_stale = ResultStorage().is_stale
+    service.get_longest = AsyncMock(return_value=stored)
+    service.upgrade = AsyncMock(return_value=True)
+    service.create = AsyncMock()
+    app.dependency_overrides[get_deposit_service] = lambda: service
+    try:
+        shorter = client.post("/api/v1/deposit/calculate-deposit", json={**params, "periods": 12})
+        longer = client.post("/api/v1/deposit/calculate-deposit", json={**params, "periods": 36})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert shorter.json() == dict(list(full.items())[:12])
+    assert longer.json() == full
+    service.upgrade.assert_awaited_once_with(stored, full)
+    service.create.assert_not_awaited()
+
+
+async def test_calculate_deposit_recomputes_stale_result(app: FastAPI, client: TestClient) -> None:
+    """
+    Test the /calculate-deposit endpoint replaces a stale stored result under the "recompute" policy.
+    """
+    from src.models.deposits import Deposit
+    from src.schemas.deposits import DepositRequest
+    from src.utils.deposit import compute_deposit
+    from src.utils.storage import ResultStorage
+
+    params = {"date": "15.11.2023", "amount": 100000, "rate": 5.0}
+    full = compute_deposit(DepositRequest(**params, periods=24))
+    stored = Deposit(date=datetime(2023, 11, 15), periods=24, calculation_values=[0.0] * 24, calculation_version=0)
+    service = _EmptyDepositService()
+    service.result = ResultStorage(stale_policy="recompute").result
+    service.get_longest = AsyncMock(return_value=stored)
+    service.upgrade = AsyncMock(return_value=True)
+    app.dependency_overrides[get_deposit_service] = lambda: service
+    try:
+        response = client.post("/api/v1/deposit/calculate-deposit", json={**params, "periods": 12})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.json() == dict(list(full.items())[:12])
+    service.upgrade.assert_awaited_once_with(stored, full)
+
+
+async def test_calculate_deposit_recomputes_stale_result_before_extending(app: FastAPI, client: TestClient) -> None:
+    """
+    Test the /calculate-deposit endpoint serves a stale result under the "serve" policy, but recomputes all of its
+    months instead of extending it.
+    """
+    from src.models.deposits import Deposit
+    from src.schemas.deposits import DepositRequest
+    from src.utils.deposit import compute_deposit
+    from src.utils.storage import ResultStorage
+
+    params = {"date": "15.11.2023", "amount": 100000, "rate": 5.0}
+    full = compute_deposit(DepositRequest(**params, periods=36))
+    stored = Deposit(date=datetime(2023, 11, 15), periods=24, calculation_values=[1.0] * 24, calculation_version=0)
+    storage = ResultStorage(stale_policy="serve")
+    service = _EmptyDepositService()
+    service.result = storage.result
+    service.is_stale = storage.is_stale
+    service.get_longest = AsyncMock(return_value=stored)
+    service.upgrade = AsyncMock(return_value=True)
+    app.dependency_overrides[get_deposit_service] = lambda: service
+    try:
+        served = client.post("/api/v1/deposit/calculate-deposit", json={**params, "periods": 12})
+        extended = client.post("/api/v1/deposit/calculate-deposit", json={**params, "periods": 36})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert list(served.json().values()) == [1.0] * 12
+    assert extended.json() == full
+    service.upgrade.assert_awaited_once_with(stored, full)
+
+
+async def test_openapi_schema_is_built_on_first_request(client: TestClient) -> None:
+    """
+    Test that the OpenAPI schema is only generated when first requested and keeps the custom validation error.
+    """
+    from settings import AppSettings, get_settings
+    from src.api.app import create_app
+
+    assert create_app(settings=get_settings(AppSettings)).openapi_schema is None
+
+    response = client.get("/openapi.json")
+
+    assert response.status_code == 200
+    schema = response.json()
+    assert "ValidationError" in schema["components"]["schemas"]
+    assert "HTTPValidationError" not in schema["components"]["schemas"]
+    responses = schema["paths"]["/api/v1/deposit/portfolio"]["post"]["responses"]
+    assert "400" in responses
+    assert "422" not in responses
+    assert client.app.openapi() is client.app.openapi_schema
@@ -0,0 +1,59 @@
+import asyncio
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.api.middlewares.admission import AdmissionControlMiddleware, AdmissionLimiter
+from src.utils.deadlines import remaining
+
+
+async def test_admission_limiter_queues_and_sheds() -> None:
+    limiter = AdmissionLimiter(max_concurrency=1, max_queue=1)
+
+    assert await limiter.acquire(1.0)
+    queued = asyncio.create_task(limiter.acquire(1.0))
+    await asyncio.sleep(0)
+    assert not await limiter.acquire(1.0)
+    assert limiter.snapshot() == {"active": 1, "waiting": 1, "rejected": 1, "timed_out": 0}
+
+    limiter.release()
+    assert await queued
+    assert limiter.snapshot()["active"] == 1
+    assert not await limiter.acquire(0.01)
+    assert limiter.snapshot() == {"active": 1, "waiting": 0, "rejected": 1, "timed_out": 1}
+
+    limiter.release()
+    assert limiter.snapshot()["active"] == 0
+
+
+async def test_admission_middleware_sheds_with_retry_after() -> None:
+    release = asyncio.Event()
+    deadlines = []
+
+    async def endpoint(request: object) -> PlainTextResponse:
+        deadlines.append(remaining())
+        await release.wait()
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/api/v1/deposit/slow", endpoint), Route("/other", endpoint)])
+    limiter = AdmissionLimiter(max_concurrency=1, max_queue=0)
+    wrapped = AdmissionControlMiddleware(app, limiter=limiter, timeout=2.0, retry_after=3)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=wrapped), base_url="http://test") as client:
+        running = asyncio.create_task(client.get("/api/v1/deposit/slow"))
+        while not deadlines:
+            await asyncio.sleep(0.01)
+        shed = await client.get("/api/v1/deposit/slow")
+        release.set()
+        unlimited = await client.get("/other")
+        admitted = await running
+
+    assert admitted.status_code == 200
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "3"
+    assert unlimited.status_code == 200
+    assert 0 < deadlines[0] <= 2.0
+    assert deadlines[1] is None
+    assert limiter.snapshot()["active"] == 0
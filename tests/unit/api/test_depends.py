@@ -1,24 +1,44 @@
-from unittest.mock import AsyncMock, MagicMock
-
-from src.api.depends import get_deposit_service, get_event_loop, get_executor
+from unittest.mock import MagicMock
+
+from src.api.depends import (
+    get_calculator,
+    get_deposit_service,
+    get_dispatcher,
+    get_result_storage,
+)
 from src.services.deposits import DepositService
+from src.utils.storage import ResultStorage
 
 
-async def test_get_executor() -> None:
+async def test_get_calculator() -> None:
     request_mock = MagicMock()
-    request_mock.app.state.executor = "test_executor"
+    request_mock.app.state.calculator = "test_calculator"
+
+    result = await get_calculator(request_mock)
+    assert result == "test_calculator"
 
-    result = await get_executor(request_mock)
-    assert result == "test_executor"
 
+async def test_get_dispatcher() -> None:
+    request_mock = MagicMock()
+    request_mock.app.state.dispatcher = "test_dispatcher"
+
+    result = await get_dispatcher(request_mock)
+    assert result == "test_dispatcher"
+
+
+async def test_get_result_storage() -> None:
+    request_mock = MagicMock()
+    request_mock.app.state.result_storage = "test_storage"
 
-async def test_get_event_loop() -> None:
-    loop = await get_event_loop()
-    assert loop.is_running()
+    result = await get_result_storage(request_mock)
+    assert result == "test_storage"
 
 
 async def test_get_deposit_service() -> None:
-    mock_session = AsyncMock()
-    service = await get_deposit_service(mock_session)
+    mock_session_factory = MagicMock()
+    storage = ResultStorage()
+    service = await get_deposit_service(mock_session_factory, storage)
     assert isinstance(service, DepositService)
-    assert service.session == mock_session
+    assert service.session_factory == mock_session_factory
+    assert service.storage is storage
+    mock_session_factory.assert_not_called()
@@ -0,0 +1,110 @@
+import sqlite3
+from pathlib import Path
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.api.middlewares.rate_limit import RateLimitMiddleware, SqliteTokenBuckets, TokenBuckets, client_key
+
+
+def test_token_buckets_refill_at_rate() -> None:
+    buckets = TokenBuckets(rate=2.0, burst=2)
+
+    assert buckets.take("a", 0.0) == 0
+    assert buckets.take("a", 0.0) == 0
+    assert buckets.take("a", 0.0) == 0.5
+    assert buckets.take("b", 0.0) == 0
+    assert buckets.take("a", 0.25) == 0.25
+    assert buckets.take("a", 0.5) == 0
+    assert buckets.allowed == 4
+    assert buckets.throttled == 2
+
+
+def test_token_buckets_evict_idle_and_least_recent_clients() -> None:
+    buckets = TokenBuckets(rate=1.0, burst=1, idle_ttl=10.0, max_clients=2)
+
+    buckets.take("a", 0.0)
+    buckets.take("b", 5.0)
+    buckets.take("c", 6.0)
+    assert list(buckets.buckets) == ["b", "c"]
+
+    buckets.take("c", 16.0)
+    assert list(buckets.buckets) == ["c"]
+
+
+async def test_token_buckets_snapshot() -> None:
+    buckets = TokenBuckets(rate=1.0, burst=1)
+    for _ in range(3):
+        buckets.take("a", 0.0)
+    buckets.take("b", 0.0)
+
+    assert await buckets.snapshot() == {"clients": 2, "allowed": 2, "throttled": 2, "top_throttled": {"a": 2}}
+
+
+async def test_sqlite_token_buckets_share_state(tmp_path: Path) -> None:
+    path = str(tmp_path / "buckets.sqlite3")
+    first, second = SqliteTokenBuckets(path, rate=1.0, burst=2), SqliteTokenBuckets(path, rate=1.0, burst=2)
+
+    assert first.take("a", 100.0) == 0
+    assert second.take("a", 100.0) == 0
+    assert first.take("a", 100.5) == 0.5
+    assert await second.snapshot() == {
+        "clients": 1,
+        "allowed": 1,
+        "throttled": 0,
+        "failed": 0,
+        "top_throttled": {"a": 1},
+    }
+
+    first.evict(1000.0)
+    assert (await first.snapshot())["clients"] == 0
+
+
+def test_sqlite_token_buckets_allow_requests_while_the_database_is_locked(tmp_path: Path) -> None:
+    path = str(tmp_path / "buckets.sqlite3")
+    buckets = SqliteTokenBuckets(path, rate=1.0, burst=1)
+    buckets.connection.execute("PRAGMA busy_timeout = 0")
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        assert buckets.take("a", 100.0) == 0
+        assert buckets.take("a", 100.0) == 0
+    finally:
+        holder.execute("ROLLBACK")
+
+    assert (buckets.allowed, buckets.failed) == (2, 2)
+    assert not buckets.connection.in_transaction
+    assert buckets.take("a", 100.0) == 0
+    assert buckets.take("a", 100.0) == 1.0
+
+
+def test_client_key() -> None:
+    scope = {"headers": [(b"x-api-key", b"secret")], "client": ("10.0.0.1", 1234)}
+
+    assert client_key(scope).startswith("key:")
+    assert "secret" not in client_key(scope)
+    assert client_key({"headers": [], "client": ("10.0.0.1", 1234)}) == "ip:10.0.0.1"
+    assert client_key({"headers": []}) == "ip:unknown"
+
+
+async def test_rate_limit_middleware_throttles_per_client() -> None:
+    async def endpoint(request: object) -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/api/v1/deposit/calculate", endpoint), Route("/other", endpoint)])
+    wrapped = RateLimitMiddleware(app, buckets=TokenBuckets(rate=0.1, burst=1))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=wrapped), base_url="http://test") as client:
+        allowed = await client.get("/api/v1/deposit/calculate")
+        throttled = await client.get("/api/v1/deposit/calculate")
+        other_client = await client.get("/api/v1/deposit/calculate", headers={"X-API-Key": "partner"})
+        unlimited = await client.get("/other")
+
+    assert allowed.status_code == 200
+    assert throttled.status_code == 429
+    assert throttled.headers["retry-after"] == "10"
+    assert throttled.json() == {"detail": "Rate limit exceeded, retry later"}
+    assert other_client.status_code == 200
+    assert unlimited.status_code == 200
@@ -0,0 +1,57 @@
+import gzip
+import json
+
+from starlette.requests import Request
+
+from src.api.responses import ResultEncoder
+from src.constants.deposit import FormatConstants
+
+RESULT = {f"{day:02d}.01.2024": 10000.0 + day for day in range(1, 61)}
+
+
+def make_request(**headers: str) -> Request:
+    raw_headers = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": raw_headers})
+
+
+def test_result_encoder_defaults_to_dict_json() -> None:
+    response = ResultEncoder().response(make_request(), RESULT)
+
+    assert response.media_type == FormatConstants.JSON_MEDIA_TYPE.value
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    assert "content-encoding" not in response.headers
+    assert json.loads(response.body) == RESULT
+
+
+def test_result_encoder_columnar_and_unacceptable_accept() -> None:
+    encoder = ResultEncoder()
+
+    response = encoder.response(make_request(accept=FormatConstants.COLUMNAR_MEDIA_TYPE.value), RESULT)
+    assert response.media_type == FormatConstants.COLUMNAR_MEDIA_TYPE.value
+    assert json.loads(response.body) == {"start": "01.01.2024", "values": list(RESULT.values())}
+
+    response = encoder.response(make_request(accept="text/html"), RESULT)
+    assert response.media_type == FormatConstants.JSON_MEDIA_TYPE.value
+
+
+def test_result_encoder_compresses_above_min_size() -> None:
+    encoder = ResultEncoder(min_size=1024)
+    body = json.dumps(RESULT, separators=(",", ":")).encode()
+    assert len(body) >= 1024
+
+    response = encoder.response(make_request(accept_encoding="gzip"), RESULT)
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(response.body) == body
+
+    response = ResultEncoder(min_size=len(body) + 1).response(make_request(accept_encoding="gzip"), RESULT)
+    assert "content-encoding" not in response.headers
+
+
+def test_result_encoder_negotiate() -> None:
+    encoder = ResultEncoder()
+
+    assert encoder.negotiate(make_request()) == (FormatConstants.JSON_MEDIA_TYPE.value, None)
+    assert encoder.negotiate(make_request(accept="text/html", accept_encoding="gzip;q=0.5")) == (
+        FormatConstants.JSON_MEDIA_TYPE.value,
+        "gzip",
+    )
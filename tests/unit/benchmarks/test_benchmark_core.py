@@ -0,0 +1,32 @@
+from benchmarks.core import compare, measure
+
+
+def test_measure_reports_time_per_operation() -> None:
+    result = measure(lambda: sum(range(10)), repeat=3, min_time=0.001)
+
+    assert result["ns_per_op"] > 0
+    assert result["median_ns_per_op"] >= result["ns_per_op"]
+    assert 0 < result["relative"] < 1
+    assert result["repeat"] == 3
+
+
+def test_compare_flags_regressions() -> None:
+    baseline = {
+        "results": {
+            "fast": {"median_ns_per_op": 100.0, "relative": 0.10},
+            "slow": {"median_ns_per_op": 100.0, "relative": 0.10, "threshold": 1.0},
+        }
+    }
+    current = {
+        "results": {
+            "fast": {"median_ns_per_op": 100.0, "relative": 0.13},
+            "slow": {"median_ns_per_op": 100.0, "relative": 0.15},
+            "new": {"median_ns_per_op": 1.0, "relative": 0.01},
+        }
+    }
+
+    report = {entry["name"]: entry for entry in compare(current, baseline, threshold=0.2)}
+
+    assert report["fast"]["regression"] is True
+    assert report["slow"]["regression"] is False
+    assert "new" not in report
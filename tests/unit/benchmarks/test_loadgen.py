@@ -0,0 +1,63 @@
+from benchmarks.loadgen import LoadStats, payload_generator, percentile, unique_payload
+from src.schemas.deposits import DepositRequest
+
+
+def test_unique_payloads_are_valid_and_distinct() -> None:
+    payloads = [unique_payload(index) for index in range(500)]
+
+    for payload in payloads:
+        DepositRequest(**payload)
+    assert len({tuple(payload.values()) for payload in payloads}) == len(payloads)
+
+
+def test_hot_distribution_reuses_keys() -> None:
+    next_payload = payload_generator("hot", seed=1)
+
+    keys = {tuple(next_payload().values()) for _ in range(1000)}
+
+    assert len(keys) <= 100
+
+
+def test_percentile() -> None:
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_load_stats_report() -> None:
+    stats = LoadStats()
+    stats.record(0.010, "200", contended=False)
+    stats.record(0.020, "500", contended=True)
+    stats.record(0.030, "500", contended=False)
+
+    report = stats.report(elapsed=1.0)
+
+    assert report["requests"] == 3
+    assert report["latency_ms"]["max"] == 30.0
+    assert report["errors"]["by_status"] == {"500": 2}
+    assert report["errors"]["unique_violation_500"] == 1
+    assert report["errors"]["throttled_429"] == 0
+
+
+def test_load_stats_report_counts_throttled_and_shed_requests() -> None:
+    stats = LoadStats()
+    for outcome in ("200", "429", "429", "503"):
+        stats.record(0.010, outcome, contended=False)
+
+    errors = stats.report(elapsed=1.0)["errors"]
+
+    assert errors["total"] == 3
+    assert errors["by_status"] == {"429": 2, "503": 1}
+    assert (errors["throttled_429"], errors["shed_503"]) == (2, 1)
+
+
+def test_unique_keys_depend_on_run_id_not_seed() -> None:
+    first = payload_generator("unique", seed=1, run_id=1)()
+    same_run = payload_generator("unique", seed=2, run_id=1)()
+    next_run = payload_generator("unique", seed=1, run_id=2)()
+
+    assert first == same_run
+    assert first != next_run
+    DepositRequest(**next_run)
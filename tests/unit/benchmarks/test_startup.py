@@ -0,0 +1,30 @@
+from benchmarks.startup import parse_importtime, top_modules
+from settings import AppSettings, get_settings
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       4200 |     sqlalchemy.engine
+import time:       300 |       4500 |   sqlalchemy
+import time:      2000 |       9000 | run_app
+Traceback lines and other output are ignored
+"""
+
+
+def test_parse_importtime() -> None:
+    modules = parse_importtime(IMPORTTIME)
+
+    assert modules == {"_io": 120, "sqlalchemy.engine": 4200, "sqlalchemy": 4500, "run_app": 9000}
+
+
+def test_top_modules() -> None:
+    slowest = top_modules(parse_importtime(IMPORTTIME), count=2)
+
+    assert slowest == [
+        {"module": "run_app", "cumulative_ms": 9.0},
+        {"module": "sqlalchemy", "cumulative_ms": 4.5},
+    ]
+
+
+def test_settings_are_loaded_once() -> None:
+    assert get_settings(AppSettings) is get_settings(AppSettings)
@@ -15,15 +15,27 @@ def test_deposit_model_columns() -> None:
     assert "amount" in columns
     assert "rate" in columns
     assert "calculation_result" in columns
+    assert "calculation_values" in columns
+    assert "calculation_version" in columns
+    assert "calculation_engine" in columns
+    assert "calculation_rounding" in columns
 
     assert columns["date"].nullable is False
     assert columns["periods"].nullable is False
     assert columns["amount"].nullable is False
     assert columns["rate"].nullable is False
     assert columns["calculation_result"].nullable is True
+    assert columns["calculation_values"].nullable is True
+    assert columns["calculation_version"].nullable is False
+    assert columns["calculation_engine"].nullable is False
+    assert columns["calculation_rounding"].nullable is True
 
     assert str(columns["date"].type) == "DATETIME"
     assert str(columns["periods"].type) == "INTEGER"
     assert str(columns["amount"].type) == "INTEGER"
     assert str(columns["rate"].type) == "FLOAT"
     assert str(columns["calculation_result"].type) == "JSONB"
+    assert str(columns["calculation_values"].type) == "ARRAY"
+    assert str(columns["calculation_values"].type.item_type) == "DOUBLE PRECISION"
+    assert str(columns["calculation_version"].type) == "INTEGER"
+    assert str(columns["calculation_engine"].type) == "VARCHAR(16)"
@@ -1,7 +1,7 @@
 import pytest
 from pydantic import ValidationError
 
-from src.schemas.deposits import DepositRequest
+from src.schemas.deposits import DepositRequest, ExportRequest, SweepRequest
 
 
 def test_valid_deposit_request() -> None:
@@ -24,3 +24,33 @@ def test_invalid_date_format() -> None:
     }
     with pytest.raises(ValidationError):
         DepositRequest(**payload)
+
+
+def test_sweep_request_rates() -> None:
+    request = SweepRequest(date="01.01.2024", amount=10000, periods=[12], rate_from=5.1, rate_to=5.3)
+    assert request.rates == [5.1, 5.2, 5.3]
+    assert len(SweepRequest(date="01.01.2024", amount=10000, periods=[12]).rates) == 71
+
+
+def test_invalid_sweep_request() -> None:
+    with pytest.raises(ValidationError):
+        SweepRequest(date="01.01.2024", amount=10000, periods=[12], rate_from=6.0, rate_to=5.0)
+    with pytest.raises(ValidationError):
+        SweepRequest(date="01.01.2024", amount=10000, periods=[0, 61])
+
+
+def test_export_request() -> None:
+    request = ExportRequest(format="csv", date_from="01.01.2024", date_to="31.01.2024")
+    assert request.date_from.day == 1
+    assert request.date_to.day == 31
+    assert ExportRequest().format == "ndjson"
+    assert ExportRequest().date_from is None
+
+
+def test_invalid_export_request() -> None:
+    with pytest.raises(ValidationError):
+        ExportRequest(date_from="01.02.2024", date_to="01.01.2024")
+    with pytest.raises(ValidationError):
+        ExportRequest(date_from="2024-01-01")
+    with pytest.raises(ValidationError):
+        ExportRequest(format="xml")
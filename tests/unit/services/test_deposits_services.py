@@ -1,38 +1,170 @@
+from datetime import datetime
+from typing import AsyncGenerator
 from unittest.mock import AsyncMock, MagicMock
 
+from sqlalchemy.exc import IntegrityError
+
 from src.models.deposits import Deposit
+from src.schemas.deposits import DepositRequest
 from src.services.deposits import DepositService
+from src.utils.storage import ResultStorage
+
+
+def make_session_factory(mock_session: AsyncMock) -> MagicMock:
+    mock_session.__aenter__.return_value = mock_session
+    return MagicMock(return_value=mock_session)
 
 
-async def test_get_existing_deposit() -> None:
+async def test_create_deposit() -> None:
     mock_session = AsyncMock()
+    service = DepositService(session_factory=make_session_factory(mock_session))
+    payload = Deposit(date="2024-01-01", periods=12, amount=10000, rate=5.0)
+    calculation_result = {"2024-02-01": 10500.0}
+
+    await service.create(payload, calculation_result)
+
+    mock_session.add.assert_called_once()
+    deposit = mock_session.add.call_args.args[0]
+    assert deposit.calculation_values == [10500.0]
+    assert deposit.calculation_result is None
+    mock_session.commit.assert_called_once()
+    mock_session.__aexit__.assert_called_once()
 
-    deposit = Deposit(
-        date="2023-01-01",
-        periods=12,
-        amount=10000,
-        rate=5.0,
-        calculation_result={"2023-02-01": 10500.0},
-    )
 
+async def test_get_many_deposits() -> None:
+    mock_session = AsyncMock()
+    deposit = Deposit(date=datetime(2024, 1, 1), periods=12, amount=10000, rate=5.0)
     mock_result = MagicMock()
-    mock_result.scalar_one_or_none = MagicMock(return_value=deposit)
+    mock_result.scalars = MagicMock(return_value=[deposit])
     mock_session.execute = AsyncMock(return_value=mock_result)
+    service = DepositService(session_factory=make_session_factory(mock_session))
+    payload = DepositRequest(date="01.01.2024", periods=12, amount=10000, rate=5.0)
+
+    result = await service.get_many([payload, payload])
 
-    service = DepositService(session=mock_session)
+    assert result == {(datetime(2024, 1, 1), 12, 10000, 5.0): deposit}
+    mock_session.execute.assert_called_once()
+    assert await service.get_many([]) == {}
 
-    result = await service.get(deposit)
 
-    assert result == deposit
+async def test_create_many_deposits() -> None:
+    mock_session = AsyncMock()
+    service = DepositService(session_factory=make_session_factory(mock_session))
+    payload = DepositRequest(date="01.01.2024", periods=1, amount=10000, rate=5.0)
 
+    await service.create_many([payload], [{"31.01.2024": 10041.67}])
+    await service.create_many([], [])
+
+    mock_session.execute.assert_called_once()
+    mock_session.commit.assert_called_once()
+
+
+async def test_deposit_service_opens_no_session_without_queries() -> None:
+    session_factory = MagicMock()
+    service = DepositService(session_factory=session_factory)
+
+    assert await service.get_many([]) == {}
+    await service.create_many([], [])
+
+    session_factory.assert_not_called()
+
+
+def test_deposit_result_reads_both_formats() -> None:
+    service = DepositService(session_factory=MagicMock())
+    packed = Deposit(date=datetime(2024, 1, 15), periods=2, amount=10000, rate=5.0, calculation_values=[1.0, 2.0])
+    legacy = Deposit(
+        date=datetime(2024, 1, 15), periods=1, amount=10000, rate=5.0, calculation_result={"31.01.2024": 1.0}
+    )
+
+    assert service.result(packed) == {"31.01.2024": 1.0, "29.02.2024": 2.0}
+    assert service.result(legacy) == {"31.01.2024": 1.0}
+    assert DepositService(session_factory=MagicMock(), storage=ResultStorage(read_legacy=False)).result(legacy) is None
+
+
+async def test_stream_deposits() -> None:
+    rows = [
+        [
+            MagicMock(
+                date=datetime(2024, 1, 15),
+                periods=1,
+                amount=10000,
+                rate=5.0,
+                calculation_values=[10041.67],
+                calculation_engine="float",
+                calculation_rounding=None,
+            )
+        ],
+        [
+            MagicMock(
+                date=datetime(2024, 2, 1),
+                periods=1,
+                amount=10000,
+                rate=5.0,
+                calculation_values=[10041.67],
+                calculation_engine="float",
+                calculation_rounding=None,
+            )
+        ],
+    ]
+
+    async def partitions() -> AsyncGenerator[list, None]:
+        for partition in rows:
+            yield partition
 
-async def test_create_deposit() -> None:
     mock_session = AsyncMock()
-    service = DepositService(session=mock_session)
-    payload = Deposit(date="2024-01-01", periods=12, amount=10000, rate=5.0)
-    calculation_result = {"2024-02-01": 10500.0}
+    mock_session.stream = AsyncMock(return_value=MagicMock(partitions=partitions))
+    service = DepositService(session_factory=make_session_factory(mock_session))
 
-    await service.create(payload, calculation_result)
+    batches = [batch async for batch in service.stream(date_from=datetime(2024, 1, 1))]
 
-    mock_session.add.assert_called_once()
+    assert batches == [
+        [
+            {
+                "date": "15.01.2024",
+                "periods": 1,
+                "amount": 10000,
+                "rate": 5.0,
+                "calculation_result": {"31.01.2024": 10041.67},
+            }
+        ],
+        [
+            {
+                "date": "01.02.2024",
+                "periods": 1,
+                "amount": 10000,
+                "rate": 5.0,
+                "calculation_result": {"29.02.2024": 10041.67},
+            }
+        ],
+    ]
+    mock_session.stream.assert_awaited_once()
+    mock_session.__aexit__.assert_called_once()
+
+
+async def test_get_longest_deposit() -> None:
+    mock_session = AsyncMock()
+    deposit = Deposit(date=datetime(2024, 1, 1), periods=24, amount=10000, rate=5.0)
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none = MagicMock(return_value=deposit)
+    mock_session.execute = AsyncMock(return_value=mock_result)
+    service = DepositService(session_factory=make_session_factory(mock_session))
+    payload = DepositRequest(date="01.01.2024", periods=36, amount=10000, rate=5.0)
+
+    assert await service.get_longest(payload) == deposit
+    query = str(mock_session.execute.call_args.args[0])
+    assert "ORDER BY deposits.periods DESC" in query
+    assert "deposits.periods =" not in query
+
+
+async def test_upgrade_deposit() -> None:
+    mock_session = AsyncMock()
+    mock_session.execute = AsyncMock(return_value=MagicMock(rowcount=1))
+    service = DepositService(session_factory=make_session_factory(mock_session))
+    deposit = Deposit(date=datetime(2024, 1, 1), periods=1, amount=10000, rate=5.0)
+
+    assert await service.upgrade(deposit, {"31.01.2024": 10041.67, "29.02.2024": 10083.51}) is True
+    assert mock_session.execute.call_args.args[0].compile().params["periods"] == 2
     mock_session.commit.assert_called_once()
+
+    mock_session.execute = AsyncMock(side_effect=IntegrityError("UPDATE", {}, Exception()))
+    assert await service.upgrade(deposit, {"31.01.2024": 10041.67, "29.02.2024": 10083.51}) is False
@@ -0,0 +1,70 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from src.schemas.deposits import DepositRequest
+from src.services.recompute import RecomputeJob
+from src.utils.calculator import DepositCalculator
+from src.utils.fixed_point import compute_deposit_fixed
+from src.utils.storage import ResultStorage
+
+
+def make_row(month: int) -> MagicMock:
+    return MagicMock(
+        pk=uuid.UUID(int=month), date=datetime(2024, month, 1), periods=3, amount=10000, rate=5.0, calculation_version=1
+    )
+
+
+async def test_recompute_job_updates_stale_rows_in_chunks() -> None:
+    rows = [make_row(month) for month in range(1, 6)]
+    pages = [rows[:2], rows[2:4], rows[4:], []]
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    session.execute = AsyncMock(
+        side_effect=lambda statement, parameters=None: MagicMock(
+            all=MagicMock(return_value=pages.pop(0) if parameters is None else None)
+        )
+    )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        job = RecomputeJob(
+            session_factory=MagicMock(return_value=session),
+            calculator=DepositCalculator(engine="fixed"),
+            storage=ResultStorage(engine="fixed", version=2),
+            executor=executor,
+            chunk_size=2,
+            workers=2,
+            pause=0,
+        )
+
+        assert await job.run() == 5
+
+    updates = [call.args[1] for call in session.execute.call_args_list if len(call.args) > 1]
+    assert [len(parameters) for parameters in updates] == [2, 2, 1]
+    first = updates[0][0]
+    payload = DepositRequest(date="01.01.2024", periods=3, amount=10000, rate=5.0)
+    assert first["row_pk"] == rows[0].pk
+    assert first["row_version"] == 1
+    assert first["new_version"] == 2
+    assert (first["new_engine"], first["new_rounding"]) == ("fixed", "half_even")
+    assert first["new_values"] == list(compute_deposit_fixed(payload).values())
+    assert session.commit.await_count == 3
+
+
+async def test_recompute_job_pages_by_key() -> None:
+    job = RecomputeJob(
+        session_factory=MagicMock(), calculator=DepositCalculator(), storage=ResultStorage(), executor=MagicMock()
+    )
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    session.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[make_row(1)])))
+    job.session_factory = MagicMock(return_value=session)
+    chunks = job.stale_chunks()
+
+    await anext(chunks)
+    await anext(chunks)
+
+    second_query = str(session.execute.call_args.args[0])
+    assert "deposits.pk >" in second_query
+    assert "ORDER BY deposits.pk" in second_query
+    assert "OFFSET" not in second_query
@@ -0,0 +1,78 @@
+from typing import AsyncIterator
+
+import pytest
+
+from src.constants.deposit import BulkConstants
+from src.utils.bulk import iter_chunks, iter_lines, iter_rows, parse_csv_header
+
+
+async def _stream(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(iterator: AsyncIterator) -> list:
+    return [item async for item in iterator]
+
+
+async def test_iter_lines_joins_split_chunks_and_counts_blank_lines() -> None:
+    lines = await _collect(iter_lines(_stream(b'{"a": 1}\n{"b"', b": 2}\r\n\n", "é".encode()[:1], b"\xa9")))
+
+    assert lines == [(1, '{"a": 1}'), (2, '{"b": 2}'), (4, "é")]
+
+
+async def test_iter_rows_ndjson_reports_errors_inline() -> None:
+    lines = _stream(
+        b'{"date": "01.01.2024", "periods": 12, "amount": 10000, "rate": 5.0}\n',
+        b"not json\n\n",
+        b'{"date": "2024-01-01", "periods": 12, "amount": 10000, "rate": 5.0}\n',
+    )
+
+    rows = await _collect(iter_rows(iter_lines(lines), BulkConstants.NDJSON_MEDIA_TYPE.value))
+
+    assert [number for number, _, _ in rows] == [1, 2, 4]
+    assert rows[0][1].periods == 12
+    assert rows[1][2] == "body: Invalid JSON"
+    assert rows[2][2].startswith("date: Value error, Invalid date format")
+
+
+async def test_iter_rows_csv_with_header() -> None:
+    header = parse_csv_header(" Rate ,AMOUNT,periods,date,comment")
+    lines = _stream(b"5.0,10000,3,01.01.2024,note\n01.01.2024,3\n")
+
+    rows = await _collect(iter_rows(iter_lines(lines), BulkConstants.CSV_MEDIA_TYPE.value, header=header))
+
+    assert rows[0][1].amount == 10000
+    assert rows[1][2] == "body: Expected 5 values, got 2"
+
+
+def test_parse_csv_header() -> None:
+    assert parse_csv_header("01.01.2024,3,10000,5.0") is None
+    with pytest.raises(ValueError, match="header: Missing columns: amount, rate"):
+        parse_csv_header("Date,Periods,Amt")
+
+
+async def test_iter_chunks() -> None:
+    chunks = await _collect(iter_chunks(_stream(*(bytes([i]) for i in range(5))), size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+
+async def test_iter_lines_reports_overlong_lines_and_resumes() -> None:
+    lines = await _collect(iter_lines(_stream(b"ok\n", b"x" * 6, b"x" * 6, b"x\nnext\n", b"y" * 11), max_length=10))
+
+    assert [(number, str(line)) for number, line in lines] == [
+        (1, "ok"),
+        (2, "body: Line longer than 10 characters"),
+        (3, "next"),
+        (4, "body: Line longer than 10 characters"),
+    ]
+
+
+async def test_iter_rows_reports_invalid_utf8_and_overlong_lines_as_row_errors() -> None:
+    lines = _stream(b'{"date": "01.01.2024\xff", "periods": 12, "amount": 10000, "rate": 5.0}\n', b"[" * 5000 + b"\n")
+
+    rows = await _collect(iter_rows(iter_lines(lines), BulkConstants.NDJSON_MEDIA_TYPE.value))
+
+    assert rows[0][2].startswith("date: Value error, Invalid date format")
+    assert rows[1] == (2, None, f"body: Line longer than {BulkConstants.MAX_LINE_LENGTH.value} characters")
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+import pytest
+
+from src.constants.deposit import DepositConstants
+from src.utils.dates import parse_date_string
+
+
+@pytest.mark.parametrize("value", ["01.01.2023", "29.02.2024", "31.12.1999", "1.1.2023", "01.1.2023"])
+def test_parse_date_string_matches_strptime(value: str) -> None:
+    assert parse_date_string(value) == datetime.strptime(value, DepositConstants.DATE_FORMAT.value)
+
+
+@pytest.mark.parametrize("value", ["31.02.2023", "32.13.2023", "01.01.0000", " 01.01.2023", "01-01-2023", "0١.01.2023"])
+def test_parse_date_string_rejects_what_strptime_rejects(value: str) -> None:
+    with pytest.raises(ValueError):
+        datetime.strptime(value, DepositConstants.DATE_FORMAT.value)
+    with pytest.raises(ValueError):
+        parse_date_string(value)
@@ -0,0 +1,56 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.utils.deadlines import (
+    DeadlineExceededError,
+    deadline_scope,
+    is_statement_timeout,
+    remaining,
+    renew_deadline,
+    set_statement_timeout,
+)
+from src.utils.dispatch import ComputeDispatcher
+
+
+def test_deadline_scope() -> None:
+    assert remaining() is None
+    with deadline_scope(2.0):
+        assert 1.9 < remaining() <= 2.0
+        time.sleep(0.05)
+        renew_deadline()
+        assert remaining() > 1.95
+    assert remaining() is None
+
+
+def test_set_statement_timeout() -> None:
+    connection = MagicMock()
+    set_statement_timeout(MagicMock(), MagicMock(), connection)
+    connection.exec_driver_sql.assert_not_called()
+
+    with deadline_scope(1.5):
+        set_statement_timeout(MagicMock(), MagicMock(), connection)
+    timeout = int(connection.exec_driver_sql.call_args.args[0].rsplit(" ", 1)[1])
+    assert 1400 < timeout <= 1500
+
+    with deadline_scope(-1.0), pytest.raises(DeadlineExceededError):
+        set_statement_timeout(MagicMock(), MagicMock(), connection)
+
+
+def test_is_statement_timeout() -> None:
+    exc = Exception()
+    exc.orig = MagicMock(sqlstate="57014")
+    assert is_statement_timeout(exc)
+    assert not is_statement_timeout(ValueError())
+
+
+async def test_dispatch_respects_the_deadline() -> None:
+    dispatcher = ComputeDispatcher(inline_max_work=0, thread_workers=1)
+    try:
+        with deadline_scope(0.05), pytest.raises(DeadlineExceededError):
+            await dispatcher.run(1, time.sleep, 1.0)
+        with deadline_scope(-1.0), pytest.raises(DeadlineExceededError):
+            await dispatcher.run(1, sum, [1])
+    finally:
+        dispatcher.shutdown()
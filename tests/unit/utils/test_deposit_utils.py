@@ -1,7 +1,17 @@
 from datetime import datetime
 
 from src.schemas.deposits import DepositRequest
-from src.utils.deposit import compute_deposit, last_day_of_month, next_month
+from src.utils.deposit import (
+    aggregate_portfolio,
+    compute_deposit,
+    last_day_of_month,
+    maturity_date,
+    month_end_from_index,
+    month_index,
+    next_month,
+    sweep_deposit,
+    take_months,
+)
 
 
 def test_last_day_of_month() -> None:
@@ -21,3 +31,63 @@ def test_compute_deposit() -> None:
     assert len(result) == 2
     assert result["31.01.2024"] == 10041.67
     assert result["29.02.2024"] == 10083.51
+
+
+def test_compute_deposit_tail_extends_shorter_result() -> None:
+    payload = DepositRequest(date="15.11.2023", periods=36, amount=123456, rate=6.3)
+    head = compute_deposit(payload.model_copy(update={"periods": 24}))
+
+    tail = compute_deposit(payload, start=24)
+
+    assert len(tail) == 12
+    assert list(tail)[0] == "30.11.2025"
+    assert head | tail == compute_deposit(payload)
+
+
+def test_take_months() -> None:
+    payload = DepositRequest(date="15.11.2023", periods=24, amount=123456, rate=6.3)
+    result = compute_deposit(payload)
+    shuffled = dict(sorted(result.items()))
+
+    assert take_months(shuffled, payload.date, 12) == compute_deposit(payload.model_copy(update={"periods": 12}))
+    assert list(take_months(shuffled, payload.date, 24)) == list(result)
+
+
+def test_month_index_round_trip() -> None:
+    assert month_index(datetime(2024, 1, 15)) + 1 == month_index(datetime(2024, 2, 1))
+    assert month_end_from_index(month_index(datetime(2024, 2, 10))) == datetime(2024, 2, 29)
+    assert month_end_from_index(month_index(datetime(2023, 12, 1))) == datetime(2023, 12, 31)
+
+
+def test_aggregate_portfolio_matches_summed_results() -> None:
+    payloads = [
+        DepositRequest(date="15.11.2023", periods=3, amount=10000, rate=5.0),
+        DepositRequest(date="01.01.2024", periods=2, amount=10000, rate=5.0),
+        DepositRequest(date="01.06.2024", periods=1, amount=20000, rate=7.5),
+    ]
+    expected: dict[str, float] = {}
+    for payload in payloads:
+        for date, value in compute_deposit(payload).items():
+            expected[date] = expected.get(date, 0.0) + value
+
+    start, values = aggregate_portfolio(payloads)
+
+    assert start == datetime(2023, 11, 30)
+    assert len(values) == 8
+    date = start
+    for value in values:
+        assert value == round(expected.get(date.strftime("%d.%m.%Y"), 0.0), 2)
+        date = last_day_of_month(next_month(date))
+
+
+def test_sweep_deposit_matches_compute_deposit() -> None:
+    rates, periods = [1.0, 5.1, 8.0], [1, 7, 60]
+
+    values = sweep_deposit(10000, rates, periods)
+
+    for row, rate in zip(values, rates, strict=True):
+        for value, count in zip(row, periods, strict=True):
+            payload = DepositRequest(date="15.03.2024", periods=count, amount=10000, rate=rate)
+            result = compute_deposit(payload)
+            assert value == list(result.values())[-1]
+            assert maturity_date(payload.date, count).strftime("%d.%m.%Y") == list(result)[-1]
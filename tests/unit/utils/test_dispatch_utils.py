@@ -0,0 +1,38 @@
+import threading
+
+from src.utils.dispatch import ComputeDispatcher, DispatchMetrics
+
+
+def test_dispatch_mode_by_work_size() -> None:
+    dispatcher = ComputeDispatcher(inline_max_work=12, process_min_work=1000)
+    try:
+        assert dispatcher.mode(12) == "inline"
+        assert dispatcher.mode(13) == "thread"
+        assert dispatcher.mode(1000) == "process"
+    finally:
+        dispatcher.shutdown()
+
+
+async def test_dispatch_runs_each_mode_and_records_metrics() -> None:
+    dispatcher = ComputeDispatcher(inline_max_work=12, process_min_work=1000, thread_workers=1, process_workers=1)
+    try:
+        inline_thread = await dispatcher.run(1, threading.current_thread)
+        pool_thread = await dispatcher.run(100, threading.current_thread)
+        total = await dispatcher.run(1000, sum, [1, 2, 3])
+    finally:
+        dispatcher.shutdown()
+
+    assert inline_thread is threading.main_thread()
+    assert pool_thread.name.startswith("compute")
+    assert total == 6
+    metrics = dispatcher.metrics.snapshot()
+    assert [metrics[mode]["count"] for mode in ("inline", "thread", "process")] == [1, 1, 1]
+
+
+def test_dispatch_metrics_snapshot() -> None:
+    metrics = DispatchMetrics()
+    metrics.record("thread", 0.002)
+    metrics.record("thread", 0.004)
+
+    assert metrics.snapshot()["thread"] == {"count": 2, "total_ms": 6.0, "mean_ms": 3.0, "max_ms": 4.0}
+    assert metrics.snapshot()["inline"] == {"count": 0, "total_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+
+from src.utils.export import csv_header, encode_csv, encode_ndjson, flatten_records
+
+RECORDS = [
+    {
+        "date": "15.01.2024",
+        "periods": 2,
+        "amount": 10000,
+        "rate": 5.0,
+        "calculation_result": {"31.01.2024": 10041.67, "29.02.2024": 10083.51},
+    },
+    {"date": "01.02.2024", "periods": 1, "amount": 10000, "rate": 5.0, "calculation_result": None},
+]
+
+
+def test_flatten_records() -> None:
+    assert list(flatten_records(RECORDS)) == [
+        {
+            "date": "15.01.2024",
+            "periods": 2,
+            "amount": 10000,
+            "rate": 5.0,
+            "month_end": "31.01.2024",
+            "value": 10041.67,
+        },
+        {
+            "date": "15.01.2024",
+            "periods": 2,
+            "amount": 10000,
+            "rate": 5.0,
+            "month_end": "29.02.2024",
+            "value": 10083.51,
+        },
+    ]
+
+
+def test_encode_csv() -> None:
+    rows = list(csv.reader(io.StringIO((csv_header() + encode_csv(RECORDS)).decode())))
+
+    assert rows[0] == ["date", "periods", "amount", "rate", "calculation_result"]
+    assert rows[1][:4] == ["15.01.2024", "2", "10000", "5.0"]
+    assert json.loads(rows[1][4]) == RECORDS[0]["calculation_result"]
+    assert rows[2][4] == "null"
+
+
+def test_encode_csv_flattened() -> None:
+    rows = list(csv.reader(io.StringIO((csv_header(flatten=True) + encode_csv(RECORDS, flatten=True)).decode())))
+
+    assert rows == [
+        ["date", "periods", "amount", "rate", "month_end", "value"],
+        ["15.01.2024", "2", "10000", "5.0", "31.01.2024", "10041.67"],
+        ["15.01.2024", "2", "10000", "5.0", "29.02.2024", "10083.51"],
+    ]
+
+
+def test_encode_ndjson() -> None:
+    assert [json.loads(line) for line in encode_ndjson(RECORDS).splitlines()] == RECORDS
+    assert len(encode_ndjson(RECORDS, flatten=True).splitlines()) == 2
+    assert encode_ndjson([]) == b""
@@ -0,0 +1,66 @@
+import itertools
+
+import pytest
+
+from src.schemas.deposits import DepositRequest
+from src.utils.calculator import DepositCalculator
+from src.utils.deposit import compute_deposit, compute_deposits, month_end_keys
+from src.utils.fixed_point import compute_deposit_fixed, compute_deposits_fixed, divide_rounded, growth_minor
+
+
+def test_divide_rounded() -> None:
+    assert divide_rounded(5, 2) == 2
+    assert divide_rounded(7, 2) == 4
+    assert divide_rounded(5, 2, "half_up") == 3
+    assert divide_rounded(11, 4) == 3
+    assert divide_rounded(9, 4) == 2
+
+
+def test_growth_minor_rejects_unknown_rounding() -> None:
+    with pytest.raises(ValueError, match="Unknown rounding mode"):
+        growth_minor(10000, 5.0, 3, "down")
+
+
+def test_month_end_keys_match_compute_deposit() -> None:
+    payload = DepositRequest(date="15.11.2023", periods=4, amount=10000, rate=5.0)
+    assert month_end_keys(payload.date, payload.periods) == list(compute_deposit(payload))
+
+
+def test_compute_deposit_fixed_known_values() -> None:
+    payload = DepositRequest(date="01.01.2024", periods=2, amount=10000, rate=5.0)
+    assert compute_deposit_fixed(payload) == {"31.01.2024": 10041.67, "29.02.2024": 10083.51}
+
+
+def test_compute_deposit_fixed_parity_with_float_engine() -> None:
+    grid = itertools.product([10000, 10001, 123457, 999999, 3000000], [1.0, 3.3, 5.0, 7.7, 8.0], [1, 12, 60])
+    for amount, rate, periods in grid:
+        payload = DepositRequest(date="31.01.2023", periods=periods, amount=amount, rate=rate)
+        expected, result = compute_deposit(payload), compute_deposit_fixed(payload)
+        assert list(result) == list(expected)
+        assert all(abs(result[key] - expected[key]) <= 0.01 + 1e-9 for key in expected)
+
+
+def test_compute_deposit_fixed_tail_extends_shorter_result() -> None:
+    payload = DepositRequest(date="31.01.2023", periods=60, amount=123457, rate=7.7)
+    for start in (0, 1, 24, 59, 60):
+        head = compute_deposit_fixed(payload.model_copy(update={"periods": start}))
+        assert head | compute_deposit_fixed(payload, start=start) == compute_deposit_fixed(payload)
+    assert month_end_keys(payload.date, 3, start=1) == month_end_keys(payload.date, 3)[1:]
+
+
+def test_compute_deposits_fixed_matches_single() -> None:
+    payloads = [
+        DepositRequest(date="10.01.2024", periods=6, amount=10000, rate=5.0),
+        DepositRequest(date="20.01.2024", periods=3, amount=10000, rate=5.0),
+        DepositRequest(date="05.03.2024", periods=12, amount=10000, rate=5.0),
+    ]
+    assert compute_deposits_fixed(payloads, "half_up") == [compute_deposit_fixed(p, "half_up") for p in payloads]
+
+
+def test_deposit_calculator_engines() -> None:
+    payloads = [DepositRequest(date="01.01.2024", periods=2, amount=10000, rate=5.0)]
+    assert DepositCalculator().compute_many(payloads) == compute_deposits(payloads)
+    assert DepositCalculator("fixed").compute(payloads[0]) == compute_deposit_fixed(payloads[0])
+    assert DepositCalculator().compute(payloads[0], start=2) == compute_deposit(payloads[0], start=2)
+    with pytest.raises(ValueError, match="Unknown engine"):
+        DepositCalculator("decimal")
@@ -0,0 +1,40 @@
+import gzip
+import json
+
+from src.constants.deposit import FormatConstants
+from src.utils.formats import compress, encode_result, negotiate, parse_qualities, to_columnar
+
+RESULT = {"31.01.2024": 10041.67, "29.02.2024": 10083.51}
+
+
+def test_to_columnar() -> None:
+    assert to_columnar(RESULT) == {"start": "31.01.2024", "values": [10041.67, 10083.51]}
+
+
+def test_parse_qualities() -> None:
+    assert parse_qualities("Application/JSON;q=0.5, text/*, */*;q=oops") == {
+        "application/json": 0.5,
+        "text/*": 1.0,
+        "*/*": 0.0,
+    }
+
+
+def test_negotiate() -> None:
+    offers = [FormatConstants.JSON_MEDIA_TYPE.value, FormatConstants.COLUMNAR_MEDIA_TYPE.value]
+    assert negotiate(offers, None) == FormatConstants.JSON_MEDIA_TYPE.value
+    assert negotiate(offers, "*/*") == FormatConstants.JSON_MEDIA_TYPE.value
+    assert negotiate(offers, f"application/json;q=0.5, {offers[1]}") == offers[1]
+    assert negotiate(offers, "application/*;q=0.2, application/json;q=0") == offers[1]
+    assert negotiate(offers, "text/html") is None
+    assert negotiate(["br", "gzip"], "gzip, deflate") == "gzip"
+    assert negotiate(["gzip"], "identity") is None
+
+
+def test_encode_result() -> None:
+    assert json.loads(encode_result(RESULT, FormatConstants.JSON_MEDIA_TYPE.value)) == RESULT
+    assert json.loads(encode_result(RESULT, FormatConstants.COLUMNAR_MEDIA_TYPE.value)) == to_columnar(RESULT)
+
+
+def test_compress_gzip() -> None:
+    body = encode_result(RESULT, FormatConstants.JSON_MEDIA_TYPE.value)
+    assert gzip.decompress(compress(body, "gzip")) == body
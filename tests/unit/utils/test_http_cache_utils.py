@@ -0,0 +1,27 @@
+from src.schemas.deposits import DepositRequest
+from src.utils.http_cache import canonical_params, etag_matches, make_etag
+
+
+def test_canonical_params_ignore_spelling() -> None:
+    first = DepositRequest(date="01.01.2024", periods="12", amount=10000, rate=5)
+    second = DepositRequest(date="01.01.2024", periods=12, amount="10000", rate="5.0")
+
+    assert canonical_params(first) == canonical_params(second) == "01.01.2024|12|10000|5.0"
+
+
+def test_make_etag_is_strong_and_depends_on_every_part() -> None:
+    etag = make_etag("01.01.2024|12|10000|5.0", "float", "application/json")
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("01.01.2024|12|10000|5.0", "float", "application/json")
+    assert etag != make_etag("01.01.2024|12|10000|5.0", "fixed", "application/json")
+
+
+def test_etag_matches() -> None:
+    etag = make_etag("params")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
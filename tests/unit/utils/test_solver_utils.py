@@ -0,0 +1,37 @@
+import pytest
+
+from src.schemas.deposits import DepositRequest
+from src.utils.deposit import compute_deposit
+from src.utils.solver import deposit_value, solve_amount, solve_periods
+
+
+def test_deposit_value_matches_compute_deposit() -> None:
+    payload = DepositRequest(date="01.01.2024", periods=24, amount=123456, rate=6.3)
+
+    assert deposit_value(123456, 6.3, 24) == list(compute_deposit(payload).values())[-1]
+
+
+def test_solve_amount_is_minimal() -> None:
+    amount = solve_amount(150000, 5.0, 12)
+
+    assert deposit_value(amount, 5.0, 12) >= 150000
+    assert deposit_value(amount - 1, 5.0, 12) < 150000
+
+
+def test_solve_amount_respects_bounds() -> None:
+    assert solve_amount(100, 5.0, 12) == 10000
+    with pytest.raises(ValueError):
+        solve_amount(10**9, 5.0, 12)
+
+
+def test_solve_periods_is_minimal() -> None:
+    periods = solve_periods(110000, 100000, 5.0)
+
+    assert deposit_value(100000, 5.0, periods) >= 110000
+    assert deposit_value(100000, 5.0, periods - 1) < 110000
+
+
+def test_solve_periods_respects_bounds() -> None:
+    assert solve_periods(100, 100000, 5.0) == 1
+    with pytest.raises(ValueError):
+        solve_periods(10**9, 100000, 5.0)
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+from src.models.deposits import Deposit
+from src.schemas.deposits import DepositRequest
+from src.utils.deposit import compute_deposit
+from src.utils.storage import ResultStorage, unpack_values
+
+
+def test_result_storage_round_trip() -> None:
+    payload = DepositRequest(date="31.01.2024", periods=60, amount=10000, rate=6.0)
+    calculation_result = compute_deposit(payload)
+
+    columns = ResultStorage().columns(calculation_result)
+
+    assert columns["calculation_result"] is None
+    assert unpack_values(payload.date, columns["calculation_values"]) == calculation_result
+    assert list(unpack_values(payload.date, columns["calculation_values"])) == list(calculation_result)
+
+
+def test_result_storage_writes_legacy_column() -> None:
+    columns = ResultStorage(write_legacy=True).columns({"31.01.2024": 10050.0})
+
+    assert columns == {
+        "calculation_values": [10050.0],
+        "calculation_result": {"31.01.2024": 10050.0},
+        "calculation_version": 1,
+        "calculation_engine": "float",
+        "calculation_rounding": None,
+    }
+
+
+def test_unpack_values_empty() -> None:
+    assert unpack_values(datetime(2024, 1, 1), []) == {}
+
+
+def test_result_storage_stale_policy() -> None:
+    stale = Deposit(date=datetime(2024, 1, 1), calculation_values=[10041.67], calculation_version=1)
+    current = Deposit(date=datetime(2024, 1, 1), calculation_values=[10041.67], calculation_version=2)
+
+    assert ResultStorage(version=2).result(stale) == {"31.01.2024": 10041.67}
+    assert ResultStorage(stale_policy="recompute", version=2).result(stale) is None
+    assert ResultStorage(stale_policy="recompute", version=2).result(current) == {"31.01.2024": 10041.67}
+    assert ResultStorage(stale_policy="recompute", version=1).is_stale(current) is False
+    with pytest.raises(ValueError, match="Unknown stale policy"):
+        ResultStorage(stale_policy="drop")
+
+
+def test_result_storage_skips_results_of_another_engine() -> None:
+    def stored(engine: str, rounding: str | None) -> Deposit:
+        return Deposit(
+            date=datetime(2024, 1, 1),
+            calculation_values=[10041.67],
+            calculation_version=1,
+            calculation_engine=engine,
+            calculation_rounding=rounding,
+        )
+
+    fixed = ResultStorage(engine="fixed", rounding="half_up")
+
+    assert fixed.columns({"31.01.2024": 10041.67})["calculation_rounding"] == "half_up"
+    assert fixed.result(stored("fixed", "half_up")) == {"31.01.2024": 10041.67}
+    assert fixed.result(stored("fixed", "half_even")) is None
+    assert fixed.result(stored("float", None)) is None
+    assert ResultStorage(rounding="half_up").result(stored("float", None)) == {"31.01.2024": 10041.67}
+    assert ResultStorage().result(stored("fixed", "half_even")) is None
@@ -0,0 +1,37 @@
+import pytest
+from fastapi.exceptions import RequestValidationError
+
+from src.schemas.deposits import DepositRequest
+from src.utils.validation import decode_json_body, format_validation_errors, is_json_media_type
+
+
+def decode_error(body: bytes, content_type: str | None = "application/json") -> str:
+    with pytest.raises(RequestValidationError) as exc_info:
+        decode_json_body(DepositRequest, body, content_type)
+    return format_validation_errors(exc_info.value.errors())
+
+
+def test_is_json_media_type() -> None:
+    assert is_json_media_type("application/json; charset=utf-8")
+    assert is_json_media_type("application/vnd.deposit+json")
+    assert not is_json_media_type("text/plain")
+    assert not is_json_media_type(None)
+
+
+def test_decode_json_body() -> None:
+    payload = decode_json_body(
+        DepositRequest, b'{"date": "01.01.2023", "periods": 3, "amount": 100000, "rate": 5}', "application/json"
+    )
+
+    assert payload == DepositRequest(date="01.01.2023", periods=3, amount=100000, rate=5.0)
+
+
+def test_decode_json_body_errors_match_fastapi() -> None:
+    not_an_object = "body: Input should be a valid dictionary or object to extract fields from"
+
+    assert decode_error(b'{"date": "01.01.2023",') == "22: JSON decode error"
+    assert decode_error(b"") == decode_error(b"null") == "body: Field required"
+    assert decode_error(b"[1]") == decode_error(b"{}", "text/plain") == not_an_object
+    assert decode_error(b'{"date": "32.13.2023", "periods": 3, "amount": 100000, "rate": 5}') == (
+        "date: Value error, Invalid date format: 32.13.2023. Expected format: dd.mm.yyyy"
+    )